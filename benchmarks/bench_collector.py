@@ -0,0 +1,34 @@
+"""
+Measures reading and writing of device states on :class:`StatusBoard`.
+
+Usage: ``python benchmarks/bench_collector.py [number of devices]``
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+from philips_air_purifier_ac2889 import StatusBoard
+
+
+STATUS = {'om': '1', 'pwr': '1', 'cl': False, 'aqil': 100, 'uil': '1', 'dt': 0, 'dtrs': 0, 'mode': 'A',
+          'pm25': 4, 'iaql': 1, 'aqit': 4, 'ddp': '1', 'err': 0}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    hosts = [f'10.0.{index // 256}.{index % 256}' for index in range(count)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'purifiers.board')
+        with StatusBoard.create(path, hosts) as writer, StatusBoard(path) as reader:
+            for name, operation in (('write', lambda: [writer.write(host, STATUS) for host in hosts]),
+                                    ('read', lambda: [reader.read(host) for host in hosts]),
+                                    ('snapshot', reader.snapshot)):
+                elapsed = min(timeit.repeat(operation, number=1, repeat=5))
+                print(f'{name:<40} {elapsed / count * 1e6:>8.2f} us/device')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Measures throughput of ``AirPurifier.connect`` without network.
+
+Device responses are replayed by fake transport, so only work done by client is measured: parsing of
+Diffie-Hellman group, both modular exponentiations and decryption of session key. Keys computed by process
+pool are free for connecting thread only when machine has spare cores.
+
+Usage: ``python benchmarks/bench_connect.py [number of connections]``
+"""
+
+import sys
+import time
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from philips_air_purifier_ac2889 import AirPurifier, ClientOptions, KeyPool, Transport
+from philips_air_purifier_ac2889._utils import derive_session_key
+
+
+HANDSHAKE = (b'{"hellman":"74b287a8cf17541ceb8f0bdb796e5dccddf6b87ad401d153533536af3bce2455c8c8a15b07'
+             b'e85f83ae5bcc13552f6eb7eff168940d5af80871c3b348dfcbd047050f30a107374731a7a1033e725a4d05'
+             b'b7a770cabea3924dbf68e95dec6c54d18ac205c46d9670ba3f5dd75117735b9f05bef7d1f25df2f88f15e9'
+             b'72c4ce9182","key":"b5e2c4a35af01c3e4351d9f24c13f7297389192347ba1526a8c029552539d3a5"}')
+
+
+class ReplayTransport(Transport):
+
+    def put(self, url, data, timeout=None):
+        return HANDSHAKE
+
+
+def legacy_connect():
+    """Key exchange as it was done before group constants were moved to module level."""
+
+    signed = int('A4D1CBD5C3FD34126765A442EFB99905F8104DD258AC507FD6406CFF14266D31266FEA1E5C41564B777E69'
+                 '0F5504F213160217B4B01B886A5E91547F9E2749F4D7FBD7D3B9A92EE1909D0D2263F80A76A6A24C087A09'
+                 '1F531DBF0A0169B6A28AD662A4D18E73AFA32D779D5918D08BC8858F4DCEF97C2A24855E6EEB22B3B2E5', 16)
+    moulus = int('B10B8F96A080E01DDE92DE5EAE5D54EC52C99FBCFB06A3C69A6A9DCA52D23B616073E28675A23D189838EF'
+                 '1E2EE652C013ECB4AEA906112324975C3CD49B83BFACCBDD7D90C4BD7098488E9C219A73724EFFD6FAE564'
+                 '4738FAA31A4FF55BCCC0A151AF5F0DC8B4BD45BF37DF365C1A65E68CFDA76D4DA708DF1FB2BC2E4A4371', 16)
+    bits = random.getrandbits(256)
+    json.dumps({'diffie': hex(pow(signed, bits, moulus))[2:]}).encode('ascii')
+    derive_session_key(bits, HANDSHAKE)
+
+
+def measure(name, connect, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        connect()
+    elapsed = time.perf_counter() - start
+    print(f'{name:<46} {count / elapsed:>10.0f} connections/s {elapsed / count * 1e6:>10.1f} us/connection')
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    philips_air_purifier = AirPurifier(host='127.0.0.1', transport=ReplayTransport())
+
+    measure('legacy (group parsed per call)', legacy_connect, count)
+    measure('connect()', philips_air_purifier.connect, count)
+
+    with KeyPool(size=2 * count) as key_pool:
+        key_pool.fill()
+        philips_air_purifier.options = ClientOptions(key_pool=key_pool)
+        measure('connect() with filled KeyPool', philips_air_purifier.connect, count)
+
+    with ProcessPoolExecutor() as executor, KeyPool(size=count // 4, executor=executor) as key_pool:
+        key_pool.fill()
+        philips_air_purifier.options = ClientOptions(key_pool=key_pool)
+        measure('connect() with KeyPool refilled by processes', philips_air_purifier.connect, count)
+
+
+if __name__ == '__main__':
+    main()
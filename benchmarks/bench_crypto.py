@@ -0,0 +1,36 @@
+"""
+Compares cost of encrypting and decrypting single message by module functions and by ``SessionCipher``.
+
+Usage: ``python benchmarks/bench_crypto.py [number of messages]``
+"""
+
+import sys
+import json
+import timeit
+
+from philips_air_purifier_ac2889._utils import SessionCipher, encrypt, decrypt
+
+
+SESSION_KEY = b'\x9a!\xeaOa\xbf3\xe9\x01\xa8\x1fS]\x0b\xd6\xad'
+STATUS = (b'6blRtD8SfuMlKGx4H4DHcAQ00WDLBLpSD4SrSG4JkHhKNS/cd34DkTkVIUPZ3ffVTfmriEbecQvgtHj7MuI1P/'
+          b'PeX02OI2gtZBruZjleHTQxBbyt+pihXmxTkhtyEtZrXANkKk5NdRzjSxL8fNbj2rzzYJ0utANVA8sXidwWQLY=')
+PARAMETERS = {'om': '1', 'uil': '1', 'mode': 'A', 'pwr': '0'}
+
+
+def measure(name, function, count):
+    elapsed = timeit.timeit(function, number=count)
+    print(f'{name:<40} {elapsed / count * 1e6:>8.2f} us/message')
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    cipher = SessionCipher(SESSION_KEY)
+
+    measure('json.loads(decrypt(key, data))', lambda: json.loads(decrypt(SESSION_KEY, STATUS)), count)
+    measure('SessionCipher.decode(data)', lambda: cipher.decode(STATUS), count)
+    measure('encrypt(key, data)', lambda: encrypt(SESSION_KEY, PARAMETERS), count)
+    measure('SessionCipher.encrypt(data)', lambda: cipher.encrypt(PARAMETERS), count)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Measures appending readings to ``HistoryStore`` and scanning range of one column of history file.
+
+Usage: ``python benchmarks/bench_history.py [number of records]``
+"""
+
+import sys
+import time
+import tempfile
+
+from philips_air_purifier_ac2889 import HistoryStore
+
+
+READING = {'pm25': 12, 'iaql': 3, 'aqil': 50, 'err': 193, 'om': '1', 'mode': 'A', 'pwr': '1'}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    with tempfile.TemporaryDirectory() as directory, HistoryStore(directory) as store:
+        started = time.perf_counter()
+        for timestamp in range(count):
+            store.append('192.168.1.21', READING, timestamp=timestamp)
+        elapsed = time.perf_counter() - started
+        print(f'{"append":<40} {count / elapsed:>12.0f} records/s')
+
+        with store.reader('192.168.1.21') as reader:
+            started = time.perf_counter()
+            pm25 = reader.column('pm25', start=count // 4, end=count * 3 // 4)
+            total = sum(pm25)
+            elapsed = time.perf_counter() - started
+            print(f'{"scan of pm25 (half of file)":<40} {len(pm25) / elapsed:>12.0f} records/s')
+            pm25.release()
+
+            started = time.perf_counter()
+            first, last = reader.bounds(count // 2, count // 2 + 60)
+            elapsed = time.perf_counter() - started
+            print(f'{"range lookup":<40} {elapsed * 1e6:>12.2f} us ({last - first} records, sum {total})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Measures overhead of observers on ``AirPurifier.get`` with in-memory transport, so only client work is timed.
+
+Usage: ``python benchmarks/bench_observer.py [number of calls]``
+"""
+
+import sys
+import timeit
+
+from philips_air_purifier_ac2889 import AirPurifier, ClientOptions, HistogramCollector, Observer, Transport
+from philips_air_purifier_ac2889._utils import SessionCipher
+
+
+SESSION_KEY = b'\x9a!\xeaOa\xbf3\xe9\x01\xa8\x1fS]\x0b\xd6\xad'
+STATUS = {'om': '1', 'pwr': '1', 'cl': False, 'aqil': 100, 'uil': '1', 'dt': 0, 'dtrs': 0, 'mode': 'A',
+          'pm25': 4, 'iaql': 1, 'aqit': 4, 'ddp': '1', 'err': 0}
+
+
+class MemoryTransport(Transport):
+
+    def __init__(self, content):
+        self.content = content
+
+    def get(self, url, timeout=None):
+        return self.content
+
+    def put(self, url, data, timeout=None):
+        return self.content
+
+    def close(self):
+        pass
+
+
+def client(observer):
+    purifier = AirPurifier('127.0.0.1', transport=MemoryTransport(SessionCipher(SESSION_KEY).encrypt(STATUS)),
+                           options=ClientOptions(observer=observer))
+    purifier.session_key = SESSION_KEY
+    purifier.is_connected = True
+
+    return purifier
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    for name, observer in (('no observer', None), ('Observer', Observer()), ('HistogramCollector', HistogramCollector())):
+        purifier = client(observer)
+        elapsed = timeit.timeit(purifier.get, number=count)
+        print(f'{name:<40} {elapsed / count * 1e6:>8.2f} us/get')
+
+
+if __name__ == '__main__':
+    main()
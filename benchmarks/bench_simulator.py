@@ -0,0 +1,82 @@
+"""
+Measures latency of client operations and throughput of fleet against local ``DeviceSimulator`` servers.
+
+Usage: ``python benchmarks/bench_simulator.py [--requests N] [--devices N] [--latency S] [--jitter S]
+[--failure-rate P]``
+"""
+
+import time
+import asyncio
+import argparse
+
+from philips_air_purifier_ac2889 import (AirPurifier, AsyncAirPurifier, ClientOptions, DeviceSimulator, PurifierFleet,
+                                         RetryPolicy)
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return [samples[min(int(len(samples) * quantile), len(samples) - 1)] * 1e3 for quantile in (0.5, 0.9, 0.99)]
+
+
+def measure(name, operation, count):
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        operation()
+        samples.append(time.perf_counter() - started)
+    p50, p90, p99 = percentiles(samples)
+    print(f'{name:<32} p50 {p50:>8.2f} ms   p90 {p90:>8.2f} ms   p99 {p99:>8.2f} ms')
+
+
+def report(name, count, elapsed):
+    print(f'{name:<32} {count / elapsed:>10.0f} requests/s')
+
+
+async def sweep_async(hosts, rounds):
+    purifiers = [AsyncAirPurifier(host, options=ClientOptions(retry=RetryPolicy(backoff=0.01))) for host in hosts]
+    await asyncio.gather(*(purifier.connect() for purifier in purifiers))
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(purifier.get() for purifier in purifiers), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    await asyncio.gather(*(purifier.close() for purifier in purifiers))
+
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--requests', type=int, default=200, help='number of requests per measurement')
+    parser.add_argument('--devices', type=int, default=16, help='number of simulated devices in fleet')
+    parser.add_argument('--latency', type=float, default=0.005, help='delay of device response in seconds')
+    parser.add_argument('--jitter', type=float, default=0.002, help='random deviation of delay in seconds')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='probability of dropped connection')
+    args = parser.parse_args()
+    options = {'latency': args.latency, 'jitter': args.jitter, 'failure_rate': args.failure_rate}
+
+    with DeviceSimulator(**options) as simulator:
+        retry = RetryPolicy(backoff=0.01)
+        with AirPurifier(simulator.address, options=ClientOptions(retry=retry)) as philips_air_purifier:
+            measure('connect()', philips_air_purifier.connect, max(args.requests // 10, 1))
+            measure('get()', philips_air_purifier.get, args.requests)
+            measure('set(mode="M")', lambda: philips_air_purifier.set(mode='M'), args.requests)
+
+    simulators = [DeviceSimulator(**options).start() for _ in range(args.devices)]
+    hosts = [simulator.address for simulator in simulators]
+    rounds = max(args.requests // args.devices, 1)
+    try:
+        with PurifierFleet(hosts, max_workers=args.devices) as fleet:
+            fleet.connect()
+            started = time.perf_counter()
+            for _ in range(rounds):
+                fleet.get_all()
+            report(f'PurifierFleet.get_all() x{args.devices}', rounds * args.devices, time.perf_counter() - started)
+
+        report(f'AsyncAirPurifier.get() x{args.devices}', rounds * args.devices, asyncio.run(sweep_async(hosts, rounds)))
+    finally:
+        for simulator in simulators:
+            simulator.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""
+Measures validation of batches of commands with compiled :class:`ParameterValidator`.
+
+Usage: ``python benchmarks/bench_validator.py [number of commands]``
+"""
+
+import sys
+import timeit
+
+from philips_air_purifier_ac2889 import ParameterValidator
+from philips_air_purifier_ac2889._utils import filter_request_data
+
+
+COMMANDS = ({'pwr': '1'}, {'mode': 'M', 'om': '2'}, {'aqil': 100}, {'uil': '0', 'ddp': '1'})
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    commands = [COMMANDS[index % len(COMMANDS)] for index in range(count)]
+    loose = [{key: int(value) if key == 'om' else value for key, value in command.items()} for command in commands]
+    validator, coercing = ParameterValidator(), ParameterValidator(coerce=True)
+
+    for name, validate in (('filter_request_data', lambda: [filter_request_data(command) for command in commands]),
+                           ('validate_many', lambda: validator.validate_many(commands)),
+                           ('validate_many, coerced', lambda: coercing.validate_many(loose))):
+        elapsed = min(timeit.repeat(validate, number=1, repeat=5))
+        print(f'{name:<40} {elapsed * 1e3:>8.2f} ms/{count} commands')
+
+
+if __name__ == '__main__':
+    main()
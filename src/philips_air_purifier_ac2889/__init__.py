@@ -3,7 +3,30 @@ Library to control Philips AC2889 air purifier.
 """
 
 from ._air_purifier import AirPurifier
-from ._utils import ALLOWED_PARAMETERS
+from ._async_air_purifier import AsyncAirPurifier
+from ._cache import ResponseCache
+from ._collector import CollectorService, StatusBoard, BoardEntry
+from ._daemon import PurifierDaemon, DaemonClient
+from ._discovery import discover, discover_hosts
+from ._executor import CommandExecutor, ExecutorStats, CONTROL, TELEMETRY
+from ._fleet import PurifierFleet, DeviceResult
+from ._gateway import PurifierGateway
+from ._history import HistoryStore, HistoryReader
+from ._key_pool import KeyPool
+from ._observer import Observer, HistogramCollector
+from ._options import ClientOptions
+from ._recorder import ReadingRecorder, DeviceSeries
+from ._resolver import HostResolver
+from ._retry import RetryPolicy
+from ._rules import Rule, RuleEngine
+from ._scheduler import AdaptiveScheduler, SchedulerStats
+from ._session_store import SessionStore, MemorySessionStore, FileSessionStore
+from ._simulator import DeviceSimulator
+from ._status import PurifierStatus, PurifierStatusBatch
+from ._transport import Transport, SessionTransport, AsyncTransport, AsyncHttpTransport
+from ._watch import ChangeDetector, StatusChange
+from ._write_queue import WriteQueue
+from ._utils import ALLOWED_PARAMETERS, ParameterValidator
 from . import errors
 
 
@@ -14,6 +37,50 @@ __version__ = '2.0.0'
 
 __all__ = [
     'AirPurifier',
+    'AsyncAirPurifier',
+    'ResponseCache',
+    'CollectorService',
+    'StatusBoard',
+    'BoardEntry',
+    'PurifierDaemon',
+    'DaemonClient',
+    'discover',
+    'discover_hosts',
+    'CommandExecutor',
+    'ExecutorStats',
+    'CONTROL',
+    'TELEMETRY',
+    'PurifierFleet',
+    'DeviceResult',
+    'PurifierGateway',
+    'HistoryStore',
+    'HistoryReader',
+    'KeyPool',
+    'Observer',
+    'HistogramCollector',
+    'ClientOptions',
+    'ReadingRecorder',
+    'DeviceSeries',
+    'HostResolver',
+    'RetryPolicy',
+    'Rule',
+    'RuleEngine',
+    'AdaptiveScheduler',
+    'SchedulerStats',
+    'SessionStore',
+    'MemorySessionStore',
+    'FileSessionStore',
+    'DeviceSimulator',
+    'PurifierStatus',
+    'PurifierStatusBatch',
+    'Transport',
+    'SessionTransport',
+    'AsyncTransport',
+    'AsyncHttpTransport',
+    'ChangeDetector',
+    'StatusChange',
+    'WriteQueue',
     'ALLOWED_PARAMETERS',
+    'ParameterValidator',
     'errors',
 ]
@@ -0,0 +1,8 @@
+"""Runs command line interface with ``python -m philips_air_purifier_ac2889``."""
+
+import sys
+
+from ._cli import main
+
+
+sys.exit(main())
@@ -1,18 +1,19 @@
 """Module contains main client to control air purifier."""
 
-import os
-import socket
-import random
-import json
-from typing import Union, Dict
+import time
+import threading
+from typing import Union, Dict, Callable, Iterator
 
-import requests
+from ._base_air_purifier import BaseAirPurifier
+from ._transport import Transport, SessionTransport
+from ._observer import timer
+from ._options import ClientOptions
+from ._status import PurifierStatus
+from ._watch import ChangeDetector, StatusChange
+from .errors import ResponseDecodingError
 
-from ._utils import aes_decrypt, encrypt, decrypt, filter_response_data, filter_request_data
-from .errors import ClientNotConnectedError, ParameterRequiredError
 
-
-class AirPurifier:
+class AirPurifier(BaseAirPurifier):
     """
     Client to control Philips Air Purifier device.
 
@@ -38,27 +39,56 @@ class AirPurifier:
 
         philips_air_purifier.set(mode='M', om=new_speed)
 
+    Client keeps connections to device alive between requests. Close it when it is not needed anymore
+    or use it as context manager:
+
+    .. code:: python
+
+        with AirPurifier(host='192.168.1.21').connect() as philips_air_purifier:
+            print(philips_air_purifier.get())
+
+    Client is thread-safe, one instance can be shared by many threads. Key exchange is done by one thread
+    at a time, threads which call ``connect()`` or find stale session key while other thread exchanges keys
+    wait for it and use its session key.
+
+    :param host: IP address or DNS name of air purifier device, optionally with port, e.g. 192.168.1.21:8080
+    :param no_proxy: proxy will be ignored for defined here IP addresses, e.g.: 192.168.1.5,192.168.1.26
+    :param transport: HTTP transport used to communicate with device, client takes its ownership
+    :param pool_size: maximal number of kept alive connections, used only if transport is not given
+    :param options: optional settings and collaborators of client, e.g. timeout, retry policy or cache,
+                    defaults are used if it is None
+
+    Number of repeated requests and key exchanges done because of stale session key is counted in
+    ``counters`` (``retries`` and ``reconnects`` keys).
     """
 
-    def __init__(self, host: str, no_proxy: Union[str, None] = None) -> None:
-        self.host = host
-        self.no_proxy = no_proxy
-        self.session_key = None
-        self.is_connected = False
+    def __init__(self, host: str, no_proxy: Union[str, None] = None, transport: Union[Transport, None] = None,
+                 pool_size: int = 1, *, options: Union[ClientOptions, None] = None) -> None:
+        super().__init__(host, options)
+        self.transport = transport if transport is not None else SessionTransport(pool_size=pool_size)
+        if no_proxy is not None:
+            self.no_proxy = no_proxy
+        self._handshake_lock = threading.Lock()
+
+    def __enter__(self) -> 'AirPurifier':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     @property
-    def host(self) -> str:
+    def no_proxy(self) -> Union[str, None]:
         """
-        Returns IP address of air purifier.
+        Returns addresses which are connected without proxy, they are kept by transport.
 
-        :return: IP address
+        :return: comma separated addresses or None
         """
 
-        return self._host
+        return self.transport.no_proxy
 
-    @host.setter
-    def host(self, value: str) -> None:
-        self._host = socket.gethostbyname(value)
+    @no_proxy.setter
+    def no_proxy(self, value: Union[str, None]) -> None:
+        self.transport.no_proxy = value
 
     def connect(self, host: Union[str, None] = None, no_proxy: Union[str, None] = None) -> 'AirPurifier':
         """
@@ -69,62 +99,34 @@ class AirPurifier:
         :return: self
         """
 
-        if host is not None:
-            self.host = host
-        if no_proxy is not None:
-            self.no_proxy = no_proxy
-
-        if self.no_proxy is not None:
-            os.environ['NO_PROXY'] = self.no_proxy
+        self._configure(host, no_proxy)
 
-        signed = int('A4D1CBD5C3FD34126765A442EFB99905F8104DD258AC507FD6406CFF14266D31266FEA1E5C41564B777E69'
-                     '0F5504F213160217B4B01B886A5E91547F9E2749F4D7FBD7D3B9A92EE1909D0D2263F80A76A6A24C087A09'
-                     '1F531DBF0A0169B6A28AD662A4D18E73AFA32D779D5918D08BC8858F4DCEF97C2A24855E6EEB22B3B2E5', 16)
-        moulus = int('B10B8F96A080E01DDE92DE5EAE5D54EC52C99FBCFB06A3C69A6A9DCA52D23B616073E28675A23D189838EF'
-                     '1E2EE652C013ECB4AEA906112324975C3CD49B83BFACCBDD7D90C4BD7098488E9C219A73724EFFD6FAE564'
-                     '4738FAA31A4FF55BCCC0A151AF5F0DC8B4BD45BF37DF365C1A65E68CFDA76D4DA708DF1FB2BC2E4A4371', 16)
+        session_key = self.session_key
+        with self._handshake_lock:
+            if self.is_connected and self.session_key != session_key:
+                return self  # other thread connected while this one waited
 
-        bits = random.getrandbits(256)
-        enc_key = pow(signed, bits, moulus)
-        body = json.dumps({'diffie': hex(enc_key)[2:]})
-        enc_body = body.encode('ascii')
-
-        resp = requests.put(f'http://{self.host}/di/v1/products/0/security', data=enc_body)
-        resp = resp.content.decode('ascii')
-        data = json.loads(resp)
-
-        if 'key' not in data:
-            raise ClientNotConnectedError('Connection URL is probably invalid. Device is not supported.')
-
-        data_signed = int(data['hellman'], 16)
-        new_enc_key = pow(data_signed, bits, moulus)
-        new_enc_key_bytes = new_enc_key.to_bytes(128, byteorder='big')[:16]
-        session_key = aes_decrypt(new_enc_key_bytes, bytes.fromhex(data['key']))
-
-        self.session_key = session_key[:16]
-        self.is_connected = True
+            with timer(self.options.observer, self.host, 'connect'):
+                if self.options.session_store is None or not self._resume_session():
+                    self._exchange_keys()
 
         return self
 
-    def get(self, *parameters: str) -> Dict:
+    def get(self, *parameters: str, typed: bool = False) -> Union[Dict, PurifierStatus]:
         """
         Reads information from device.
 
         :param parameters: list of information to return
+        :param typed: returns compact :class:`PurifierStatus` with normalized values instead of dictionary
         :return: requested information
         """
 
-        if not self.is_connected:
-            raise ClientNotConnectedError("Client was not connected to device.")
-
-        resp = requests.get(f'http://{self.host}/di/v1/products/1/air')
-        resp = decrypt(self.session_key, resp.content)
-        data = json.loads(resp)
+        self._check_connected()
 
-        if parameters:
-            data = filter_response_data(data, *parameters)
+        with timer(self.options.observer, self.host, 'get'):
+            data = self._read('air', '/di/v1/products/1/air')
 
-        return data
+        return self._response_data(data, parameters, typed)
 
     def set(self, **parameters: Union[str, int]) -> Dict:
         """
@@ -134,20 +136,41 @@ class AirPurifier:
         :return:
         """
 
-        if not self.is_connected:
-            raise ClientNotConnectedError("Client was not connected to device.")
+        self._check_connected()
+        data = self._request_data(parameters)
 
-        if not parameters:
-            raise ParameterRequiredError('At least one parameter must be provided.')
+        with timer(self.options.observer, self.host, 'set'):
+            response = self._request(lambda: self._send('PUT', '/di/v1/products/1/air', self._encrypt(data)))
 
-        data = filter_request_data(parameters)
-        enc_body = encrypt(self.session_key, data)
+        return self._updated(response)
 
-        resp = requests.put(f'http://{self.host}/di/v1/products/1/air', data=enc_body)
-        resp = decrypt(self.session_key, resp.content)
-        data = json.loads(resp)
+    def watch(self, interval: float, *parameters: str, deadbands: Union[Dict[str, float], None] = None,
+              coalesce: float = 0.0) -> Iterator[StatusChange]:
+        """
+        Reads information from device every interval and yields only changed fields. The first reading
+        is yielded as a whole.
+
+        .. code:: python
 
-        return data
+            for change in philips_air_purifier.watch(5, 'pm25', 'mode', 'err', deadbands={'pm25': 5}):
+                print(change.timestamp, change.changes)
+
+        :param interval: time between readings in seconds
+        :param parameters: list of information to watch, all information is watched if it is empty
+        :param deadbands: minimal change of numeric fields, e.g. ``{'pm25': 5}``
+        :param coalesce: minimal time in seconds between yielded changes, changes in between are merged
+        :return: iterator of changes
+        """
+
+        detector = ChangeDetector(deadbands, coalesce)
+        deadline = time.monotonic()
+
+        while True:
+            change = detector.update(self.get(*parameters), time.time())
+            if change is not None:
+                yield change
+            deadline += interval
+            time.sleep(max(deadline - time.monotonic(), 0))
 
     def network(self) -> dict:
         """
@@ -156,11 +179,77 @@ class AirPurifier:
         :return: dictionary of local network settings
         """
 
-        if not self.is_connected:
-            raise ClientNotConnectedError("Client was not connected to device.")
+        self._check_connected()
+
+        with timer(self.options.observer, self.host, 'network'):
+            return self._read('wifi', '/di/v1/products/0/wifi')
+
+    def close(self) -> None:
+        """
+        Closes connections to device. Client must be connected again before next use.
+        """
 
-        resp = requests.get(f'http://{self.host}/di/v1/products/0/wifi')
-        resp = decrypt(self.session_key, resp.content)
-        data = json.loads(resp)
+        self.transport.close()
+        self.session_key = None
+        self.is_connected = False
 
-        return data
+    def _exchange_keys(self) -> None:
+        with timer(self.options.observer, self.host, 'handshake'):
+            bits, enc_body = self._key_exchange()
+            self._start_session(bits, self._send('PUT', '/di/v1/products/0/security', enc_body))
+
+    def _resume_session(self) -> bool:
+        session_key = self.options.session_store.get(self.host)
+        if session_key is None:
+            return False
+
+        return self._resume(session_key, self._send('GET', '/di/v1/products/1/air'))
+
+    def _read(self, endpoint: str, path: str) -> Dict:
+        def load():
+            return self._request(lambda: self._send('GET', path))
+
+        if self.options.cache is None:
+            return load()
+
+        return self.options.cache.get(self.host, endpoint, load)
+
+    def _request(self, send: Callable[[], bytes]) -> Dict:
+        session_key = self.session_key
+        try:
+            return self._decode(send())
+        except ResponseDecodingError:
+            if not self._can_reconnect():
+                raise
+            self._reconnect(session_key)
+            return self._decode(send())
+
+    def _reconnect(self, stale_key: bytes) -> None:
+        with self._handshake_lock:
+            if self._end_session(stale_key):  # other thread could already exchange keys
+                self._exchange_keys()
+
+    def _send(self, method: str, path: str, data: Union[bytes, None] = None) -> bytes:
+        attempt = 1
+
+        while True:
+            url = f'http://{self._address()}{path}'
+            try:
+                with timer(self.options.observer, self.host, 'http'):
+                    if method == 'GET':
+                        return self.transport.get(url, timeout=self.options.timeout)
+                    return self.transport.put(url, data, timeout=self.options.timeout)
+            except self.transport.transient_errors:
+                delay = self._retry_delay(attempt)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    def _address(self) -> str:
+        address = self.options.resolver.cached(self.host)
+        if address is None:
+            with timer(self.options.observer, self.host, 'resolve'):
+                address = self.options.resolver.resolve(self.host)
+
+        return address
@@ -0,0 +1,247 @@
+"""Module contains asynchronous client to control air purifier."""
+
+import time
+import asyncio
+from typing import Union, Dict, Callable, Awaitable, AsyncIterator
+
+from ._base_air_purifier import BaseAirPurifier
+from ._transport import AsyncTransport, AsyncHttpTransport
+from ._observer import timer
+from ._options import ClientOptions
+from ._status import PurifierStatus
+from ._watch import ChangeDetector, StatusChange
+from .errors import ResponseDecodingError
+
+
+class AsyncAirPurifier(BaseAirPurifier):
+    """
+    Asynchronous client to control Philips Air Purifier device. It provides the same methods as
+    :class:`AirPurifier` as coroutines.
+
+    .. code:: python
+
+        import asyncio
+        from philips_air_purifier_ac2889 import AsyncAirPurifier
+
+        async def main():
+            async with AsyncAirPurifier(host='192.168.1.21') as philips_air_purifier:
+                await philips_air_purifier.connect()
+                print(await philips_air_purifier.get())
+                await philips_air_purifier.set(pwr='1')
+
+        asyncio.run(main())
+
+    Many devices can be controlled from one event loop. Pass the same semaphore to all clients to limit number
+    of requests sent at the same time:
+
+    .. code:: python
+
+        async def read_all(hosts):
+            semaphore = asyncio.Semaphore(32)
+            clients = [AsyncAirPurifier(host=host, semaphore=semaphore) for host in hosts]
+            await asyncio.gather(*(client.connect() for client in clients))
+            return await asyncio.gather(*(client.get('pm25') for client in clients))
+
+    Client can be shared by many coroutines of one event loop. Coroutines which call ``connect()`` or find stale
+    session key while other coroutine exchanges keys wait for it and use its session key.
+
+    :param host: IP address or DNS name of air purifier device, optionally with port, e.g. 192.168.1.21:8080
+    :param no_proxy: accepted for compatibility with :class:`AirPurifier`, default transport does not use proxy
+    :param transport: HTTP transport used to communicate with device, client takes its ownership
+    :param pool_size: maximal number of kept alive connections, used only if transport is not given
+    :param semaphore: limits number of concurrent requests, can be shared between clients
+    :param options: optional settings and collaborators of client, e.g. timeout, retry policy or cache,
+                    defaults are used if it is None
+    """
+
+    # pylint: disable-next=too-many-arguments  # semaphore is shared by clients, it is not option of one client
+    def __init__(self, host: str, no_proxy: Union[str, None] = None, transport: Union[AsyncTransport, None] = None,
+                 pool_size: int = 1, *, semaphore: Union[asyncio.Semaphore, None] = None,
+                 options: Union[ClientOptions, None] = None) -> None:
+        super().__init__(host, options)
+        self.no_proxy = no_proxy
+        self.transport = transport if transport is not None else AsyncHttpTransport(pool_size=pool_size)
+        self.semaphore = semaphore
+        self._handshake_lock = None
+
+    async def __aenter__(self) -> 'AsyncAirPurifier':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def connect(self, host: Union[str, None] = None, no_proxy: Union[str, None] = None) -> 'AsyncAirPurifier':
+        """
+        Connects air purifier client to device in local network.
+
+        :param host: IP address or DNS name of air purifier device
+        :param no_proxy: accepted for compatibility with :class:`AirPurifier`
+        :return: self
+        """
+
+        self._configure(host, no_proxy)
+
+        session_key = self.session_key
+        async with self._lock():
+            if self.is_connected and self.session_key != session_key:
+                return self  # other coroutine connected while this one waited
+
+            with timer(self.options.observer, self.host, 'connect'):
+                if self.options.session_store is None or not await self._resume_session():
+                    await self._exchange_keys()
+
+        return self
+
+    async def get(self, *parameters: str, typed: bool = False) -> Union[Dict, PurifierStatus]:
+        """
+        Reads information from device.
+
+        :param parameters: list of information to return
+        :param typed: returns compact :class:`PurifierStatus` with normalized values instead of dictionary
+        :return: requested information
+        """
+
+        self._check_connected()
+
+        with timer(self.options.observer, self.host, 'get'):
+            data = await self._read('air', '/di/v1/products/1/air')
+
+        return self._response_data(data, parameters, typed)
+
+    async def set(self, **parameters: Union[str, int]) -> Dict:
+        """
+        Sets given parameters on device.
+
+        :param parameters: dictionary of keys and values to set
+        :return:
+        """
+
+        self._check_connected()
+        data = self._request_data(parameters)
+
+        with timer(self.options.observer, self.host, 'set'):
+            response = await self._request(lambda: self._send('PUT', '/di/v1/products/1/air', self._encrypt(data)))
+
+        return self._updated(response)
+
+    async def watch(self, interval: float, *parameters: str, deadbands: Union[Dict[str, float], None] = None,
+                    coalesce: float = 0.0) -> AsyncIterator[StatusChange]:
+        """
+        Reads information from device every interval and yields only changed fields. The first reading
+        is yielded as a whole.
+
+        .. code:: python
+
+            async for change in philips_air_purifier.watch(5, 'pm25', 'mode', 'err', deadbands={'pm25': 5}):
+                print(change.timestamp, change.changes)
+
+        :param interval: time between readings in seconds
+        :param parameters: list of information to watch, all information is watched if it is empty
+        :param deadbands: minimal change of numeric fields, e.g. ``{'pm25': 5}``
+        :param coalesce: minimal time in seconds between yielded changes, changes in between are merged
+        :return: asynchronous iterator of changes
+        """
+
+        detector = ChangeDetector(deadbands, coalesce)
+        deadline = time.monotonic()
+
+        while True:
+            change = detector.update(await self.get(*parameters), time.time())
+            if change is not None:
+                yield change
+            deadline += interval
+            await asyncio.sleep(max(deadline - time.monotonic(), 0))
+
+    async def network(self) -> dict:
+        """
+        Reads network settings.
+
+        :return: dictionary of local network settings
+        """
+
+        self._check_connected()
+
+        with timer(self.options.observer, self.host, 'network'):
+            return await self._read('wifi', '/di/v1/products/0/wifi')
+
+    async def close(self) -> None:
+        """
+        Closes connections to device. Client must be connected again before next use.
+        """
+
+        await self.transport.close()
+        self.session_key = None
+        self.is_connected = False
+
+    async def _exchange_keys(self) -> None:
+        with timer(self.options.observer, self.host, 'handshake'):
+            bits, enc_body = self._key_exchange()
+            self._start_session(bits, await self._send('PUT', '/di/v1/products/0/security', enc_body))
+
+    async def _resume_session(self) -> bool:
+        session_key = self.options.session_store.get(self.host)
+        if session_key is None:
+            return False
+
+        return self._resume(session_key, await self._send('GET', '/di/v1/products/1/air'))
+
+    async def _read(self, endpoint: str, path: str) -> Dict:
+        async def load():
+            return await self._request(lambda: self._send('GET', path))
+
+        if self.options.cache is None:
+            return await load()
+
+        return await self.options.cache.get_async(self.host, endpoint, load)
+
+    async def _request(self, send: Callable[[], Awaitable[bytes]]) -> Dict:
+        session_key = self.session_key
+        try:
+            return self._decode(await send())
+        except ResponseDecodingError:
+            if not self._can_reconnect():
+                raise
+            await self._reconnect(session_key)
+            return self._decode(await send())
+
+    async def _reconnect(self, stale_key: bytes) -> None:
+        async with self._lock():
+            if self._end_session(stale_key):  # other coroutine could already exchange keys
+                await self._exchange_keys()
+
+    def _lock(self) -> asyncio.Lock:
+        if self._handshake_lock is None:
+            self._handshake_lock = asyncio.Lock()  # created in running loop, required by Python < 3.10
+
+        return self._handshake_lock
+
+    async def _send(self, method: str, path: str, data: Union[bytes, None] = None) -> bytes:
+        attempt = 1
+
+        while True:
+            url = f'http://{await self._address()}{path}'
+            try:
+                if self.semaphore is None:
+                    return await self._transfer(method, url, data)
+                async with self.semaphore:
+                    return await self._transfer(method, url, data)
+            except self.transport.transient_errors:
+                delay = self._retry_delay(attempt)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _address(self) -> str:
+        address = self.options.resolver.cached(self.host)
+        if address is None:
+            with timer(self.options.observer, self.host, 'resolve'):
+                address = await self.options.resolver.resolve_async(self.host)
+
+        return address
+
+    async def _transfer(self, method: str, url: str, data: Union[bytes, None]) -> bytes:
+        with timer(self.options.observer, self.host, 'http'):
+            if method == 'GET':
+                return await self.transport.get(url, timeout=self.options.timeout)
+            return await self.transport.put(url, data, timeout=self.options.timeout)
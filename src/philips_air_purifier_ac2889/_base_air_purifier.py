@@ -0,0 +1,156 @@
+"""Module contains part of air purifier clients which does not depend on way of sending requests."""
+
+from collections import Counter
+from typing import Union, Dict, Iterable, Tuple
+
+from ._observer import timer
+from ._options import ClientOptions
+from ._resolver import DEFAULT_RESOLVER
+from ._status import PurifierStatus
+from ._utils import (SessionCipher, create_key_exchange, derive_session_key, filter_response_data,
+                     filter_request_data)
+from .errors import ClientNotConnectedError, ParameterRequiredError, ResponseDecodingError
+
+
+class BaseAirPurifier:
+    """
+    Session with Philips Air Purifier device shared by :class:`AirPurifier` and :class:`AsyncAirPurifier`.
+    It keeps session key, encrypts and decodes messages and decides when requests are repeated, subclasses
+    send requests to device and provide public methods.
+
+    :param host: IP address or DNS name of air purifier device, optionally with port, e.g. 192.168.1.21:8080
+    :param options: optional settings and collaborators of client, defaults are used if it is None
+    """
+
+    def __init__(self, host: str, options: Union[ClientOptions, None] = None) -> None:
+        self.host = host
+        self.counters = Counter()
+        self.is_connected = False
+        self._options = _with_resolver(options)
+        self._cipher = None
+
+    @property
+    def options(self) -> ClientOptions:
+        """
+        Returns optional settings and collaborators of client.
+
+        :return: options with resolver of client
+        """
+
+        return self._options
+
+    @options.setter
+    def options(self, value: Union[ClientOptions, None]) -> None:
+        self._options = _with_resolver(value)
+
+    @property
+    def session_key(self) -> Union[bytes, None]:
+        """
+        Returns key of current session with device.
+
+        :return: session key or None if client was not connected
+        """
+
+        cipher = self._cipher
+
+        return cipher.key if cipher is not None else None
+
+    @session_key.setter
+    def session_key(self, value: Union[bytes, None]) -> None:
+        self._cipher = SessionCipher(value) if value is not None else None
+
+    def _configure(self, host: Union[str, None], no_proxy: Union[str, None]) -> None:
+        if host is not None:
+            self.host = host
+        if no_proxy is not None:
+            self.no_proxy = no_proxy  # pylint: disable=attribute-defined-outside-init  # set by subclasses
+
+    def _check_connected(self) -> None:
+        if not self.is_connected:
+            raise ClientNotConnectedError("Client was not connected to device.")
+
+    def _key_exchange(self) -> Tuple[int, bytes]:
+        return self.options.key_pool.take() if self.options.key_pool is not None else create_key_exchange()
+
+    def _start_session(self, bits: int, response: bytes) -> None:
+        self.session_key = derive_session_key(bits, response)
+        self.is_connected = True
+
+        if self.options.session_store is not None:
+            self.options.session_store.set(self.host, self.session_key)
+
+    def _resume(self, session_key: bytes, response: bytes) -> bool:
+        try:
+            SessionCipher(session_key).decode(response)
+        except ResponseDecodingError:
+            self.options.session_store.delete(self.host)  # device was restarted or has other session
+            return False
+
+        self.session_key = session_key
+        self.is_connected = True
+
+        return True
+
+    def _can_reconnect(self) -> bool:
+        return self.options.retry is not None and self.options.retry.reconnect
+
+    def _end_session(self, stale_key: bytes) -> bool:
+        if self.session_key != stale_key:
+            return False  # other caller already exchanged keys
+
+        self.counters['reconnects'] += 1
+        if self.options.session_store is not None:
+            self.options.session_store.delete(self.host)
+
+        return True
+
+    def _retry_delay(self, attempt: int) -> Union[float, None]:
+        self.options.resolver.invalidate(self.host)  # device could get new address
+        if self.options.retry is None or attempt >= self.options.retry.attempts:
+            return None
+
+        self.counters['retries'] += 1
+
+        return self.options.retry.delay(attempt)
+
+    def _encrypt(self, data: Dict) -> bytes:
+        with timer(self.options.observer, self.host, 'encrypt'):
+            return self._cipher.encrypt(data)
+
+    def _decode(self, data: bytes) -> Dict:
+        if self.options.observer is None:
+            return self._cipher.decode(data)
+
+        with timer(self.options.observer, self.host, 'decrypt'):
+            message = self._cipher.decrypt(data)
+        with timer(self.options.observer, self.host, 'parse'):
+            return self._cipher.parse(message)
+
+    def _updated(self, response: Dict) -> Dict:
+        if self.options.cache is not None:
+            self.options.cache.update(self.host, 'air', response)
+
+        return response
+
+    @staticmethod
+    def _request_data(parameters: Dict[str, Union[str, int]]) -> Dict:
+        if not parameters:
+            raise ParameterRequiredError('At least one parameter must be provided.')
+
+        return filter_request_data(parameters)
+
+    @staticmethod
+    def _response_data(data: Dict, parameters: Iterable[str], typed: bool) -> Union[Dict, PurifierStatus]:
+        if parameters:
+            data = filter_response_data(data, *parameters)
+
+        if typed:
+            return PurifierStatus.from_dict(data)
+
+        return data
+
+
+def _with_resolver(options: Union[ClientOptions, None]) -> ClientOptions:
+    options = options if options is not None else ClientOptions()
+
+    return options if options.resolver is not None else options._replace(resolver=DEFAULT_RESOLVER)
@@ -0,0 +1,185 @@
+"""Module contains cache of responses of air purifiers."""
+
+import time
+import asyncio
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Tuple, Union
+
+
+DEFAULT_TTL = {'air': 1.0, 'wifi': 300.0}
+
+_RELOAD = object()
+
+
+class ResponseCache:  # pylint: disable=too-many-instance-attributes  # pending loads of threads and coroutines
+    """
+    Keeps responses of devices for a short time, so many readers of the same device share one request.
+    Callers which ask for response which is being read wait for the pending request instead of sending
+    their own one. Cache can be shared by many clients, responses are kept per device and endpoint. Response
+    which was being read while device was changed (:meth:`update`, :meth:`invalidate`) is not kept.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import AirPurifier, ClientOptions, ResponseCache
+
+        cache = ResponseCache(ttl={'air': 2, 'wifi': 600})
+        philips_air_purifier = AirPurifier(host='192.168.1.21', options=ClientOptions(cache=cache)).connect()
+
+        philips_air_purifier.get()
+        philips_air_purifier.get('pm25')  # served from cache
+        print(cache.counters)
+
+    Numbers of served (``hits``), read (``misses``) and joined pending (``coalesced``) responses are counted
+    in ``counters``.
+
+    :param ttl: time in seconds for which response is kept per endpoint (``air``, ``wifi``), responses
+                of other endpoints are not kept
+    :param clock: monotonic clock returning seconds
+    """
+
+    def __init__(self, ttl: Union[Dict[str, float], None] = None, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = dict(DEFAULT_TTL if ttl is None else ttl)
+        self.counters = Counter()
+        self._clock = clock
+        self._entries = {}
+        self._pending = {}
+        self._async_pending = {}
+        self._stale = set()
+        self._lock = threading.Lock()
+
+    def get(self, host: str, endpoint: str, load: Callable[[], Dict]) -> Dict:
+        """
+        Returns response of device from cache or reads it.
+
+        :param host: address of device
+        :param endpoint: name of endpoint, e.g. ``air``
+        :param load: function which reads response from device
+        :return: response of device
+        """
+
+        key = (host, endpoint)
+        with self._lock:
+            data = self._lookup(key)
+            if data is not None:
+                return data
+            future = self._pending.get(key)
+            if future is None:
+                self.counters['misses'] += 1
+                future = self._pending[key] = Future()
+                loading = True
+            else:
+                self.counters['coalesced'] += 1
+                loading = False
+
+        if not loading:
+            return dict(future.result())
+
+        try:
+            data = load()
+        except BaseException as error:  # waiters are released also on interruption of reading thread
+            self._finish(key, self._pending, future.set_exception, error)
+            raise
+        self._finish(key, self._pending, future.set_result, data)
+
+        return dict(data)
+
+    async def get_async(self, host: str, endpoint: str, load: Callable[[], Awaitable[Dict]]) -> Dict:
+        """
+        Returns response of device from cache or reads it in running event loop. If reading caller is
+        cancelled, one of waiting callers reads response again.
+
+        :param host: address of device
+        :param endpoint: name of endpoint, e.g. ``air``
+        :param load: coroutine function which reads response from device
+        :return: response of device
+        """
+
+        key = (host, endpoint)
+        while True:
+            with self._lock:
+                data = self._lookup(key)
+                if data is not None:
+                    return data
+                future = self._async_pending.get(key)
+                if future is None:
+                    self.counters['misses'] += 1
+                    future = self._async_pending[key] = asyncio.get_running_loop().create_future()
+                    break
+                self.counters['coalesced'] += 1
+
+            data = await asyncio.shield(future)
+            if data is not _RELOAD:
+                return dict(data)
+            # caller which was reading response was cancelled, one of waiters reads it again
+
+        try:
+            data = await load()
+        except asyncio.CancelledError:
+            self._finish(key, self._async_pending, future.set_result, _RELOAD)
+            raise
+        except BaseException as error:
+            self._finish(key, self._async_pending, future.set_exception, error)
+            future.exception()  # error is raised to caller, waiters are not required
+            raise
+        self._finish(key, self._async_pending, future.set_result, data)
+
+        return dict(data)
+
+    def update(self, host: str, endpoint: str, data: Dict) -> None:
+        """
+        Updates kept response with new values, e.g. with response to request which set parameters.
+
+        :param host: address of device
+        :param endpoint: name of endpoint, e.g. ``air``
+        :param data: new values
+        """
+
+        key = (host, endpoint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], {**entry[1], **data})
+            self._mark_stale(key)
+
+    def invalidate(self, host: str, endpoint: Union[str, None] = None) -> None:
+        """
+        Removes kept responses of device.
+
+        :param host: address of device
+        :param endpoint: name of endpoint, all endpoints if it is None
+        """
+
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] == host and endpoint in (None, key[1]):
+                    del self._entries[key]
+            for key in list(self._pending) + list(self._async_pending):
+                if key[0] == host and endpoint in (None, key[1]):
+                    self._mark_stale(key)
+
+    def _lookup(self, key: Tuple[str, str]) -> Union[Dict, None]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self._clock():
+            del self._entries[key]
+            return None
+
+        self.counters['hits'] += 1
+
+        return dict(entry[1])
+
+    def _mark_stale(self, key: Tuple[str, str]) -> None:
+        if key in self._pending or key in self._async_pending:
+            self._stale.add(key)  # response which is being read may be older than new values
+
+    def _finish(self, key: Tuple[str, str], pending: Dict, resolve: Callable[[Any], None], result: Any) -> None:
+        with self._lock:
+            stale = key in self._stale
+            self._stale.discard(key)
+            if isinstance(result, dict) and not stale and self.ttl.get(key[1], 0) > 0:
+                self._entries[key] = (self._clock() + self.ttl[key[1]], result)
+            del pending[key]
+        resolve(result)
@@ -0,0 +1,168 @@
+"""Module contains command line interface of air purifier package."""
+
+import os
+import sys
+import json
+import stat
+import argparse
+import tempfile
+from typing import Any, Dict, List, Union
+
+from ._air_purifier import AirPurifier
+from ._daemon import DaemonClient, PurifierDaemon
+from ._gateway import PurifierGateway
+from ._options import ClientOptions
+from ._utils import ParameterValidator
+from .errors import AirPurifierError
+
+
+def default_socket() -> str:
+    """
+    Returns path to socket of daemon, set by ``PHILIPS_AIR_PURIFIER_SOCKET`` environment variable or socket
+    in runtime directory of current user (``XDG_RUNTIME_DIR``). If there is no runtime directory, socket is
+    kept in directory of current user in temporary directory, which only the user can access.
+
+    :return: path to Unix socket
+    """
+
+    path = os.environ.get('PHILIPS_AIR_PURIFIER_SOCKET')
+    if path:
+        return path
+
+    return os.path.join(os.environ.get('XDG_RUNTIME_DIR') or _private_directory(), 'philips-air-purifier.sock')
+
+
+def _private_directory() -> str:
+    user = getattr(os, 'getuid', lambda: None)()
+    directory = os.path.join(tempfile.gettempdir(), f'philips-air-purifier-{user if user is not None else "user"}')
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    info = os.lstat(directory)  # directory could be created by other user before
+    if not stat.S_ISDIR(info.st_mode) or user is not None and (info.st_uid != user or info.st_mode & 0o077):
+        raise PermissionError(f'Directory {directory} of daemon socket is not private directory of current user.')
+
+    return directory
+
+
+def _parameters(values: List[str]) -> Dict[str, str]:
+    parameters = {}
+    for value in values:
+        key, separator, value = value.partition('=')
+        if not separator or not key:
+            raise argparse.ArgumentTypeError(f'Parameter "{key}" must be given as key=value.')
+        parameters[key] = value
+
+    return parameters
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='philips-air-purifier',
+                                     description='Controls Philips AC2889 air purifiers in local network.')
+    parser.add_argument('--socket', help='Unix socket of daemon (default: philips-air-purifier.sock in '
+                                          '$XDG_RUNTIME_DIR or in private directory in temporary directory)')
+    parser.add_argument('--direct', action='store_true',
+                        help='connect to device directly even if daemon is running')
+    parser.add_argument('--timeout', type=float, default=10.0,
+                        help='timeout of single request in seconds (default: %(default)s)')
+    parser.add_argument('--no-proxy', help='addresses connected without proxy, e.g. 192.168.1.5,192.168.1.26')
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+
+    get = commands.add_parser('get', help='read status of device')
+    get.add_argument('host', help='IP address or DNS name of device')
+    get.add_argument('parameters', nargs='*', help='names of returned parameters, e.g. pm25 mode')
+
+    set_ = commands.add_parser('set', help='set parameters of device')
+    set_.add_argument('host', help='IP address or DNS name of device')
+    set_.add_argument('parameters', nargs='+', metavar='key=value', help='parameters to set, e.g. mode=M om=2')
+
+    network = commands.add_parser('network', help='read network settings of device')
+    network.add_argument('host', help='IP address or DNS name of device')
+
+    daemon = commands.add_parser('daemon', help='keep devices connected and serve requests on Unix socket')
+    daemon.add_argument('hosts', nargs='*', help='devices connected when daemon starts')
+
+    gateway = commands.add_parser('gateway', help='serve devices over local HTTP API')
+    gateway.add_argument('hosts', nargs='+', help='devices served by gateway')
+    gateway.add_argument('--address', default='127.0.0.1', help='address of gateway (default: %(default)s)')
+    gateway.add_argument('--port', type=int, default=8080, help='port of gateway (default: %(default)s)')
+
+    return parser
+
+
+def _server(args: argparse.Namespace) -> Union[PurifierDaemon, PurifierGateway]:
+    options = ClientOptions(timeout=args.timeout)
+    if args.command == 'daemon':
+        return PurifierDaemon(args.socket, args.hosts, no_proxy=args.no_proxy, options=options)
+
+    return PurifierGateway(args.hosts, args.address, args.port, no_proxy=args.no_proxy, options=options)
+
+
+def _through_daemon(args: argparse.Namespace, parameters: Any) -> Any:
+    with DaemonClient(args.socket, timeout=args.timeout) as client:
+        return client.request(args.command, args.host, parameters)
+
+
+def _directly(args: argparse.Namespace, parameters: Any) -> Any:
+    options = ClientOptions(timeout=args.timeout)
+    with AirPurifier(args.host, no_proxy=args.no_proxy, options=options).connect() as purifier:
+        if args.command == 'get':
+            return purifier.get(*parameters)
+        if args.command == 'set':
+            return purifier.set(**ParameterValidator(coerce=True).validate(parameters))
+        return purifier.network()
+
+
+def main(argv: Union[List[str], None] = None) -> int:
+    """
+    Runs command line interface. Commands are sent to daemon if it is running, otherwise device is connected
+    directly.
+
+    .. code:: shell
+
+        philips-air-purifier daemon 192.168.1.21 &
+        philips-air-purifier get 192.168.1.21 pm25 mode
+        philips-air-purifier set 192.168.1.21 mode=M om=2
+
+    :param argv: command line arguments, arguments of process if it is None
+    :return: exit code
+    """
+
+    parser = _parser()
+    args = parser.parse_args(argv)
+    try:
+        args.socket = args.socket or default_socket()
+    except OSError as error:
+        print(f'philips-air-purifier: {error}', file=sys.stderr)
+        return 1
+
+    if args.command in ('daemon', 'gateway'):
+        try:
+            _server(args).serve_forever()
+        except OSError as error:
+            print(f'philips-air-purifier: {error}', file=sys.stderr)
+            return 1
+        return 0
+
+    parameters = args.parameters if args.command == 'get' else None
+    if args.command == 'set':
+        try:
+            parameters = _parameters(args.parameters)
+        except argparse.ArgumentTypeError as error:
+            parser.error(str(error))
+
+    try:
+        if args.direct or not os.path.exists(args.socket):
+            data = _directly(args, parameters)
+        else:
+            try:
+                data = _through_daemon(args, parameters)
+            except (ConnectionRefusedError, FileNotFoundError):
+                data = _directly(args, parameters)  # daemon is not running anymore
+    except (AirPurifierError, OSError) as error:
+        print(f'philips-air-purifier: {error}', file=sys.stderr)
+        return 1
+
+    print(json.dumps(data))
+
+    return 0
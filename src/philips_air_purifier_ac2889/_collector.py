@@ -0,0 +1,374 @@
+"""Module contains multiprocess collector of device statuses with shared status board."""
+
+import os
+import mmap
+import time
+import struct
+import multiprocessing
+from concurrent.futures import wait
+from typing import Any, Dict, Iterable, List, NamedTuple, Union
+
+from ._air_purifier import AirPurifier
+from ._fleet import _DaemonPool
+from ._options import ClientOptions
+from ._status import PurifierStatus
+
+
+_MAGIC = b'PAPB'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHHI4x')
+_SEQUENCE = struct.Struct('<Q')
+_HOST = struct.Struct('<64s')
+
+# formats of fields of PurifierStatus, missing numbers are _MISSING, missing switches are -1 and missing texts are empty
+_FORMATS = {'om': '4s', 'pwr': 'b', 'cl': 'b', 'aqil': 'q', 'uil': 'b', 'dt': 'q', 'dtrs': 'q', 'mode': '4s',
+            'pm25': 'q', 'iaql': 'q', 'aqit': 'q', 'ddp': '4s', 'err': 'q'}
+_PAYLOAD = struct.Struct('<dI' + ''.join(_FORMATS[field] for field in PurifierStatus._fields))
+_SLOT_SIZE = -(-(_SEQUENCE.size + _HOST.size + _PAYLOAD.size) // 8) * 8
+_MISSING = -2 ** 63
+
+
+class BoardEntry(NamedTuple):
+    """
+    The latest state of device kept by status board.
+
+    :param host: address of device
+    :param timestamp: time of the latest successful reading in seconds since epoch, None if device was not read yet
+    :param failures: number of failed readings since the latest successful one
+    :param status: the latest read status, None if device was not read yet
+    """
+
+    host: str
+    timestamp: Union[float, None]
+    failures: int
+    status: Union[PurifierStatus, None]
+
+
+def _pack(timestamp: float, failures: int, status: PurifierStatus) -> tuple:
+    values = []
+    for field, value in zip(PurifierStatus._fields, status):
+        kind = _FORMATS[field]
+        if kind == '4s':
+            values.append(b'' if value is None else value.encode('ascii'))
+        elif kind == 'b':
+            values.append(-1 if value is None else int(value))
+        else:
+            values.append(_MISSING if value is None else value)
+
+    return (timestamp, failures, *values)
+
+
+def _unpack(host: str, payload: tuple) -> BoardEntry:
+    timestamp, failures, *values = payload
+    if not timestamp:
+        return BoardEntry(host, None, failures, None)
+
+    status = []
+    for field, value in zip(PurifierStatus._fields, values):
+        kind = _FORMATS[field]
+        if kind == '4s':
+            status.append(value.rstrip(b'\0').decode('ascii') or None)
+        elif kind == 'b':
+            status.append(None if value < 0 else bool(value))
+        else:
+            status.append(None if value == _MISSING else value)
+
+    return BoardEntry(host, timestamp, failures, PurifierStatus(*status))
+
+
+class StatusBoard:
+    """
+    Table of the latest statuses of devices in memory-mapped file, one fixed-size slot per device. Collector
+    processes write statuses to board and any process can read them without asking collector. Put file
+    on memory file system (e.g. ``/dev/shm``), so it is never written to disk.
+
+    .. code:: python
+
+        with StatusBoard('/dev/shm/purifiers.board') as board:
+            entry = board.read('192.168.1.21')
+            print(entry.timestamp, entry.status.pm25)
+
+    Every slot has one writer. Slot is guarded by sequence number which is odd while slot is written, readers
+    read slot again if sequence number was odd or changed during reading, so they never see partially written
+    status. Reading fails with :class:`TimeoutError` if slot stays odd, e.g. after writer was killed.
+
+    :param path: path to board file created by :meth:`create`
+    :param writable: opens board for writing
+    """
+
+    def __init__(self, path: str, writable: bool = False) -> None:
+        self.path = path
+        self.writable = writable
+        self._file = open(path, 'r+b' if writable else 'rb')  # pylint: disable=consider-using-with
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+
+        magic, version, slot_size, count = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or version != _VERSION or slot_size != _SLOT_SIZE:
+            self.close()
+            raise ValueError(f'File {path} is not supported status board.')
+
+        self._slots = {}
+        for index in range(count):
+            name, = _HOST.unpack_from(self._map, self._offset(index) + _SEQUENCE.size)
+            self._slots[name.rstrip(b'\0').decode('utf-8')] = self._offset(index)
+
+    @classmethod
+    def create(cls, path: str, hosts: Iterable[str]) -> 'StatusBoard':
+        """
+        Creates board file with empty slots of devices, existing file is replaced.
+
+        :param path: path to board file
+        :param hosts: addresses of devices, at most 64 bytes long
+        :return: board opened for writing
+        """
+
+        hosts = list(dict.fromkeys(hosts))
+        data = bytearray(_HEADER.size + len(hosts) * _SLOT_SIZE)
+        _HEADER.pack_into(data, 0, _MAGIC, _VERSION, _SLOT_SIZE, len(hosts))
+        for index, host in enumerate(hosts):
+            name = host.encode('utf-8')
+            if len(name) > _HOST.size:
+                raise ValueError(f'Address of device "{host}" is longer than {_HOST.size} bytes.')
+            _HOST.pack_into(data, _HEADER.size + index * _SLOT_SIZE + _SEQUENCE.size, name)
+
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(data)
+        os.replace(temporary, path)  # readers of old board keep their mapping
+
+        return cls(path, writable=True)
+
+    def __enter__(self) -> 'StatusBoard':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @property
+    def hosts(self) -> List[str]:
+        """
+        Returns addresses of devices on board.
+
+        :return: addresses in order of slots
+        """
+
+        return list(self._slots)
+
+    def read(self, host: str, timeout: float = 1.0) -> BoardEntry:
+        """
+        Returns the latest state of device. :class:`TimeoutError` is raised if slot is being written for longer
+        than timeout, e.g. because writer process was killed in the middle of update.
+
+        :param host: address of device
+        :param timeout: time in seconds for which slot may be written
+        :return: state of device
+        """
+
+        offset = self._slots[host]
+        deadline = time.monotonic() + timeout
+        while True:
+            sequence, = _SEQUENCE.unpack_from(self._map, offset)
+            if not sequence & 1:
+                payload = _PAYLOAD.unpack_from(self._map, offset + _SEQUENCE.size + _HOST.size)
+                if _SEQUENCE.unpack_from(self._map, offset)[0] == sequence:
+                    return _unpack(host, payload)
+            if time.monotonic() > deadline:
+                raise TimeoutError(f'Slot of device "{host}" was not read within {timeout} seconds.')
+            time.sleep(0)  # writer is in the middle of update
+
+    def snapshot(self, timeout: float = 1.0) -> Dict[str, BoardEntry]:
+        """
+        Returns the latest states of all devices.
+
+        :param timeout: time in seconds for which slot of every device may be written
+        :return: states per device
+        """
+
+        return {host: self.read(host, timeout) for host in self._slots}
+
+    def write(self, host: str, data: Union[Dict[str, Any], PurifierStatus],
+              timestamp: Union[float, None] = None) -> None:
+        """
+        Stores successful reading of device and resets its failures.
+
+        :param host: address of device
+        :param data: data returned by ``get()``, as dictionary or :class:`PurifierStatus`
+        :param timestamp: time of reading in seconds since epoch, current time if it is None
+        """
+
+        if not isinstance(data, PurifierStatus):
+            data = PurifierStatus.from_dict(data)
+
+        self._store(host, _pack(time.time() if timestamp is None else timestamp, 0, data))
+
+    def fail(self, host: str) -> None:
+        """
+        Counts failed reading of device, the latest status is kept.
+
+        :param host: address of device
+        """
+
+        offset = self._slots[host] + _SEQUENCE.size + _HOST.size
+        timestamp, failures, *values = _PAYLOAD.unpack_from(self._map, offset)
+        self._store(host, (timestamp, failures + 1, *values))
+
+    def close(self) -> None:
+        """
+        Unmaps and closes board file.
+        """
+
+        self._map.close()
+        self._file.close()
+
+    def _store(self, host: str, payload: tuple) -> None:
+        offset = self._slots[host]
+        sequence, = _SEQUENCE.unpack_from(self._map, offset)
+        _SEQUENCE.pack_into(self._map, offset, sequence + 1)
+        _PAYLOAD.pack_into(self._map, offset + _SEQUENCE.size + _HOST.size, *payload)
+        _SEQUENCE.pack_into(self._map, offset, sequence + 2)
+
+    @staticmethod
+    def _offset(index: int) -> int:
+        return _HEADER.size + index * _SLOT_SIZE
+
+
+def _collect(path: str, hosts: List[str], stop: Any, settings: Dict[str, Any]) -> None:
+    board = StatusBoard(path, writable=True)
+    purifiers = {host: AirPurifier(host, no_proxy=settings['no_proxy'], options=settings['options']) for host in hosts}
+    interval = settings['interval']
+
+    def poll(host: str) -> None:
+        purifier = purifiers[host]
+        try:
+            if not purifier.is_connected:
+                purifier.connect()
+            board.write(host, purifier.get())
+        except Exception:  # pylint: disable=broad-except
+            purifier.close()  # device is connected again in the next round
+            board.fail(host)
+
+    executor = _DaemonPool(max_workers=settings['threads'])
+    polls = {}
+    deadline = time.monotonic()
+    while not stop.is_set():
+        deadline += interval
+        for host in hosts:
+            if host not in polls:  # device which did not answer is not read again until its poll finishes
+                polls[host] = executor.submit(poll, host)
+        wait(polls.values(), timeout=max(deadline - time.monotonic(), 0))
+        for host, future in list(polls.items()):
+            if future.done():
+                del polls[host]
+            else:
+                board.fail(host)
+        stop.wait(max(deadline - time.monotonic(), 0))
+
+    executor.shutdown()  # hung polls are left in daemon threads
+    for host, purifier in purifiers.items():
+        if host not in polls:
+            purifier.close()
+    board.close()
+
+
+class CollectorService:
+    """
+    Reads statuses of many devices in pool of processes and publishes them on :class:`StatusBoard`. Devices are
+    divided between processes, every process owns clients of its devices, so key exchanges, encryption and
+    parsing of responses run in parallel instead of sharing one interpreter lock.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import CollectorService, StatusBoard
+
+        with CollectorService(hosts, '/dev/shm/purifiers.board', processes=4, interval=10):
+            with StatusBoard('/dev/shm/purifiers.board') as board:
+                while True:
+                    print(board.read('192.168.1.21'))
+                    time.sleep(10)
+
+    Processes are started with ``spawn`` method, so parent process may run threads. Device which is not read
+    within interval is counted as failed and it is not read again until its request finishes, so one hung device
+    does not delay other devices.
+
+    :param hosts: IP addresses or DNS names of devices
+    :param path: path to board file, it is created by :meth:`start`
+    :param processes: number of collector processes, number of CPUs if it is None
+    :param interval: time between readings of device in seconds
+    :param threads: number of devices read at the same time by one process
+    :param no_proxy: proxy will be ignored for defined here IP addresses, e.g.: 192.168.1.5,192.168.1.26
+    :param options: settings of clients of devices, e.g. timeout or retry policy, they are sent to collector
+                    processes, so they must be picklable, timeout of 10 seconds is used if it is None
+    """
+
+    _context = multiprocessing.get_context('spawn')
+
+    # pylint: disable-next=too-many-arguments  # settings of collector processes and of their clients
+    def __init__(self, hosts: Iterable[str], path: str, processes: Union[int, None] = None, interval: float = 5.0,
+                 *, threads: int = 16, no_proxy: Union[str, None] = None,
+                 options: Union[ClientOptions, None] = None) -> None:
+        self.hosts = list(dict.fromkeys(hosts))
+        self.path = path
+        self.processes = processes or os.cpu_count() or 1
+        options = options if options is not None else ClientOptions(timeout=10.0)
+        self.settings = {'interval': interval, 'threads': threads, 'no_proxy': no_proxy, 'options': options}
+        self._stop = None
+        self._workers = []
+
+    def __enter__(self) -> 'CollectorService':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> 'CollectorService':
+        """
+        Creates board file and starts collector processes.
+
+        :return: self
+        """
+
+        if self._workers:
+            return self
+
+        StatusBoard.create(self.path, self.hosts).close()
+        self._stop = self._context.Event()
+        shards = [self.hosts[index::self.processes] for index in range(self.processes)]
+        for shard in filter(None, shards):
+            worker = self._context.Process(target=_collect, args=(self.path, shard, self._stop, self.settings),
+                                           daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+        return self
+
+    def run(self) -> None:
+        """
+        Starts collector processes and waits for them until they are stopped or interrupted.
+        """
+
+        self.start()
+        try:
+            for worker in self._workers:
+                worker.join()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """
+        Stops collector processes, board file is kept with the latest statuses. Processes which do not stop
+        within interval and 5 seconds are terminated.
+        """
+
+        if self._stop is not None:
+            self._stop.set()
+        for worker in self._workers:
+            worker.join(self.settings['interval'] + 5.0)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        self._workers.clear()
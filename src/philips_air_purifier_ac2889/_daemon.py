@@ -0,0 +1,303 @@
+"""Module contains daemon keeping connected clients of devices behind local Unix socket."""
+
+import os
+import json
+import socket
+import threading
+import socketserver
+from typing import Any, Dict, Iterable, Union
+
+from ._air_purifier import AirPurifier
+from ._options import ClientOptions
+from ._retry import RetryPolicy
+from ._server import BackgroundServer
+from ._utils import ParameterValidator
+from . import errors
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Handles connection of daemon client, one JSON request per line."""
+
+    server: '_Server'
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError('Request must be JSON object.')
+            except ValueError as error:
+                response = {'ok': False, 'error': 'ValueError', 'message': str(error)}
+            else:
+                response = self.server.service.handle(request)
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+
+class _Server(getattr(socketserver, 'ThreadingUnixStreamServer', socketserver.ThreadingTCPServer)):
+    """Unix socket server which knows its daemon."""
+
+    daemon_threads = True
+    service: 'PurifierDaemon'
+
+
+class PurifierDaemon(BackgroundServer):
+    """
+    Keeps clients of devices connected and serves their ``get``, ``set`` and ``network`` methods on local Unix
+    socket, so short-lived processes control devices without key exchange. Devices which are not given are
+    connected on their first request and kept connected too.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import PurifierDaemon
+
+        with PurifierDaemon('/run/user/1000/purifiers.sock', ['192.168.1.21', '192.168.1.22']) as daemon:
+            daemon.serve_forever()
+
+    Every line sent to socket is one request, JSON object with ``command`` (``get``, ``set`` or ``network``),
+    ``host`` and ``parameters`` (list of names for ``get``, object for ``set``), e.g.
+    ``{"command": "get", "host": "192.168.1.21", "parameters": ["pm25"]}``. Host can be skipped if daemon has
+    only one device. Every response is one line, ``{"ok": true, "data": ...}`` or
+    ``{"ok": false, "error": "ParameterValueError", "message": "..."}``. Values of ``set`` are coerced,
+    e.g. ``"aqil": "50"`` is sent as ``50``. Use :class:`DaemonClient` to send requests from Python.
+
+    :param path: path to Unix socket, stale socket file is replaced
+    :param hosts: IP addresses or DNS names of devices connected when daemon starts
+    :param no_proxy: proxy will be ignored for defined here IP addresses, e.g.: 192.168.1.5,192.168.1.26
+    :param options: settings and collaborators of clients of devices, timeout of 10 seconds and default retry
+                    policy are used if they are not given
+    """
+
+    _validator = ParameterValidator(coerce=True)
+
+    def __init__(self, path: str, hosts: Iterable[str] = (), *, no_proxy: Union[str, None] = None,
+                 options: Union[ClientOptions, None] = None) -> None:
+        options = options if options is not None else ClientOptions()
+        timeout = options.timeout if options.timeout is not None else 10.0
+        self.path = path
+        self.hosts = list(dict.fromkeys(hosts))
+        self.no_proxy = no_proxy
+        self.options = options._replace(timeout=timeout, retry=options.retry or RetryPolicy())
+        self.purifiers = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> 'PurifierDaemon':
+        """
+        Connects given devices and starts serving requests in background thread. Devices which cannot be
+        connected are connected again on their first request.
+
+        :return: self
+        """
+
+        if self._server is not None:
+            return self
+
+        if not hasattr(socket, 'AF_UNIX'):
+            raise OSError('Unix sockets are not supported on this platform.')
+
+        for host in self.hosts:
+            try:
+                self._purifier(host)
+            except Exception:  # pylint: disable=broad-except
+                pass
+
+        _remove_stale_socket(self.path)
+        self._server = _Server(self.path, _Handler)
+        self._server.service = self
+        os.chmod(self.path, 0o600)
+
+        return super().start()
+
+    def stop(self) -> None:
+        """
+        Stops serving requests, removes socket and closes clients of devices.
+        """
+
+        if self._server is not None:
+            super().stop()
+            self._server = None
+            os.unlink(self.path)
+
+        with self._lock:
+            for purifier in self.purifiers.values():
+                purifier.close()
+            self.purifiers.clear()
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Executes request of client, called by request handler.
+
+        :param request: command with host and parameters
+        :return: response with data or error
+        """
+
+        try:
+            command = request.get('command')
+            if command not in ('get', 'set', 'network'):
+                raise ValueError(f'Unknown command "{command}". Allowed commands: get, set, network')
+            parameters = request.get('parameters')
+            purifier = self._purifier(self._host(request.get('host')))
+            if command == 'get':
+                data = purifier.get(*(parameters or ()))
+            elif command == 'set':
+                data = purifier.set(**self._validator.validate(parameters or {}))
+            else:
+                data = purifier.network()
+        except Exception as error:  # pylint: disable=broad-except
+            return {'ok': False, 'error': type(error).__name__, 'message': str(error)}
+
+        return {'ok': True, 'data': data}
+
+    def _host(self, host: Union[str, None]) -> str:
+        if host:
+            return host
+        if len(self.hosts) == 1:
+            return self.hosts[0]
+
+        raise errors.ParameterRequiredError('Host of device must be provided.')
+
+    def _purifier(self, host: str) -> AirPurifier:
+        with self._lock:
+            purifier = self.purifiers.get(host)
+            if purifier is None:
+                purifier = self.purifiers[host] = AirPurifier(host, no_proxy=self.no_proxy, options=self.options)
+
+        if not purifier.is_connected:
+            purifier.connect()
+
+        return purifier
+
+
+class DaemonClient:
+    """
+    Sends requests to :class:`PurifierDaemon` over its Unix socket. Errors of daemon are raised as errors
+    of this package, e.g. :class:`ParameterValueError`, other errors are raised as :class:`AirPurifierError`.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import DaemonClient
+
+        with DaemonClient('/run/user/1000/purifiers.sock') as client:
+            print(client.get('192.168.1.21', 'pm25'))
+            client.set('192.168.1.21', mode='M', om='2')
+
+    :param path: path to Unix socket of daemon
+    :param timeout: timeout of single request in seconds
+    """
+
+    def __init__(self, path: str, timeout: Union[float, None] = None) -> None:
+        self.path = path
+        self.timeout = timeout
+        self._socket = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'DaemonClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get(self, host: Union[str, None], *parameters: str) -> Dict:
+        """
+        Reads information from device.
+
+        :param host: address of device, it can be None if daemon has only one device
+        :param parameters: list of information to return
+        :return: requested information
+        """
+
+        return self.request('get', host, list(parameters))
+
+    def set(self, host: Union[str, None] = None, **parameters: Union[str, int]) -> Dict:
+        """
+        Sets given parameters on device.
+
+        :param host: address of device, it can be None if daemon has only one device
+        :param parameters: dictionary of keys and values to set
+        :return: status of device
+        """
+
+        return self.request('set', host, parameters)
+
+    def network(self, host: Union[str, None] = None) -> Dict:
+        """
+        Reads network settings of device.
+
+        :param host: address of device, it can be None if daemon has only one device
+        :return: dictionary of local network settings
+        """
+
+        return self.request('network', host)
+
+    def request(self, command: str, host: Union[str, None] = None, parameters: Any = None) -> Any:
+        """
+        Sends request to daemon and waits for its response.
+
+        :param command: name of command, e.g. ``get``
+        :param host: address of device
+        :param parameters: parameters of command
+        :return: data returned by daemon
+        """
+
+        line = json.dumps({'command': command, 'host': host, 'parameters': parameters}).encode('utf-8') + b'\n'
+        with self._lock:
+            if self._socket is None:
+                self._connect()
+            try:
+                self._socket.sendall(line)
+                response = self._file.readline()
+            except OSError:
+                self._disconnect()
+                raise
+            if not response:
+                self._disconnect()
+                raise ConnectionError('Daemon closed connection.')
+
+        response = json.loads(response)
+        if not response['ok']:
+            error = getattr(errors, response['error'], None)
+            if not (isinstance(error, type) and issubclass(error, errors.AirPurifierError)):
+                error = errors.AirPurifierError
+            raise error(response['message'])
+
+        return response['data']
+
+    def close(self) -> None:
+        """
+        Closes connection to daemon.
+        """
+
+        with self._lock:
+            self._disconnect()
+
+    def _connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)  # pylint: disable=no-member
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        self._socket = sock
+        self._file = sock.makefile('rb')
+
+    def _disconnect(self) -> None:
+        if self._socket is not None:
+            self._file.close()
+            self._socket.close()
+            self._socket = None
+            self._file = None
+
+
+def _remove_stale_socket(path: str) -> None:
+    if not os.path.exists(path):
+        return
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:  # pylint: disable=no-member
+        try:
+            sock.connect(path)
+        except OSError:
+            os.unlink(path)  # daemon which created socket is not running
+            return
+
+    raise OSError(f'Other daemon is listening on {path}.')
@@ -0,0 +1,108 @@
+"""Module contains discovery of air purifiers in local network."""
+
+import base64
+import asyncio
+import binascii
+import ipaddress
+from typing import Any, Iterable, List, Union
+from urllib.parse import urlsplit
+
+from ._air_purifier import AirPurifier
+from ._transport import AsyncHttpTransport, AsyncTransport
+
+
+async def discover_hosts(targets: Union[str, Iterable[str]], port: Union[int, None] = None, timeout: float = 0.5,
+                         concurrency: int = 64) -> List[str]:
+    """
+    Finds air purifiers among given hosts. Every host is asked for device status, devices answer with encrypted
+    status which is recognized without key exchange, so sessions of devices are not changed. Hosts which refuse
+    connection, do not answer in timeout or answer with other data are skipped.
+
+    .. code:: python
+
+        hosts = asyncio.run(discover_hosts('192.168.1.0/24'))
+
+    :param targets: network, e.g. ``192.168.1.0/24``, or IP address or name of one host, or IP addresses and
+                    names of hosts, hosts are given optionally with ports
+    :param port: port of devices in scanned network or of single host given without port, default HTTP port is
+                 used if it is None
+    :param timeout: timeout of connection and answer of single host in seconds
+    :param concurrency: maximal number of hosts asked at the same time
+    :return: addresses of found devices, ordered as targets
+    """
+
+    hosts = _expand(targets, port)
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = AsyncHttpTransport(pool_size=0, timeout=timeout)
+
+    async def probe(host: str) -> bool:
+        async with semaphore:
+            return await _is_purifier(transport, host)
+
+    try:
+        found = await asyncio.gather(*(probe(host) for host in hosts))
+    finally:
+        await transport.close()
+
+    return [host for host, is_purifier in zip(hosts, found) if is_purifier]
+
+
+def discover(targets: Union[str, Iterable[str]], port: Union[int, None] = None, timeout: float = 0.5,
+             concurrency: int = 64, **kwargs: Any) -> List[AirPurifier]:
+    """
+    Finds air purifiers among given hosts and returns clients of found devices, see :func:`discover_hosts`.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import discover
+
+        for philips_air_purifier in discover('192.168.1.0/24', timeout=0.3):
+            with philips_air_purifier.connect():
+                print(philips_air_purifier.host, philips_air_purifier.get('pm25'))
+
+    :param targets: network, e.g. ``192.168.1.0/24``, or IP address or name of one host, or IP addresses and
+                    names of hosts, hosts are given optionally with ports
+    :param port: port of devices in scanned network or of single host given without port, default HTTP port is
+                 used if it is None
+    :param timeout: timeout of connection and answer of single host in seconds
+    :param concurrency: maximal number of hosts asked at the same time
+    :param kwargs: keyword arguments of created :class:`AirPurifier` clients, e.g. ``options``
+    :return: not connected clients of found devices
+    """
+
+    hosts = asyncio.run(discover_hosts(targets, port, timeout, concurrency))
+
+    return [AirPurifier(host, **kwargs) for host in hosts]
+
+
+def _expand(targets: Union[str, Iterable[str]], port: Union[int, None]) -> List[str]:
+    if not isinstance(targets, str):
+        return list(targets)
+
+    try:
+        network = ipaddress.ip_network(targets, strict=False)
+    except ValueError:
+        if urlsplit(f'//{targets}').port is not None or port is None:  # name of host, optionally with port
+            return [targets]
+        return [f'{targets}:{port}']
+
+    addresses = [network.network_address] if network.num_addresses == 1 else network.hosts()
+    targets = [str(address) for address in addresses]
+    if port is not None:
+        targets = [f'{target}:{port}' for target in targets]
+
+    return targets
+
+
+async def _is_purifier(transport: AsyncTransport, host: str) -> bool:
+    try:
+        body = await transport.get(f'http://{host}/di/v1/products/1/air')
+    except transport.transient_errors + (asyncio.LimitOverrunError, ValueError):
+        return False  # host is not listening, too slow or does not speak HTTP
+
+    try:
+        payload = base64.b64decode(body.strip(), validate=True)
+    except binascii.Error:
+        return False
+
+    return bool(payload) and len(payload) % 16 == 0  # status encrypted with AES blocks
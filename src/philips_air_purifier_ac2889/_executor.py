@@ -0,0 +1,249 @@
+"""Module contains executor of prioritized commands of one air purifier."""
+
+import time
+import heapq
+import itertools
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, NamedTuple, Union
+
+from ._air_purifier import AirPurifier
+from ._utils import filter_request_data
+from .errors import CommandExpiredError, ParameterRequiredError
+
+
+CONTROL = 0
+TELEMETRY = 1
+
+
+class ExecutorStats(NamedTuple):
+    """
+    Load of command executor.
+
+    :param depth: number of queued commands per priority
+    :param executed: number of commands sent to device, including failed ones
+    :param failed: number of commands which raised error
+    :param expired: number of commands dropped after their deadline
+    :param cancelled: number of commands cancelled before they were sent
+    :param mean_wait: average time in seconds which sent commands spent in queue
+    :param max_wait: the longest time in seconds which sent command spent in queue
+    """
+
+    depth: Dict[int, int]
+    executed: int
+    failed: int
+    expired: int
+    cancelled: int
+    mean_wait: float
+    max_wait: float
+
+
+class _Command:  # pylint: disable=too-few-public-methods  # record of queued command
+    """Queued command with its future."""
+
+    __slots__ = ('operation', 'future', 'submitted', 'deadline')
+
+    def __init__(self, operation: Callable[[AirPurifier], Any], submitted: float,
+                 deadline: Union[float, None]) -> None:
+        self.operation = operation
+        self.future = Future()
+        self.submitted = submitted
+        self.deadline = deadline
+
+
+class CommandExecutor:  # pylint: disable=too-many-instance-attributes  # queue, its statistics and worker
+    """
+    Sends commands to one device one by one from background thread, in order of priority and then of submission.
+    Control commands (:data:`CONTROL`, default of :meth:`set`) are sent before telemetry reads
+    (:data:`TELEMETRY`, default of :meth:`get` and :meth:`network`), so e.g. power off does not wait for queued
+    reads. Command which was not sent before its deadline fails with :class:`CommandExpiredError`, queued
+    command can be cancelled with ``Future.cancel()``.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import AirPurifier, CommandExecutor
+
+        philips_air_purifier = AirPurifier(host='192.168.1.21').connect()
+
+        with CommandExecutor(philips_air_purifier) as executor:
+            reading = executor.get('pm25', deadline=2.0)
+            executor.set(pwr='0').result()  # sent before queued reads
+            print(reading.result())
+            print(executor.stats())
+
+    Time which command spent in queue is reported to observer of client as ``queue`` stage.
+
+    :param purifier: connected client of device
+    :param clock: monotonic clock returning seconds
+    """
+
+    def __init__(self, purifier: AirPurifier, clock: Callable[[], float] = time.monotonic) -> None:
+        self.purifier = purifier
+        self.counters = Counter()
+        self._clock = clock
+        self._queue = []
+        self._sequence = itertools.count()
+        self._wait = 0.0
+        self._max_wait = 0.0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> 'CommandExecutor':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get(self, *parameters: str, priority: int = TELEMETRY, deadline: Union[float, None] = None) -> Future:
+        """
+        Queues reading of information from device.
+
+        :param parameters: list of information to return
+        :param priority: priority of command, lower is sent earlier
+        :param deadline: time in seconds after which command is dropped if it was not sent
+        :return: future resolved with requested information
+        """
+
+        return self.submit(lambda purifier: purifier.get(*parameters), priority, deadline)
+
+    def set(self, priority: int = CONTROL, deadline: Union[float, None] = None,
+            **parameters: Union[str, int]) -> Future:
+        """
+        Queues setting of parameters on device, parameters are validated before they are queued.
+
+        :param priority: priority of command, lower is sent earlier
+        :param deadline: time in seconds after which command is dropped if it was not sent
+        :param parameters: dictionary of keys and values to set
+        :return: future resolved with response of device
+        """
+
+        if not parameters:
+            raise ParameterRequiredError('At least one parameter must be provided.')
+
+        parameters = filter_request_data(parameters)
+
+        return self.submit(lambda purifier: purifier.set(**parameters), priority, deadline)
+
+    def network(self, priority: int = TELEMETRY, deadline: Union[float, None] = None) -> Future:
+        """
+        Queues reading of network settings.
+
+        :param priority: priority of command, lower is sent earlier
+        :param deadline: time in seconds after which command is dropped if it was not sent
+        :return: future resolved with dictionary of local network settings
+        """
+
+        return self.submit(lambda purifier: purifier.network(), priority, deadline)
+
+    def submit(self, operation: Callable[[AirPurifier], Any], priority: int = TELEMETRY,
+               deadline: Union[float, None] = None) -> Future:
+        """
+        Queues any operation on client of device.
+
+        :param operation: function called with client of device
+        :param priority: priority of command, lower is sent earlier
+        :param deadline: time in seconds after which command is dropped if it was not sent
+        :return: future resolved with result of operation
+        """
+
+        now = self._clock()
+        command = _Command(operation, now, None if deadline is None else now + deadline)
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('Commands cannot be submitted after executor was closed.')
+            heapq.heappush(self._queue, (priority, next(self._sequence), command))
+            self._condition.notify()
+
+        return command.future
+
+    def depth(self, priority: Union[int, None] = None) -> int:
+        """
+        Returns number of queued commands, cancelled commands are counted until they are dropped.
+
+        :param priority: priority of counted commands, all commands are counted if it is None
+        :return: number of commands
+        """
+
+        with self._condition:
+            return sum(1 for queued, _, _ in self._queue if priority in (None, queued))
+
+    def stats(self) -> ExecutorStats:
+        """
+        Returns load of executor.
+
+        :return: executor statistics
+        """
+
+        with self._condition:
+            depth = Counter(priority for priority, _, _ in self._queue)
+            executed = self.counters['executed']
+
+            return ExecutorStats(dict(depth), executed, self.counters['failed'], self.counters['expired'],
+                                 self.counters['cancelled'], self._wait / executed if executed else 0.0,
+                                 self._max_wait)
+
+    def close(self, cancel: bool = False) -> None:
+        """
+        Stops executor after queued commands are sent, client of device is not closed.
+
+        :param cancel: cancels queued commands instead of sending them
+        """
+
+        with self._condition:
+            if cancel:
+                self._cancel()
+            self._closed = True
+            self._condition.notify()
+
+        self._thread.join()
+
+    def _cancel(self) -> None:
+        self._closed = True
+        for _, _, command in self._queue:
+            if command.future.cancel():
+                self.counters['cancelled'] += 1
+        self._queue.clear()
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                _, _, command = heapq.heappop(self._queue)
+                started = self._clock()
+                if not command.future.set_running_or_notify_cancel():
+                    self.counters['cancelled'] += 1
+                    continue
+                if command.deadline is not None and started > command.deadline:
+                    self.counters['expired'] += 1
+                    command.future.set_exception(CommandExpiredError('Command was not sent before deadline.'))
+                    continue
+                wait = started - command.submitted
+                self.counters['executed'] += 1
+                self._wait += wait
+                self._max_wait = max(self._max_wait, wait)
+
+            self._report(wait)
+            try:
+                result = command.operation(self.purifier)
+            except Exception as error:  # pylint: disable=broad-except
+                with self._condition:
+                    self.counters['failed'] += 1
+                command.future.set_exception(error)
+            except BaseException as error:
+                command.future.set_exception(error)
+                with self._condition:
+                    self._cancel()  # worker stops, so queued commands would never be sent
+                raise
+            else:
+                command.future.set_result(result)
+
+    def _report(self, wait: float) -> None:
+        if self.purifier.options.observer is not None:
+            self.purifier.options.observer.observe(self.purifier.host, 'queue', wait)
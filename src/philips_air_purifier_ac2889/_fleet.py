@@ -0,0 +1,226 @@
+"""Module contains client to control many air purifiers at once."""
+
+import queue
+import threading
+from concurrent.futures import Future, wait
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Union
+
+from ._air_purifier import AirPurifier
+from ._options import ClientOptions
+from ._utils import filter_request_data
+from .errors import ClientNotConnectedError, ParameterRequiredError
+
+
+class DeviceResult(NamedTuple):
+    """
+    Result of operation on single device of fleet.
+
+    :param host: address of device as given to fleet
+    :param data: data returned by device, None if operation failed
+    :param error: exception raised by operation, None if operation succeeded
+    """
+
+    host: str
+    data: Any = None
+    error: Union[Exception, None] = None
+
+    @property
+    def ok(self) -> bool:  # pylint: disable=invalid-name
+        """
+        Returns True if operation succeeded.
+
+        :return: operation status
+        """
+
+        return self.error is None
+
+
+class _DaemonPool:
+    """Pool of daemon worker threads, workers waiting for hung device do not block exit of process."""
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._tasks = queue.SimpleQueue()
+        self._workers = []
+        self._idle = threading.Semaphore(0)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, function: Callable, *args: Any) -> Future:
+        """
+        Runs function in worker thread, new worker is started if all workers are busy.
+
+        :param function: function to run
+        :param args: arguments of function
+        :return: future of function result
+        """
+
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Cannot submit task to closed pool.')
+            self._tasks.put((future, function, args))
+            idle = self._idle.acquire(blocking=False)  # pylint: disable=consider-using-with
+            if not idle and len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._work, daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+        return future
+
+    def shutdown(self) -> None:
+        """
+        Cancels waiting tasks and stops workers once they finish their current tasks, it does not wait for them.
+        """
+
+        with self._lock:
+            self._closed = True
+            while True:
+                try:
+                    task = self._tasks.get_nowait()
+                except queue.Empty:
+                    break
+                task[0].cancel()
+            for _ in self._workers:
+                self._tasks.put(None)
+
+    def _work(self) -> None:
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            future, function, args = task
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(function(*args))
+                except BaseException as error:  # pylint: disable=broad-except
+                    future.set_exception(error)
+            self._idle.release()
+
+
+class PurifierFleet:
+    """
+    Client to control many Philips Air Purifier devices concurrently. Requests are sent from a thread pool,
+    so a sweep takes about as long as the slowest device, not the sum of all latencies. Failure of one device
+    is reported in its result and does not stop other devices. Devices which do not finish within ``deadline``
+    are reported with :class:`TimeoutError` and they do not delay the sweep.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import ClientOptions, PurifierFleet
+
+        with PurifierFleet(['192.168.1.21', '192.168.1.22'], options=ClientOptions(timeout=3)) as fleet:
+            fleet.connect()
+
+            for host, result in fleet.get_all('pm25', 'mode').items():
+                print(host, result.data if result.ok else result.error)
+
+            fleet.set_all(mode='A')
+
+    :param hosts: IP addresses or DNS names of air purifier devices
+    :param no_proxy: proxy will be ignored for defined here IP addresses, e.g.: 192.168.1.5,192.168.1.26
+    :param max_workers: maximal number of devices handled at the same time
+    :param deadline: maximal duration of sweep in seconds, sweep waits for all devices if it is None
+    :param options: settings and collaborators shared by clients of all devices, e.g. session store or key pool,
+                    requests have 10 seconds timeout if it is None
+    """
+
+    def __init__(self, hosts: Iterable[str], no_proxy: Union[str, None] = None, max_workers: int = 16, *,
+                 deadline: Union[float, None] = None, options: Union[ClientOptions, None] = None) -> None:
+        self.hosts = list(dict.fromkeys(hosts))
+        self.no_proxy = no_proxy
+        self.deadline = deadline
+        self.options = options if options is not None else ClientOptions(timeout=10.0)
+        self.purifiers = {}
+        self._executor = _DaemonPool(max_workers=max_workers)
+
+    def __enter__(self) -> 'PurifierFleet':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def connect(self) -> Dict[str, DeviceResult]:
+        """
+        Connects to all devices.
+
+        :return: results with connected clients per device
+        """
+
+        return self._run(self.hosts, self._connect)
+
+    def get_all(self, *parameters: str) -> Dict[str, DeviceResult]:
+        """
+        Reads information from all devices.
+
+        :param parameters: list of information to return
+        :return: requested information per device
+        """
+
+        return self._run(self.hosts, lambda host: self._purifier(host).get(*parameters))
+
+    def set_all(self, **parameters: Union[str, int]) -> Dict[str, DeviceResult]:
+        """
+        Sets given parameters on all devices.
+
+        :param parameters: dictionary of keys and values to set
+        :return: responses per device
+        """
+
+        if not parameters:
+            raise ParameterRequiredError('At least one parameter must be provided.')
+
+        filter_request_data(parameters)
+
+        return self._run(self.hosts, lambda host: self._purifier(host).set(**parameters))
+
+    def network_all(self) -> Dict[str, DeviceResult]:
+        """
+        Reads network settings of all devices.
+
+        :return: dictionary of local network settings per device
+        """
+
+        return self._run(self.hosts, lambda host: self._purifier(host).network())
+
+    def close(self) -> None:
+        """
+        Closes connections to all devices and stops worker threads, it does not wait for hung devices.
+        """
+
+        self._executor.shutdown()
+        for purifier in self.purifiers.values():
+            purifier.close()
+
+    def _connect(self, host: str) -> AirPurifier:
+        purifier = self.purifiers.get(host)
+        if purifier is None:
+            purifier = AirPurifier(host, no_proxy=self.no_proxy, options=self.options)
+            self.purifiers[host] = purifier
+
+        return purifier.connect()
+
+    def _purifier(self, host: str) -> AirPurifier:
+        purifier = self.purifiers.get(host)
+        if purifier is None:
+            raise ClientNotConnectedError("Client was not connected to device.")
+
+        return purifier
+
+    def _run(self, hosts: Iterable[str], operation: Callable[[str], Any]) -> Dict[str, DeviceResult]:
+        futures = {host: self._executor.submit(operation, host) for host in hosts}
+        wait(futures.values(), timeout=self.deadline)
+        results = {}
+
+        for host, future in futures.items():
+            if not future.done():
+                future.cancel()
+                error = TimeoutError(f'Device "{host}" did not finish within {self.deadline} seconds.')
+                results[host] = DeviceResult(host, error=error)
+                continue
+            try:
+                results[host] = DeviceResult(host, data=future.result())
+            except Exception as error:  # pylint: disable=broad-except
+                results[host] = DeviceResult(host, error=error)
+
+        return results
@@ -0,0 +1,168 @@
+"""Module contains local HTTP gateway to many air purifiers."""
+
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, Tuple, Union
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from ._air_purifier import AirPurifier
+from ._cache import ResponseCache
+from ._options import ClientOptions
+from ._retry import RetryPolicy
+from ._server import BackgroundServer
+from ._utils import ParameterValidator
+from .errors import AirPurifierError, ParameterNotRecognizedError, ParameterRequiredError, ParameterValueError
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Handles requests to gateway."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server: '_Server'
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Handles GET request."""
+
+        self._respond(*self.server.gateway.handle('GET', self.path, b''))
+
+    def do_PUT(self) -> None:  # pylint: disable=invalid-name
+        """Handles PUT request."""
+
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self._respond(*self.server.gateway.handle('PUT', self.path, body))
+
+    def log_message(self, *args: Any) -> None:  # pylint: disable=arguments-differ
+        pass
+
+    def _respond(self, status: int, data: Any) -> None:
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Server(ThreadingHTTPServer):
+    """HTTP server which knows its gateway."""
+
+    daemon_threads = True
+    gateway: 'PurifierGateway'
+
+
+class PurifierGateway(BackgroundServer):
+    """
+    Local HTTP server which exposes many devices to many consumers with one session per device. Every device
+    has one shared client, so consumers do not exchange keys with devices. Status and network settings are
+    served from :class:`ResponseCache`, concurrent readers of the same device share one request. Writes to one
+    device are sent one by one. Devices are connected on their first request.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import PurifierGateway
+
+        with PurifierGateway(['192.168.1.21', '192.168.1.22'], port=8080) as gateway:
+            gateway.serve_forever()
+
+    Endpoints, all of them return JSON:
+
+    * ``GET /devices`` - list of devices
+    * ``GET /devices/<host>/status?parameters=pm25,mode`` - status of device, all parameters if none are given
+    * ``PUT /devices/<host>/status`` - sets parameters given as JSON object, e.g. ``{"mode": "M", "om": "2"}``,
+      values are coerced, returns new status
+    * ``GET /devices/<host>/network`` - network settings of device
+
+    Errors are returned as ``{"error": "ParameterValueError", "message": "..."}`` with status 400 for invalid
+    requests, 404 for unknown devices and paths and 502 when device cannot be reached. Numbers of requests
+    (``devices``, ``get``, ``set``, ``network``) and of errors are counted in ``counters``.
+
+    :param hosts: IP addresses or DNS names of devices, optionally with ports
+    :param address: address on which gateway listens
+    :param port: port on which gateway listens, free port is chosen if it is 0
+    :param no_proxy: proxy will be ignored for defined here IP addresses, e.g.: 192.168.1.5,192.168.1.26
+    :param options: settings and collaborators of clients of devices, timeout of 10 seconds, cache with default
+                    TTL and default retry policy are used if they are not given
+    """
+
+    _ENDPOINTS = {('status', 'GET'): '_get', ('status', 'PUT'): '_set', ('network', 'GET'): '_network'}
+    _validator = ParameterValidator(coerce=True)
+
+    def __init__(self, hosts: Iterable[str], address: str = '127.0.0.1', port: int = 8080, *,
+                 no_proxy: Union[str, None] = None, options: Union[ClientOptions, None] = None) -> None:
+        options = options if options is not None else ClientOptions()
+        self.cache = options.cache if options.cache is not None else ResponseCache()
+        timeout = options.timeout if options.timeout is not None else 10.0
+        options = options._replace(timeout=timeout, cache=self.cache, retry=options.retry or RetryPolicy())
+        self.purifiers = {host: AirPurifier(host, no_proxy=no_proxy, options=options) for host in dict.fromkeys(hosts)}
+        self.counters = Counter()
+        self._write_locks = {host: threading.Lock() for host in self.purifiers}
+        self._server = _Server((address, port), _Handler)
+        self._server.gateway = self
+
+    def stop(self) -> None:
+        """
+        Stops serving requests, closes server socket and clients of devices.
+        """
+
+        super().stop()
+        for purifier in self.purifiers.values():
+            purifier.close()
+
+    def handle(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        """
+        Executes request of consumer, called by request handler.
+
+        :param method: HTTP method
+        :param path: path of request with query
+        :param body: body of request
+        :return: HTTP status and data of response
+        """
+
+        parts = urlsplit(path)
+        segments = [unquote(segment) for segment in parts.path.strip('/').split('/')]
+
+        if segments == ['devices'] and method == 'GET':
+            self.counters['devices'] += 1
+            return 200, list(self.purifiers)
+        if len(segments) != 3 or segments[0] != 'devices' or (segments[2], method) not in self._ENDPOINTS:
+            return 404, {'error': 'NotFound', 'message': f'Endpoint {method} {parts.path} does not exist.'}
+        if segments[1] not in self.purifiers:
+            return 404, {'error': 'NotFound', 'message': f'Device "{segments[1]}" is not served by gateway.'}
+
+        endpoint = self._ENDPOINTS[(segments[2], method)]
+        self.counters[endpoint.lstrip('_')] += 1
+        try:
+            return 200, getattr(self, endpoint)(segments[1], parse_qs(parts.query), body)
+        except (ParameterNotRecognizedError, ParameterRequiredError, ParameterValueError, ValueError) as error:
+            self.counters['errors'] += 1
+            return 400, {'error': type(error).__name__, 'message': str(error)}
+        except (AirPurifierError, OSError) as error:
+            self.counters['errors'] += 1
+            return 502, {'error': type(error).__name__, 'message': str(error)}
+
+    def _get(self, host: str, query: Dict[str, list], _: bytes) -> Dict:
+        parameters = [name for value in query.get('parameters', ()) for name in value.split(',') if name]
+
+        return self._purifier(host).get(*parameters)
+
+    def _set(self, host: str, _: Dict[str, list], body: bytes) -> Dict:
+        parameters = json.loads(body or b'{}')
+        if not isinstance(parameters, dict):
+            raise ValueError('Parameters must be given as JSON object.')
+        parameters = self._validator.validate(parameters)
+
+        with self._write_locks[host]:
+            return self._purifier(host).set(**parameters)
+
+    def _network(self, host: str, *_: Any) -> Dict:
+        return self._purifier(host).network()
+
+    def _purifier(self, host: str) -> AirPurifier:
+        purifier = self.purifiers[host]
+        if not purifier.is_connected:
+            purifier.connect()  # concurrent callers wait for one key exchange
+
+        return purifier
@@ -0,0 +1,270 @@
+"""Module contains memory-mapped on-disk history of device readings."""
+
+import os
+import sys
+import mmap
+import time
+import struct
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+from ._status import PurifierStatus
+
+
+HISTORY_FIELDS = ('pm25', 'iaql', 'aqil', 'err', 'om', 'mode', 'pwr')
+
+_MAGIC = b'PAPH'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHH8x')
+_RECORD = struct.Struct('<dHHHH2s2sB3x')
+_MISSING_NUMBER = 0xFFFF
+_MISSING_FLAG = 0xFF
+
+# field: (format of zero-copy view, index of field in view of one record)
+_VIEWS = {
+    'timestamp': ('d', 0),
+    'pm25': ('H', 4),
+    'iaql': ('H', 5),
+    'aqil': ('H', 6),
+    'err': ('H', 7),
+    'pwr': ('B', 20),
+}
+
+
+def _pack(timestamp: float, data: Dict[str, Any]) -> bytes:
+    numbers = [_MISSING_NUMBER if data.get(field) is None else int(data[field]) for field in HISTORY_FIELDS[:4]]
+    texts = [str(data.get(field) or '').encode('ascii') for field in ('om', 'mode')]
+    pwr = data.get('pwr')
+    flag = _MISSING_FLAG if pwr is None else int(pwr in ('1', 1))
+
+    return _RECORD.pack(timestamp, *numbers, *texts, flag)
+
+
+def _unpack(record: tuple) -> Dict[str, Any]:
+    timestamp, *numbers, om, mode, pwr = record  # pylint: disable=invalid-name
+    data = {'timestamp': timestamp}
+    for field, value in zip(HISTORY_FIELDS[:4], numbers):
+        data[field] = None if value == _MISSING_NUMBER else value
+    data['om'] = om.rstrip(b'\0').decode('ascii') or None
+    data['mode'] = mode.rstrip(b'\0').decode('ascii') or None
+    data['pwr'] = None if pwr == _MISSING_FLAG else bool(pwr)
+
+    return data
+
+
+class HistoryReader:
+    """
+    Reads history file of one device through memory map. Reader can be used by many processes while poller
+    appends to file, call :meth:`refresh` to see new records. Columns of numbers are returned as memoryviews
+    of mapped file, so range scans do not copy data.
+
+    .. code:: python
+
+        with HistoryReader('/var/lib/purifiers/192.168.1.21.hist') as reader:
+            pm25 = reader.column('pm25', start=t0, end=t1)
+            print(max(pm25))
+
+    Memoryviews returned by reader must be released before reader is closed or refreshed.
+
+    :param path: path to history file
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, 'rb')  # pylint: disable=consider-using-with
+        self._map = None
+        self._count = 0
+        self.refresh()
+
+    def __enter__(self) -> 'HistoryReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def refresh(self) -> None:
+        """
+        Maps records appended since file was mapped last time.
+        """
+
+        size = os.fstat(self._file.fileno()).st_size
+        if self._map is not None and size == len(self._map):
+            return
+
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+
+        magic, version, record_size = struct.unpack_from('<4sHH', self._map)
+        if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+            raise ValueError(f'File {self.path} is not supported history file.')
+        self._count = (size - _HEADER.size) // _RECORD.size  # record which is being written is skipped
+
+    def bounds(self, start: Union[float, None] = None, end: Union[float, None] = None) -> Tuple[int, int]:
+        """
+        Finds records in time range with binary search on timestamps.
+
+        :param start: the earliest timestamp, inclusive
+        :param end: the latest timestamp, exclusive
+        :return: index of the first record and index after the last record
+        """
+
+        timestamps = self._view('timestamp', 0, self._count)
+        first = 0 if start is None else bisect_left(timestamps, start)
+        last = self._count if end is None else bisect_left(timestamps, end, first)
+        timestamps.release()
+
+        return first, last
+
+    def column(self, field: str, start: Union[float, None] = None, end: Union[float, None] = None) -> Any:
+        """
+        Returns values of field in time range.
+
+        :param field: ``timestamp`` or one of :data:`HISTORY_FIELDS`
+        :param start: the earliest timestamp, inclusive
+        :param end: the latest timestamp, exclusive
+        :return: memoryview of mapped file for numeric fields and timestamps (missing numbers are 0xFFFF
+                 and missing ``pwr`` is 0xFF), list for other fields
+        """
+
+        first, last = self.bounds(start, end)
+
+        if field in _VIEWS and sys.byteorder == 'little':
+            return self._view(field, first, last)
+
+        return [record[field] for record in self.records(first, last)]
+
+    def records(self, first: int = 0, last: Union[int, None] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterates over records.
+
+        :param first: index of the first record
+        :param last: index after the last record
+        :return: records as dictionaries with timestamp
+        """
+
+        last = self._count if last is None else last
+        data = memoryview(self._map)[_HEADER.size + first * _RECORD.size:_HEADER.size + last * _RECORD.size]
+        try:
+            for record in _RECORD.iter_unpack(data):
+                yield _unpack(record)
+        finally:
+            data.release()
+
+    def close(self) -> None:
+        """
+        Unmaps and closes file.
+        """
+
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def _view(self, field: str, first: int, last: int) -> memoryview:
+        view_format, index = _VIEWS[field]
+        records = memoryview(self._map)[_HEADER.size + first * _RECORD.size:_HEADER.size + last * _RECORD.size]
+        step = _RECORD.size // struct.calcsize(view_format)
+
+        return records.cast(view_format)[index::step]
+
+
+class HistoryStore:
+    """
+    Keeps history of readings of many devices in directory, one file per device. Every reading is one fixed-size
+    record appended to file, records are ordered by time.
+
+    .. code:: python
+
+        store = HistoryStore('/var/lib/purifiers')
+        store.append(philips_air_purifier.host, philips_air_purifier.get())
+
+        print(store.query('192.168.1.21', 'pm25', start=time.time() - 3600))
+
+    :param directory: directory with history files, it is created if it does not exist
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._files = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def __enter__(self) -> 'HistoryStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def path(self, host: str) -> str:
+        """
+        Returns path to history file of device.
+
+        :param host: address of device
+        :return: path to file
+        """
+
+        return os.path.join(self.directory, host.replace(os.sep, '_').replace(':', '_') + '.hist')
+
+    def append(self, host: str, data: Union[Dict[str, Any], PurifierStatus],
+               timestamp: Union[float, None] = None) -> None:
+        """
+        Appends reading of device. Timestamps of readings of one device must not decrease.
+
+        :param host: address of device
+        :param data: data returned by ``get()``, as dictionary or :class:`PurifierStatus`
+        :param timestamp: time of reading in seconds since epoch, current time if it is None
+        """
+
+        if isinstance(data, PurifierStatus):
+            data = data.to_dict()
+
+        file = self._files.get(host)
+        if file is None:
+            file = self._files[host] = open(self.path(host), 'ab', buffering=0)  # pylint: disable=R1732
+            if file.tell() == 0:
+                file.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size))
+
+        file.write(_pack(time.time() if timestamp is None else timestamp, data))
+
+    def reader(self, host: str) -> HistoryReader:
+        """
+        Opens history of device for reading.
+
+        :param host: address of device
+        :return: reader of history file
+        """
+
+        return HistoryReader(self.path(host))
+
+    def query(self, host: str, field: str, start: Union[float, None] = None,
+              end: Union[float, None] = None) -> List[Tuple[float, Any]]:
+        """
+        Returns values of field of device in time range.
+
+        :param host: address of device
+        :param field: one of :data:`HISTORY_FIELDS`
+        :param start: the earliest timestamp, inclusive
+        :param end: the latest timestamp, exclusive
+        :return: pairs of timestamp and value
+        """
+
+        with self.reader(host) as reader:
+            timestamps = reader.column('timestamp', start, end)
+            values = reader.column(field, start, end)
+            result = list(zip(timestamps, values))
+            for view in (timestamps, values):
+                if isinstance(view, memoryview):
+                    view.release()
+
+        return result
+
+    def close(self) -> None:
+        """
+        Closes files opened for appending.
+        """
+
+        for file in self._files.values():
+            file.close()
+        self._files.clear()
@@ -0,0 +1,124 @@
+"""Module contains pool of precomputed key exchange requests."""
+
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+from typing import List, Tuple, Union
+
+from ._utils import create_key_exchange
+
+
+class KeyPool:
+    """
+    Keeps precomputed first halves of Diffie-Hellman key exchange, so client does not compute them when it
+    connects to device. Pool is refilled in background when it gets half empty. Every key is used only once.
+
+    .. code:: python
+
+        from concurrent.futures import ProcessPoolExecutor
+        from philips_air_purifier_ac2889 import AirPurifier, ClientOptions, KeyPool
+
+        key_pool = KeyPool(size=64, executor=ProcessPoolExecutor())
+        key_pool.fill()
+
+        philips_air_purifier = AirPurifier(host='192.168.1.21', options=ClientOptions(key_pool=key_pool)).connect()
+
+    :param size: number of kept keys
+    :param executor: executor which computes keys, process pool computes them in parallel,
+                     single background thread is used if it is None
+    """
+
+    def __init__(self, size: int = 16, executor: Union[Executor, None] = None) -> None:
+        self.size = size
+        self._keys = deque()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._own_executor = executor is None
+        self._executor = executor if executor is not None else ThreadPoolExecutor(max_workers=1)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __enter__(self) -> 'KeyPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def take(self) -> Tuple[int, bytes]:
+        """
+        Takes precomputed key from pool. Key is computed in place if pool is empty.
+
+        :return: secret exponent and body of key exchange request, as from :func:`create_key_exchange`
+        """
+
+        try:
+            key = self._keys.popleft()
+        except IndexError:
+            key = None
+
+        if len(self._keys) + self._pending <= self.size // 2:
+            self._refill()
+
+        return key if key is not None else create_key_exchange()
+
+    def fill(self) -> None:
+        """
+        Fills pool and waits until all keys are computed. If executor fails, keys computed before are kept
+        in pool and the error is raised.
+        """
+
+        futures = []
+        try:
+            self._submit(futures)
+        finally:
+            wait(futures)
+            for future in futures:
+                self._add(future)
+
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        """
+        Stops background computing, executor passed by user is not shut down. Keys left in pool can be still used.
+        """
+
+        self._closed = True
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
+
+    def _refill(self) -> None:
+        futures = []
+        try:
+            self._submit(futures)
+        except RuntimeError:
+            pass  # executor was shut down or is broken, keys are computed in place
+        finally:
+            for future in futures:
+                future.add_done_callback(self._add)
+
+    def _submit(self, futures: List[Future]) -> None:
+        if self._closed:
+            return
+
+        with self._lock:
+            missing = max(self.size - len(self._keys) - self._pending, 0)
+            self._pending += missing
+
+        try:
+            for _ in range(missing):
+                futures.append(self._executor.submit(create_key_exchange))
+        finally:
+            with self._lock:
+                self._pending -= missing - len(futures)  # keys which were not submitted
+
+    def _add(self, future: Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            self._keys.append(future.result())
+        self._done()
+
+    def _done(self) -> None:
+        with self._lock:
+            self._pending -= 1
@@ -0,0 +1,215 @@
+"""Module contains observers of timings of client operations."""
+
+import time
+import threading
+from bisect import bisect_left
+from typing import Iterable, List, Union
+
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Observer:  # pylint: disable=too-few-public-methods  # interface implemented by subclasses
+    """
+    Receives timings of client operations. Stages reported by clients:
+
+    * ``resolve`` - resolution of device address
+    * ``connect``, ``get``, ``set``, ``network`` - whole call of client method
+    * ``handshake`` - key exchange with device, including its HTTP request
+    * ``http`` - single HTTP round trip, every repeated attempt is reported separately
+    * ``encrypt`` - encryption of request body
+    * ``decrypt`` - decryption of response
+    * ``parse`` - parsing of decrypted JSON
+    * ``queue`` - time which command spent in queue of :class:`CommandExecutor`
+
+    Base observer ignores timings, subclass it to pass them to own metrics.
+    """
+
+    def observe(self, host: str, stage: str, duration: float, error: Union[BaseException, None] = None) -> None:
+        """
+        Receives timing of finished stage.
+
+        :param host: address of device
+        :param stage: name of stage
+        :param duration: duration of stage in seconds
+        :param error: exception raised by stage, None if stage succeeded
+        """
+
+
+class _Timer:
+    """Context manager reporting its duration to observer."""
+
+    __slots__ = ('observer', 'host', 'stage', 'started')
+
+    def __init__(self, observer: Observer, host: str, stage: str) -> None:
+        self.observer = observer
+        self.host = host
+        self.stage = stage
+        self.started = 0.0
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.observer.observe(self.host, self.stage, time.perf_counter() - self.started, exc_value)
+
+
+class _NullTimer:
+    """Context manager which does nothing, used when client has no observer."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(observer: Union[Observer, None], host: str, stage: str) -> Union[_Timer, _NullTimer]:
+    """
+    Returns context manager which reports duration of its block to observer.
+
+    :param observer: receiver of timing, timing is not measured if it is None
+    :param host: address of device
+    :param stage: name of stage
+    :return: context manager
+    """
+
+    return _NULL_TIMER if observer is None else _Timer(observer, host, stage)
+
+
+class _Histogram:  # pylint: disable=too-few-public-methods  # record of counts
+    """Counts of observations in buckets."""
+
+    __slots__ = ('counts', 'sum', 'errors')
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.errors = 0
+
+
+class HistogramCollector(Observer):
+    """
+    Collects timings in histograms per device and stage, in process memory.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import AirPurifier, ClientOptions, HistogramCollector
+
+        collector = HistogramCollector()
+        philips_air_purifier = AirPurifier(host='192.168.1.21', options=ClientOptions(observer=collector)).connect()
+        philips_air_purifier.get()
+
+        print(collector.quantile('http', 0.99))
+        print(collector.to_prometheus())
+
+    :param buckets: upper bounds of histogram buckets in seconds, in ascending order
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, host: str, stage: str, duration: float, error: Union[BaseException, None] = None) -> None:
+        index = bisect_left(self.buckets, duration)
+        with self._lock:
+            histogram = self._histograms.get((host, stage))
+            if histogram is None:
+                histogram = self._histograms[(host, stage)] = _Histogram(len(self.buckets) + 1)
+            histogram.counts[index] += 1
+            histogram.sum += duration
+            if error is not None:
+                histogram.errors += 1
+
+    def count(self, stage: str, host: Union[str, None] = None) -> int:
+        """
+        Returns number of timings of stage.
+
+        :param stage: name of stage
+        :param host: address of device, all devices if it is None
+        :return: number of timings
+        """
+
+        return sum(sum(counts) for counts in self._select(stage, host))
+
+    def quantile(self, stage: str, quantile: float, host: Union[str, None] = None) -> Union[float, None]:
+        """
+        Estimates quantile of timings of stage as upper bound of bucket which contains it.
+
+        :param stage: name of stage
+        :param quantile: quantile between 0 and 1, e.g. 0.99
+        :param host: address of device, all devices if it is None
+        :return: duration in seconds, infinity if quantile is above the last bucket, None if there are no timings
+        """
+
+        counts = [0] * (len(self.buckets) + 1)
+        for histogram in self._select(stage, host):
+            counts = [total + count for total, count in zip(counts, histogram)]
+
+        total = sum(counts)
+        if total == 0:
+            return None
+        rank = max(quantile * total, 1)  # the lowest quantile is in the first bucket with timings
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            seen += count
+            if seen >= rank:
+                return bound
+
+        return float('inf')
+
+    def to_prometheus(self, prefix: str = 'philips_air_purifier') -> str:
+        """
+        Returns collected timings in Prometheus text exposition format.
+
+        :param prefix: prefix of metric names
+        :return: metrics as text
+        """
+
+        with self._lock:
+            histograms = sorted((key, list(value.counts), value.sum, value.errors)
+                                for key, value in self._histograms.items())
+
+        duration, errors = f'{prefix}_stage_duration_seconds', f'{prefix}_stage_errors_total'
+        lines = [f'# HELP {duration} Duration of client operations.', f'# TYPE {duration} histogram']
+        for (host, stage), counts, total, _ in histograms:
+            labels = f'host="{_escape(host)}",stage="{_escape(stage)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                lines.append(f'{duration}_bucket{{{labels},le="{_bound(bound)}"}} {cumulative}')
+            lines.append(f'{duration}_sum{{{labels}}} {total}')
+            lines.append(f'{duration}_count{{{labels}}} {cumulative}')
+
+        lines += [f'# HELP {errors} Number of failed client operations.', f'# TYPE {errors} counter']
+        for (host, stage), _, _, count in histograms:
+            lines.append(f'{errors}{{host="{_escape(host)}",stage="{_escape(stage)}"}} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """
+        Removes collected timings.
+        """
+
+        with self._lock:
+            self._histograms.clear()
+
+    def _select(self, stage: str, host: Union[str, None]) -> List[List[int]]:
+        with self._lock:
+            return [list(histogram.counts) for key, histogram in self._histograms.items()
+                    if key[1] == stage and host in (None, key[0])]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _bound(value: float) -> str:
+    return '+Inf' if value == float('inf') else repr(value)
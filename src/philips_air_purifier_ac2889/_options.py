@@ -0,0 +1,41 @@
+"""Module contains optional settings of air purifier clients."""
+
+from typing import NamedTuple, Union
+
+from ._cache import ResponseCache
+from ._key_pool import KeyPool
+from ._observer import Observer
+from ._resolver import HostResolver
+from ._retry import RetryPolicy
+from ._session_store import SessionStore
+
+
+class ClientOptions(NamedTuple):
+    """
+    Optional settings and collaborators of :class:`AirPurifier` and :class:`AsyncAirPurifier`. One instance
+    can be shared by many clients, e.g. by all devices of :class:`PurifierFleet`.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import AirPurifier, ClientOptions, RetryPolicy
+
+        options = ClientOptions(timeout=3, retry=RetryPolicy(attempts=5))
+        philips_air_purifier = AirPurifier(host='192.168.1.21', options=options).connect()
+
+    :param timeout: timeout of single request in seconds
+    :param retry: policy of repeating failed requests, requests are not repeated if it is None
+    :param session_store: store of session keys, cached key is tried before key exchange with device
+    :param key_pool: pool of precomputed key exchange requests, they are computed during connection if it is None
+    :param cache: cache of responses shared by callers of ``get()`` and ``network()``, responses are not cached
+                  if it is None
+    :param observer: receiver of timings of client operations, timings are not measured if it is None
+    :param resolver: resolver of device address, shared default resolver is used if it is None
+    """
+
+    timeout: Union[float, None] = None
+    retry: Union[RetryPolicy, None] = None
+    session_store: Union[SessionStore, None] = None
+    key_pool: Union[KeyPool, None] = None
+    cache: Union[ResponseCache, None] = None
+    observer: Union[Observer, None] = None
+    resolver: Union[HostResolver, None] = None
@@ -0,0 +1,273 @@
+"""Module contains recorder of air quality readings."""
+
+import io
+import csv
+import sys
+import json
+import time
+import struct
+from array import array
+from typing import Any, BinaryIO, Dict, Iterable, List, TextIO, Tuple, Union
+
+from ._status import PurifierStatus, _CONVERTERS
+
+
+RECORDED_FIELDS = ('pm25', 'iaql', 'aqil', 'om', 'mode')
+
+_MAGIC = b'PAPR'
+_HEADER = struct.Struct('<4sI')
+_MISSING_NUMBER = 0xFFFF
+_MISSING_CODE = 0xFF
+
+
+class _Column:
+    """Values of one field kept in array, text values are replaced by their codes."""
+
+    __slots__ = ('values', 'codes', 'missing')
+
+    def __init__(self, numeric: bool) -> None:
+        self.values = array('H' if numeric else 'B')
+        self.codes = None if numeric else []
+        self.missing = _MISSING_NUMBER if numeric else _MISSING_CODE
+
+    def encode(self, value: Any) -> int:
+        """Returns value as it is stored in array."""
+
+        if value is None:
+            return self.missing
+        if self.codes is None:
+            return int(value)
+        try:
+            return self.codes.index(value)
+        except ValueError:
+            if len(self.codes) >= _MISSING_CODE:
+                raise ValueError(f'Too many distinct values of field: {value}')
+            self.codes.append(value)
+            return len(self.codes) - 1
+
+    def decode(self, value: int) -> Any:
+        """Returns value stored in array as it was recorded."""
+
+        if value == self.missing:
+            return None
+        return value if self.codes is None else self.codes[value]
+
+
+class DeviceSeries:
+    """
+    Readings of one device kept in append-only columns: timestamps in ``array('d')``, numbers in ``array('H')``
+    and text values (e.g. ``mode``) as codes in ``array('B')``. When capacity is given, the oldest readings are
+    overwritten by new ones.
+
+    :param fields: recorded fields
+    :param capacity: maximal number of kept readings, unlimited if it is None
+    """
+
+    def __init__(self, fields: Iterable[str] = RECORDED_FIELDS, capacity: Union[int, None] = None) -> None:
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self._timestamps = array('d')
+        self._columns = {field: _Column(_CONVERTERS.get(field) is int) for field in self.fields}
+        self._head = 0
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def append(self, data: Union[Dict[str, Any], PurifierStatus], timestamp: Union[float, None] = None) -> None:
+        """
+        Adds reading at the end of series.
+
+        :param data: data returned by ``get()``, as dictionary or :class:`PurifierStatus`
+        :param timestamp: time of reading in seconds since epoch, current time if it is None
+        """
+
+        if isinstance(data, PurifierStatus):
+            data = data.to_dict()
+        timestamp = time.time() if timestamp is None else timestamp
+        encoded = [column.encode(data.get(field)) for field, column in self._columns.items()]
+
+        if self.capacity is None or len(self._timestamps) < self.capacity:
+            self._timestamps.append(timestamp)
+            for value, column in zip(encoded, self._columns.values()):
+                column.values.append(value)
+            return
+
+        self._timestamps[self._head] = timestamp
+        for value, column in zip(encoded, self._columns.values()):
+            column.values[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+
+    def timestamps(self) -> array:
+        """
+        Returns timestamps of readings from the oldest one.
+
+        :return: array of timestamps
+        """
+
+        return array('d', self._ordered(self._timestamps))
+
+    def values(self, field: str) -> List[Any]:
+        """
+        Returns values of field from the oldest reading.
+
+        :param field: name of recorded field
+        :return: values of field, None for readings without the field
+        """
+
+        column = self._columns[field]
+
+        return [column.decode(value) for value in self._ordered(column.values)]
+
+    def downsample(self, field: str, window: float) -> List[Tuple[float, int, int, float]]:
+        """
+        Aggregates numeric field in time windows.
+
+        :param field: name of recorded numeric field
+        :param window: length of window in seconds, windows are aligned to multiple of its length
+        :return: start of window, minimum, maximum and mean of values for every window with readings
+        """
+
+        column = self._columns[field]
+        if column.codes is not None:
+            raise ValueError(f'Field "{field}" is not numeric.')
+
+        windows = {}
+        for timestamp, value in zip(self._ordered(self._timestamps), self._ordered(column.values)):
+            if value == column.missing:
+                continue
+            start = timestamp - timestamp % window
+            aggregate = windows.get(start)
+            if aggregate is None:
+                windows[start] = [value, value, value, 1]
+            else:
+                aggregate[0] = min(aggregate[0], value)
+                aggregate[1] = max(aggregate[1], value)
+                aggregate[2] += value
+                aggregate[3] += 1
+
+        return [(start, low, high, total / count) for start, (low, high, total, count) in windows.items()]
+
+    def dump(self, file: BinaryIO) -> Dict[str, Any]:
+        """
+        Writes arrays of series to binary file.
+
+        :param file: opened binary file
+        :return: description of series required to load it
+        """
+
+        self._ordered(self._timestamps).tofile(file)
+        for column in self._columns.values():
+            self._ordered(column.values).tofile(file)
+
+        return {'count': len(self), 'codes': {field: column.codes for field, column in self._columns.items()}}
+
+    def load(self, file: BinaryIO, description: Dict[str, Any], byteorder: str = sys.byteorder) -> None:
+        """
+        Reads arrays of series written by :meth:`dump`. Series must be empty.
+
+        :param file: opened binary file
+        :param description: description of series returned by :meth:`dump`
+        :param byteorder: byte order of machine which wrote file
+        """
+
+        for values in [self._timestamps] + [column.values for column in self._columns.values()]:
+            values.fromfile(file, description['count'])
+            if byteorder != sys.byteorder:
+                values.byteswap()
+        for field, codes in description['codes'].items():
+            self._columns[field].codes = codes
+        if self.capacity is not None and len(self) > self.capacity:
+            raise ValueError('Loaded series is longer than its capacity.')
+
+    def _ordered(self, values: array) -> array:
+        if not self._head:
+            return values
+        return values[self._head:] + values[:self._head]
+
+
+class ReadingRecorder:
+    """
+    Records readings of many devices in :class:`DeviceSeries`.
+
+    .. code:: python
+
+        recorder = ReadingRecorder(capacity=7 * 24 * 3600 // 5)  # one week of readings taken every 5 seconds
+
+        while True:
+            recorder.record(philips_air_purifier.host, philips_air_purifier.get())
+            time.sleep(5)
+
+    :param fields: recorded fields
+    :param capacity: maximal number of kept readings per device, unlimited if it is None
+    """
+
+    def __init__(self, fields: Iterable[str] = RECORDED_FIELDS, capacity: Union[int, None] = None) -> None:
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self.series = {}
+
+    def record(self, host: str, data: Union[Dict[str, Any], PurifierStatus],
+               timestamp: Union[float, None] = None) -> None:
+        """
+        Adds reading of device.
+
+        :param host: address of device
+        :param data: data returned by ``get()``, as dictionary or :class:`PurifierStatus`
+        :param timestamp: time of reading in seconds since epoch, current time if it is None
+        """
+
+        series = self.series.get(host)
+        if series is None:
+            series = self.series[host] = DeviceSeries(self.fields, self.capacity)
+        series.append(data, timestamp)
+
+    def to_csv(self, file: TextIO) -> None:
+        """
+        Writes readings of all devices in CSV format.
+
+        :param file: opened text file
+        """
+
+        writer = csv.writer(file)
+        writer.writerow(('host', 'timestamp') + self.fields)
+        for host, series in self.series.items():
+            columns = [series.values(field) for field in self.fields]
+            for timestamp, *values in zip(series.timestamps(), *columns):
+                writer.writerow([host, timestamp] + ['' if value is None else value for value in values])
+
+    def save(self, file: BinaryIO) -> None:
+        """
+        Writes readings of all devices in compact binary format, arrays are written as they are kept in memory.
+
+        :param file: opened binary file
+        """
+
+        body = io.BytesIO()
+        descriptions = [dict(series.dump(body), host=host) for host, series in self.series.items()]
+        header = json.dumps({'fields': self.fields, 'capacity': self.capacity, 'byteorder': sys.byteorder,
+                             'series': descriptions}).encode('utf-8')
+
+        file.write(_HEADER.pack(_MAGIC, len(header)))
+        file.write(header)
+        file.write(body.getvalue())
+
+    @classmethod
+    def load(cls, file: BinaryIO) -> 'ReadingRecorder':
+        """
+        Reads readings written by :meth:`save`.
+
+        :param file: opened binary file
+        :return: recorder with loaded readings
+        """
+
+        magic, size = _HEADER.unpack(file.read(_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError('File does not contain recorded readings.')
+        header = json.loads(file.read(size).decode('utf-8'))
+
+        recorder = cls(header['fields'], header['capacity'])
+        for description in header['series']:
+            series = recorder.series[description['host']] = DeviceSeries(recorder.fields, recorder.capacity)
+            series.load(file, description, header['byteorder'])
+
+        return recorder
@@ -0,0 +1,143 @@
+"""Module contains cached resolution of device addresses."""
+
+import time
+import socket
+import asyncio
+import threading
+import ipaddress
+from typing import Callable, Tuple, Union
+
+
+class HostResolver:
+    """
+    Resolves names of devices to IP addresses and keeps addresses for ``ttl`` seconds. IP addresses, also IPv6
+    addresses in brackets (e.g. ``[fe80::1]:80``), are returned as they are. When name cannot be resolved again,
+    the last known address is returned and kept for ``grace`` seconds, so requests do not wait for failing
+    resolution one by one. Resolver is shared by all clients by default, so devices are resolved once per
+    ``ttl``, not once per client.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import AirPurifier, ClientOptions, HostResolver
+
+        resolver = HostResolver(ttl=60)
+        philips_air_purifier = AirPurifier(host='purifier.local', options=ClientOptions(resolver=resolver)).connect()
+
+    :param ttl: time in seconds for which address is kept
+    :param clock: monotonic clock returning seconds
+    :param grace: time in seconds for which the last known address is kept when name cannot be resolved
+    """
+
+    def __init__(self, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic, grace: float = 30.0) -> None:
+        self.ttl = ttl
+        self.grace = grace
+        self._clock = clock
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def cached(self, host: str) -> Union[str, None]:
+        """
+        Returns address of device if it is known and fresh.
+
+        :param host: IP address or DNS name of device, optionally with port
+        :return: IP address with port if it was given, None if host has to be resolved
+        """
+
+        entry = self._entries.get(host)
+        if entry is not None and entry[0] > self._clock():
+            return entry[1]
+
+        return None
+
+    def resolve(self, host: str) -> str:
+        """
+        Returns address of device, name is resolved in calling thread if address is not known.
+
+        :param host: IP address or DNS name of device, optionally with port, e.g. purifier.local:8080
+        :return: IP address with port if it was given
+        """
+
+        address = self.cached(host)
+        if address is not None:
+            return address
+
+        name, port = _split(host)
+        literal = self._literal(name)
+        if literal is not None:
+            return self._store(host, literal + port, float('inf'))
+        try:
+            return self._store(host, socket.gethostbyname(name) + port, self.ttl)
+        except OSError as error:
+            return self._stale(host, error)
+
+    async def resolve_async(self, host: str) -> str:
+        """
+        Returns address of device, name is resolved by resolver of running event loop if address is not known.
+
+        :param host: IP address or DNS name of device, optionally with port, e.g. purifier.local:8080
+        :return: IP address with port if it was given
+        """
+
+        address = self.cached(host)
+        if address is not None:
+            return address
+
+        name, port = _split(host)
+        literal = self._literal(name)
+        if literal is not None:
+            return self._store(host, literal + port, float('inf'))
+        try:
+            loop = asyncio.get_running_loop()
+            addresses = await loop.getaddrinfo(name, None, family=socket.AF_INET, type=socket.SOCK_STREAM)
+            return self._store(host, addresses[0][4][0] + port, self.ttl)
+        except OSError as error:
+            return self._stale(host, error)
+
+    def invalidate(self, host: str) -> None:
+        """
+        Marks address of device as outdated, it is resolved again on next use.
+
+        :param host: IP address or DNS name of device, as it was resolved
+        """
+
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is not None and entry[0] != float('inf'):
+                self._entries[host] = (0.0, entry[1])
+
+    def _store(self, host: str, address: str, ttl: float) -> str:
+        with self._lock:
+            self._entries[host] = (self._clock() + ttl, address)
+
+        return address
+
+    def _stale(self, host: str, error: OSError) -> str:
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is None:
+                raise error
+            self._entries[host] = (self._clock() + self.grace, entry[1])  # name is not resolved in every request
+
+        return entry[1]
+
+    @staticmethod
+    def _literal(name: str) -> Union[str, None]:
+        try:
+            address = ipaddress.ip_address(name)
+        except ValueError:
+            return None
+
+        return str(address) if address.version == 4 else f'[{address}]'
+
+
+def _split(host: str) -> Tuple[str, str]:
+    if host.startswith('['):  # IPv6 address, e.g. [fe80::1]:80
+        name, _, port = host[1:].partition(']')
+        return name, port
+
+    name, separator, port = host.partition(':')
+
+    return name, separator + port
+
+
+DEFAULT_RESOLVER = HostResolver()
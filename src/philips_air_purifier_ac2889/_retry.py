@@ -0,0 +1,46 @@
+"""Module contains retry policy of air purifier clients."""
+
+import random
+
+
+class RetryPolicy:  # pylint: disable=too-few-public-methods  # settings read by clients
+    """
+    Describes how client recovers from failed requests.
+
+    Requests which failed because of network error or timeout are repeated with exponential backoff.
+    Requests which failed because device does not accept session key (e.g. it was restarted) are repeated once
+    after new key exchange.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import AirPurifier, ClientOptions, RetryPolicy
+
+        options = ClientOptions(retry=RetryPolicy(attempts=5), timeout=3)
+        philips_air_purifier = AirPurifier(host='192.168.1.21', options=options).connect()
+
+    :param attempts: maximal number of attempts of single request, including the first one
+    :param backoff: delay in seconds before the first repeated attempt, it is doubled for every next one
+    :param max_backoff: maximal delay in seconds between attempts
+    :param jitter: maximal random deviation of delay, as a fraction of delay
+    :param reconnect: enables new key exchange when response cannot be decrypted
+    """
+
+    def __init__(self, attempts: int = 3, backoff: float = 0.2, max_backoff: float = 5.0, jitter: float = 0.1,
+                 reconnect: bool = True) -> None:
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.reconnect = reconnect
+
+    def delay(self, retry: int) -> float:
+        """
+        Returns delay before repeated attempt.
+
+        :param retry: number of repeated attempt, starting from 1
+        :return: delay in seconds
+        """
+
+        delay = min(self.max_backoff, self.backoff * 2 ** (retry - 1))
+
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
@@ -0,0 +1,161 @@
+"""Module contains rules engine controlling air purifier by its readings."""
+
+import time
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Union
+
+from ._air_purifier import AirPurifier
+from ._utils import ParameterValidator
+from .errors import AirPurifierError, ResponseDecodingError
+
+
+class Rule(NamedTuple):
+    """
+    Sets parameters of device when reading stays above or below threshold for ``dwell`` seconds.
+
+    :param parameter: name of read parameter, e.g. ``pm25``
+    :param actions: parameters set on device, e.g. ``{'mode': 'M', 'om': '3'}``
+    :param above: rule matches when reading is greater than this value
+    :param below: rule matches when reading is less than this value, reading has to be between both
+                  thresholds if both are given
+    :param dwell: time in seconds for which rule has to match before its parameters are set
+    :param name: name of rule, used in counters
+    """
+
+    parameter: str
+    actions: Dict[str, Union[str, int]]
+    above: Union[float, None] = None
+    below: Union[float, None] = None
+    dwell: float = 0.0
+    name: Union[str, None] = None
+
+    def matches(self, value: Any) -> bool:
+        """
+        Checks reading against thresholds of rule.
+
+        :param value: reading of parameter
+        :return: True if reading is within thresholds
+        """
+
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return False
+
+        return (self.above is None or value > self.above) and (self.below is None or value < self.below)
+
+
+class RuleEngine:  # pylint: disable=too-many-instance-attributes  # state of every rule and of device
+    """
+    Evaluates rules on every reading of device and sets parameters of active rules. Rule becomes active when
+    it has matched for its dwell time and stays active while it matches, so device is brought back to its
+    parameters if they drift. Parameters are set only if they differ from the last known state of device,
+    so repeated readings do not send requests. Failed request is repeated on the next reading.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import AirPurifier, Rule, RuleEngine
+
+        philips_air_purifier = AirPurifier(host='192.168.1.21').connect()
+
+        engine = RuleEngine(philips_air_purifier, [
+            Rule('pm25', {'mode': 'M', 'om': '3'}, above=35, name='polluted'),
+            Rule('pm25', {'mode': 'A'}, below=12, dwell=600, name='clean'),
+        ])
+        engine.run(interval=10)
+
+    Rules with separate thresholds give hysteresis: with rules above, device stays in the state set by the last
+    active rule while ``pm25`` is between 12 and 35. Engine can be fed with readings from other source, e.g.
+    :meth:`AirPurifier.watch` or :class:`AdaptiveScheduler`, by calling :meth:`update`.
+
+    Numbers of rules which became active (``fired`` and name of rule), sent requests (``sets``) and rules which
+    became active without changing device state (``unchanged``) are counted in ``counters``.
+
+    :param purifier: connected client of device, parameters are only returned by :meth:`update` if it is None
+    :param rules: rules evaluated in order, actions of later active rules override earlier ones
+    :param clock: monotonic clock returning seconds
+    """
+
+    def __init__(self, purifier: Union[AirPurifier, None], rules: Iterable[Rule],
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.purifier = purifier
+        self.rules = list(rules)
+        self.state = {}
+        self.counters = Counter()
+        self._clock = clock
+        validator = ParameterValidator(coerce=True)
+        self._actions = [validator.validate(dict(rule.actions)) for rule in self.rules]
+        self._since = [None] * len(self.rules)
+        self._fired = [False] * len(self.rules)
+        self._stopped = threading.Event()
+
+    def update(self, data: Dict[str, Any], timestamp: Union[float, None] = None) -> Dict[str, Union[str, int]]:
+        """
+        Evaluates rules on new reading of device and sets parameters of active rules.
+
+        :param data: data returned by ``get()``, it may contain only some parameters
+        :param timestamp: monotonic time of reading in seconds, current time if it is None
+        :return: parameters which differed from device state and were set, empty if nothing changed
+        """
+
+        now = self._clock() if timestamp is None else timestamp
+        self.state.update(data)
+        desired, activated = {}, []
+
+        for index, rule in enumerate(self.rules):
+            if rule.parameter in data:
+                if not rule.matches(data[rule.parameter]):
+                    self._since[index] = None
+                    self._fired[index] = False
+                elif self._since[index] is None:
+                    self._since[index] = now
+            if self._since[index] is None or now - self._since[index] < rule.dwell:
+                continue
+            desired.update(self._actions[index])  # rule keeps device in its state while it matches
+            if not self._fired[index]:
+                activated.append(index)
+
+        changes = {key: value for key, value in desired.items() if str(self.state.get(key)) != str(value)}
+        if changes and self.purifier is not None:
+            self.state.update(self.purifier.set(**changes))  # rules are not fired if it fails
+            self.counters['sets'] += 1
+        elif activated and not changes:
+            self.counters['unchanged'] += 1
+
+        for index in activated:
+            self._fired[index] = True
+            self.counters['fired'] += 1
+            if self.rules[index].name is not None:
+                self.counters[self.rules[index].name] += 1
+
+        return changes
+
+    def run(self, interval: float) -> None:
+        """
+        Reads device every interval and evaluates rules until :meth:`stop` is called. Errors of device are
+        counted in ``counters`` (``errors`` key) and device is read again in the next interval.
+
+        :param interval: time between readings in seconds
+        """
+
+        self._stopped.clear()
+        deadline = time.monotonic()
+        while not self._stopped.is_set():
+            try:
+                if not self.purifier.is_connected:
+                    self.purifier.connect()
+                self.update(self.purifier.get())
+            except (AirPurifierError, OSError) as error:
+                self.counters['errors'] += 1
+                if isinstance(error, ResponseDecodingError):
+                    self.purifier.close()  # device was restarted, keys are exchanged again in the next interval
+            deadline += interval
+            self._stopped.wait(max(deadline - time.monotonic(), 0))
+
+    def stop(self) -> None:
+        """
+        Stops :meth:`run` loop, client of device is not closed.
+        """
+
+        self._stopped.set()
@@ -0,0 +1,276 @@
+"""Module contains adaptive scheduler of polling many air purifiers."""
+
+import time
+import queue
+import random
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Union
+
+from ._air_purifier import AirPurifier
+from ._fleet import DeviceResult, _DaemonPool
+
+
+class SchedulerStats(NamedTuple):
+    """
+    Request budget used by scheduler.
+
+    :param requests: number of sent polls
+    :param errors: number of failed polls
+    :param throttled: number of polls delayed by rate limit
+    :param request_rate: average number of polls per second since scheduler was created
+    :param intervals: current poll interval in seconds per device
+    """
+
+    requests: int
+    errors: int
+    throttled: int
+    request_rate: float
+    intervals: Dict[str, float]
+
+
+class _DeviceState:  # pylint: disable=too-few-public-methods  # record of polling state
+    """Polling state of one device."""
+
+    __slots__ = ('purifier', 'interval', 'next_poll', 'last', 'volatility', 'polled', 'generation')
+
+    def __init__(self, purifier: AirPurifier, interval: float, next_poll: float) -> None:
+        self.purifier = purifier
+        self.interval = interval
+        self.next_poll = next_poll
+        self.last = None
+        self.volatility = 0.0
+        self.polled = None  # start time of poll which is in flight
+        self.generation = 0  # number of resets by set(), results of polls started before reset are not adapted
+
+
+class AdaptiveScheduler:  # pylint: disable=too-many-instance-attributes  # tuning and rate limit state
+    """
+    Polls many devices with ``get()`` and adapts poll interval of every device to its readings. Interval is
+    doubled (up to ``max_interval``) while readings are flat or device fails, it is halved when readings change
+    and it drops to ``min_interval`` when ``pm25`` rises or after :meth:`set`. First polls are spread randomly
+    over ``min_interval`` and every next one is shifted by ``jitter``, so devices are not polled all at once.
+    Global ``rate`` limits number of polls per second of all devices. Polls run in background threads, device
+    is not polled again until its poll finishes, so slow or hung device does not delay other devices.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import AdaptiveScheduler, PurifierFleet
+
+        with PurifierFleet(['192.168.1.21', '192.168.1.22']) as fleet:
+            fleet.connect()
+
+            scheduler = AdaptiveScheduler(fleet.purifiers.values(), callback=lambda host, result: print(host, result),
+                                          min_interval=5, max_interval=300, rate=2)
+            scheduler.run()  # until scheduler.stop() is called from other thread
+
+    :param purifiers: connected clients of devices
+    :param callback: function called with host and :class:`DeviceResult` after every poll, it is called
+                     by thread which calls :meth:`step` or :meth:`run`
+    :param min_interval: the shortest poll interval of device in seconds
+    :param max_interval: the longest poll interval of device in seconds
+    :param parameters: list of information to read, all information is read if it is empty
+    :param rate: maximal number of polls per second of all devices, unlimited if it is None
+    :param jitter: maximal random deviation of poll interval, as a fraction of interval
+    :param clock: monotonic clock returning seconds
+    """
+
+    rise_threshold = 5  # rise of pm25 between polls which switches device to the shortest interval
+    flat_threshold = 1.0  # volatility of pm25 below which readings are flat
+    smoothing = 0.3  # weight of the last change of pm25 in volatility
+
+    # pylint: disable-next=too-many-arguments  # tuning of intervals, rate limit and clock
+    def __init__(self, purifiers: Iterable[AirPurifier],
+                 callback: Union[Callable[[str, DeviceResult], Any], None] = None, min_interval: float = 5.0,
+                 max_interval: float = 300.0, *, parameters: Iterable[str] = (), rate: Union[float, None] = None,
+                 jitter: float = 0.1, clock: Callable[[], float] = time.monotonic) -> None:
+        self.callback = callback
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.parameters = tuple(parameters)
+        self.rate = rate
+        self.jitter = jitter
+        self.counters = Counter()
+        self._clock = clock
+        self._started = clock()
+        self._tokens = max(rate, 1.0) if rate is not None else 0.0
+        self._refilled = self._started
+        self._states = {
+            purifier.host: _DeviceState(purifier, min_interval, self._started + random.uniform(0, min_interval))
+            for purifier in purifiers
+        }
+        self._executor = _DaemonPool(max_workers=max(len(self._states), 1))
+        self._finished = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+    def step(self) -> Dict[str, DeviceResult]:
+        """
+        Handles polls which finished since the previous step and starts polls of devices which are due.
+        It does not wait for started polls, their results are returned by next steps.
+
+        :return: results of finished polls
+        """
+
+        results = {}
+        while True:
+            try:
+                host, generation, future = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                results[host] = DeviceResult(host, data=future.result())
+            except Exception as error:  # pylint: disable=broad-except
+                self.counters['errors'] += 1
+                results[host] = DeviceResult(host, error=error)
+            with self._lock:
+                self._update(self._states[host], results[host], generation)
+            if self.callback is not None:
+                self.callback(host, results[host])
+
+        with self._lock:
+            now = self._clock()
+            for state in sorted(self._states.values(), key=lambda state: state.next_poll):
+                if state.polled is not None:
+                    continue
+                if state.next_poll > now:
+                    break
+                if not self._acquire(now):
+                    self.counters['throttled'] += 1
+                    state.next_poll = now + (1 - self._tokens) / self.rate
+                    continue
+                self.counters['requests'] += 1
+                state.polled = now
+                future = self._executor.submit(state.purifier.get, *self.parameters)
+                future.add_done_callback(partial(self._done, state.purifier.host, state.generation))
+
+        return results
+
+    def set(self, host: str, **parameters: Union[str, int]) -> Dict:
+        """
+        Sets given parameters on device and polls it with the shortest interval.
+
+        :param host: address of device
+        :param parameters: dictionary of keys and values to set
+        :return: response of device
+        """
+
+        state = self._states[host]
+        response = state.purifier.set(**parameters)
+        with self._lock:
+            state.generation += 1
+            state.interval = self.min_interval
+            state.next_poll = self._clock()
+
+        return response
+
+    def next_poll(self) -> float:
+        """
+        Returns time left to the next poll of device which is not being polled.
+
+        :return: time in seconds, 0 if some device is due
+        """
+
+        waiting = [state.next_poll for state in self._states.values() if state.polled is None]
+        if not waiting:
+            return self.max_interval
+
+        return max(min(waiting) - self._clock(), 0.0)
+
+    def wait(self, timeout: Union[float, None] = None) -> bool:
+        """
+        Waits until some poll finishes or :meth:`stop` is called.
+
+        :param timeout: maximal waiting time in seconds
+        :return: True if results are ready to be handled by :meth:`step`
+        """
+
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+        return not self._finished.empty()
+
+    def run(self) -> None:
+        """
+        Polls devices until :meth:`stop` is called.
+        """
+
+        self._stopped.clear()
+        while not self._stopped.is_set():
+            self.step()
+            self.wait(self.next_poll())
+
+    def stop(self) -> None:
+        """
+        Stops :meth:`run` loop and worker threads, clients of devices are not closed and polls which are in
+        flight are not waited for.
+        """
+
+        self._stopped.set()
+        self._wakeup.set()
+        self._executor.shutdown()
+
+    def stats(self) -> SchedulerStats:
+        """
+        Returns request budget used by scheduler.
+
+        :return: scheduler statistics
+        """
+
+        elapsed = self._clock() - self._started
+
+        return SchedulerStats(self.counters['requests'], self.counters['errors'], self.counters['throttled'],
+                              self.counters['requests'] / elapsed if elapsed > 0 else 0.0,
+                              {host: state.interval for host, state in self._states.items()})
+
+    def _acquire(self, now: float) -> bool:
+        if self.rate is None:
+            return True
+
+        self._tokens = min(self._tokens + (now - self._refilled) * self.rate, max(self.rate, 1.0))
+        self._refilled = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+
+        return True
+
+    def _done(self, host: str, generation: int, future: Future) -> None:
+        self._finished.put((host, generation, future))
+        self._wakeup.set()
+
+    def _update(self, state: _DeviceState, result: DeviceResult, generation: int) -> None:
+        now, state.polled = state.polled, None
+        if generation != state.generation:
+            return  # interval was reset by set() while device was polled
+        if not result.ok:
+            state.interval = min(state.interval * 2, self.max_interval)
+        else:
+            state.interval = self._adapt(state, result.data)
+            state.last = result.data
+
+        state.next_poll = now + state.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _adapt(self, state: _DeviceState, data: Dict[str, Any]) -> float:
+        if state.last is None:
+            return state.interval
+
+        try:
+            rise = int(data['pm25']) - int(state.last['pm25'])
+        except (KeyError, TypeError, ValueError):
+            rise = 0
+        state.volatility = (1 - self.smoothing) * state.volatility + self.smoothing * abs(rise)
+
+        if rise >= self.rise_threshold:
+            return self.min_interval
+        if state.volatility < self.flat_threshold and _without_pm25(data) == _without_pm25(state.last):
+            return min(state.interval * 2, self.max_interval)
+
+        return max(state.interval / 2, self.min_interval)
+
+
+def _without_pm25(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: value for field, value in data.items() if field != 'pm25'}
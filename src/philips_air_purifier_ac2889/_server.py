@@ -0,0 +1,73 @@
+"""Module contains base of local servers which serve requests in background thread."""
+
+import threading
+import socketserver
+from typing import Union
+
+
+class BackgroundServer:
+    """
+    Runs socket server of subclass in daemon thread, so it does not block exit of process. Subclasses create
+    server in ``_server`` attribute before :meth:`start` is called.
+    """
+
+    _server: Union[socketserver.BaseServer, None] = None
+    _thread: Union[threading.Thread, None] = None
+
+    def __enter__(self) -> 'BackgroundServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def address(self) -> str:
+        """
+        Returns address on which server listens.
+
+        :return: host and port, e.g. 127.0.0.1:8080, or path of Unix socket
+        """
+
+        address = self._server.server_address
+        if isinstance(address, str):
+            return address
+        host, port = address[:2]
+
+        return f'{host}:{port}'
+
+    def start(self) -> 'BackgroundServer':
+        """
+        Starts serving requests in background thread.
+
+        :return: self
+        """
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+            self._thread.start()
+
+        return self
+
+    def serve_forever(self) -> None:
+        """
+        Starts server and serves requests until process is interrupted.
+        """
+
+        self.start()
+        try:
+            self._thread.join()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """
+        Stops serving requests and closes server socket.
+        """
+
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
@@ -0,0 +1,152 @@
+"""Module contains stores of session keys which allow to skip key exchange when client reconnects to device."""
+
+import os
+import json
+import time
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Union
+
+
+class SessionStore:
+    """
+    Base class of session key stores used by air purifier clients. Keys are stored per device address.
+    """
+
+    def get(self, host: str) -> Union[bytes, None]:
+        """
+        Returns session key of device.
+
+        :param host: IP address of device
+        :return: session key or None if key is not known or expired
+        """
+
+        raise NotImplementedError
+
+    def set(self, host: str, session_key: bytes) -> None:
+        """
+        Saves session key of device.
+
+        :param host: IP address of device
+        :param session_key: session key
+        """
+
+        raise NotImplementedError
+
+    def delete(self, host: str) -> None:
+        """
+        Removes session key of device.
+
+        :param host: IP address of device
+        """
+
+        raise NotImplementedError
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Keeps session keys in memory of process. The least recently used key is evicted when store is full.
+
+    :param ttl: time in seconds after which key expires, keys never expire if it is None
+    :param max_size: maximal number of stored keys, store is not limited if it is None
+    """
+
+    def __init__(self, ttl: Union[float, None] = None, max_size: Union[int, None] = None) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> Union[bytes, None]:
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is None:
+                return None
+            session_key, expires = entry
+            if expires is not None and expires <= time.time():
+                del self._entries[host]
+                return None
+            self._entries.move_to_end(host)
+            return session_key
+
+    def set(self, host: str, session_key: bytes) -> None:
+        with self._lock:
+            self._entries[host] = (session_key, time.time() + self.ttl if self.ttl is not None else None)
+            self._entries.move_to_end(host)
+            self._evict()
+
+    def delete(self, host: str) -> None:
+        with self._lock:
+            self._entries.pop(host, None)
+
+    def _evict(self) -> None:
+        now = time.time()
+        for host in [host for host, (_, expires) in self._entries.items() if expires is not None and expires <= now]:
+            del self._entries[host]
+        while self.max_size is not None and len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+class FileSessionStore(MemorySessionStore):
+    """
+    Keeps session keys in JSON file, so they survive restart of process. File is read again when it was changed
+    by other process and it is replaced atomically on every change.
+
+    :param path: path to file with session keys
+    :param ttl: time in seconds after which key expires, keys never expire if it is None
+    :param max_size: maximal number of stored keys, store is not limited if it is None
+    """
+
+    def __init__(self, path: str, ttl: Union[float, None] = None, max_size: Union[int, None] = None) -> None:
+        super().__init__(ttl=ttl, max_size=max_size)
+        self.path = path
+        self._mtime = None
+
+    def get(self, host: str) -> Union[bytes, None]:
+        self._reload()
+        return super().get(host)
+
+    def set(self, host: str, session_key: bytes) -> None:
+        self._reload()
+        super().set(host, session_key)
+        self._save()
+
+    def delete(self, host: str) -> None:
+        self._reload()
+        super().delete(host)
+        self._save()
+
+    def _reload(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return
+
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            try:
+                with open(self.path, encoding='utf-8') as file:
+                    entries = json.load(file)
+            except ValueError:
+                entries = {}  # broken file is overwritten by next change
+            self._entries = OrderedDict(
+                (host, (bytes.fromhex(entry['key']), entry['expires'])) for host, entry in entries.items()
+            )
+            self._mtime = mtime
+
+    def _save(self) -> None:
+        with self._lock:
+            entries = {host: {'key': session_key.hex(), 'expires': expires}
+                       for host, (session_key, expires) in self._entries.items()}
+            directory = os.path.dirname(os.path.abspath(self.path))
+            descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix='.sessions-')
+            try:
+                with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+                    json.dump(entries, file)
+                os.replace(temporary_path, self.path)
+            except BaseException:
+                os.unlink(temporary_path)
+                raise
+            self._mtime = os.stat(self.path).st_mtime_ns
@@ -0,0 +1,163 @@
+"""Module contains local simulator of air purifier device."""
+
+import json
+import time
+import random
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Union
+
+from Cryptodome.Util.Padding import pad
+
+from ._server import BackgroundServer
+from ._utils import DH_GENERATOR, DH_MODULUS, SessionCipher, aes_encrypt
+from .errors import ResponseDecodingError
+
+
+DEFAULT_STATUS = {'om': '1', 'pwr': '1', 'cl': False, 'aqil': 50, 'uil': '1', 'dt': 0, 'dtrs': 0, 'mode': 'A',
+                  'pm25': 5, 'iaql': 2, 'aqit': 0, 'ddp': '1', 'err': 193}
+
+DEFAULT_NETWORK = {'ssid': 'simulator', 'password': '', 'protection': 'wpa-2', 'ipaddress': '127.0.0.1',
+                   'netmask': '255.255.255.0', 'gateway': '127.0.0.1', 'dhcp': True, 'macaddress': '00:00:00:00:00:00',
+                   'cppid': '0000000000000000'}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Handles requests to simulated device."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server: '_Server'
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Handles GET request."""
+
+        self.server.simulator.handle(self, 'GET')
+
+    def do_PUT(self) -> None:  # pylint: disable=invalid-name
+        """Handles PUT request."""
+
+        self.server.simulator.handle(self, 'PUT')
+
+    def log_message(self, *args: Any) -> None:  # pylint: disable=arguments-differ
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    """HTTP server which knows its simulator."""
+
+    daemon_threads = True
+    simulator: 'DeviceSimulator'
+
+
+class DeviceSimulator(BackgroundServer):  # pylint: disable=too-many-instance-attributes  # injected faults
+    """
+    Local HTTP server speaking protocol of Philips AC2889 air purifier, so clients can be tested and benchmarked
+    without device. It exchanges session key with Diffie-Hellman on ``/di/v1/products/0/security``, serves
+    encrypted status on ``/di/v1/products/1/air`` (GET and PUT) and network settings on
+    ``/di/v1/products/0/wifi``.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import AirPurifier, DeviceSimulator
+
+        with DeviceSimulator(latency=0.02, jitter=0.01) as simulator:
+            philips_air_purifier = AirPurifier(host=simulator.address).connect()
+            print(philips_air_purifier.get())
+
+    Like device, simulator keeps one session key, so client which did not exchange the last key cannot decrypt
+    responses. :meth:`restart` drops session key as device does when it is restarted. Numbers of handled requests
+    per path and of injected failures are counted in ``counters``.
+
+    :param host: address on which simulator listens
+    :param port: port on which simulator listens, free port is chosen if it is 0
+    :param status: initial status of device
+    :param latency: delay of every response in seconds
+    :param jitter: maximal random deviation of delay in seconds
+    :param failure_rate: probability of closing connection without response
+    """
+
+    # pylint: disable-next=too-many-arguments  # address, initial status and injected faults
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, *, status: Union[Dict[str, Any], None] = None,
+                 latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0) -> None:
+        self.status = dict(DEFAULT_STATUS if status is None else status)
+        self.network = dict(DEFAULT_NETWORK, ipaddress=host)
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.counters = Counter()
+        self.session_key = None
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.simulator = self
+
+    def restart(self) -> None:
+        """
+        Drops session key, clients have to exchange key again.
+        """
+
+        with self._lock:
+            self.session_key = None
+
+    def handle(self, request: BaseHTTPRequestHandler, method: str) -> None:
+        """
+        Handles request of client, called by request handler.
+
+        :param request: handler of request
+        :param method: HTTP method
+        """
+
+        body = request.rfile.read(int(request.headers.get('Content-Length') or 0))
+
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        with self._lock:
+            self.counters[request.path] += 1
+            if random.random() < self.failure_rate:
+                self.counters['failures'] += 1
+                request.close_connection = True
+                return
+            status, response = self._respond(method, request.path, body)
+
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(response)))
+        request.end_headers()
+        request.wfile.write(response)
+
+    def _respond(self, method: str, path: str, body: bytes) -> tuple:
+        if path == '/di/v1/products/0/security' and method == 'PUT':
+            return 200, self._exchange_keys(body)
+
+        if self.session_key is None:
+            self.session_key = random.getrandbits(128).to_bytes(16, 'big')
+        cipher = SessionCipher(self.session_key)
+
+        if path == '/di/v1/products/1/air' and method == 'GET':
+            return 200, cipher.encrypt(self.status)
+        if path == '/di/v1/products/1/air' and method == 'PUT':
+            try:
+                self.status.update(cipher.decode(body))
+            except ResponseDecodingError:
+                return 400, b'{}'
+            return 200, cipher.encrypt(self.status)
+        if path == '/di/v1/products/0/wifi' and method == 'GET':
+            return 200, cipher.encrypt(self.network)
+
+        return 404, b'{}'
+
+    def _exchange_keys(self, body: bytes) -> bytes:
+        try:
+            client_key = int(json.loads(body.decode('ascii'))['diffie'], 16)
+        except (ValueError, KeyError, TypeError):
+            return b'{}'
+
+        bits = random.getrandbits(256)
+        shared_key = pow(client_key, bits, DH_MODULUS).to_bytes(128, byteorder='big')[:16]
+        self.session_key = random.getrandbits(128).to_bytes(16, 'big')
+
+        return json.dumps({'hellman': format(pow(DH_GENERATOR, bits, DH_MODULUS), 'x'),
+                           'key': aes_encrypt(shared_key, pad(self.session_key, 16)).hex()}).encode('ascii')
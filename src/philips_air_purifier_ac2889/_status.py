@@ -0,0 +1,166 @@
+"""Module contains compact representations of device status."""
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Union
+
+
+def _flag(value: Any) -> bool:
+    return value in ('1', 1)
+
+
+class PurifierStatus(NamedTuple):
+    """
+    Immutable snapshot of device status returned by ``get(typed=True)``. Values are normalized: switches
+    (``pwr``, ``uil``, ``cl``) are booleans, counters and measurements are integers and modes are strings.
+    Fields which were not read from device are None.
+    """
+
+    om: Union[str, None] = None  # pylint: disable=invalid-name
+    pwr: Union[bool, None] = None
+    cl: Union[bool, None] = None  # pylint: disable=invalid-name
+    aqil: Union[int, None] = None
+    uil: Union[bool, None] = None
+    dt: Union[int, None] = None  # pylint: disable=invalid-name
+    dtrs: Union[int, None] = None
+    mode: Union[str, None] = None
+    pm25: Union[int, None] = None
+    iaql: Union[int, None] = None
+    aqit: Union[int, None] = None
+    ddp: Union[str, None] = None
+    err: Union[int, None] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PurifierStatus':
+        """
+        Creates snapshot from data returned by device.
+
+        :param data: data returned by device, unknown keys are ignored
+        :return: status snapshot
+        """
+
+        return cls(*(None if data.get(field) is None else _CONVERTERS[field](data[field]) for field in cls._fields))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns snapshot as dictionary, fields which were not read are skipped.
+
+        :return: dictionary of normalized values
+        """
+
+        return {field: value for field, value in zip(PurifierStatus._fields, self) if value is not None}
+
+    def to_tuple(self) -> tuple:
+        """
+        Returns snapshot as plain tuple ordered as fields of snapshot.
+
+        :return: tuple of normalized values
+        """
+
+        return tuple(self)
+
+
+_CONVERTERS = {
+    'om': str,
+    'pwr': _flag,
+    'cl': bool,
+    'aqil': int,
+    'uil': _flag,
+    'dt': int,
+    'dtrs': int,
+    'mode': str,
+    'pm25': int,
+    'iaql': int,
+    'aqit': int,
+    'ddp': str,
+    'err': int,
+}
+
+_MISSING = -2 ** 63
+
+
+class PurifierStatusBatch:
+    """
+    Sequence of status snapshots stored in columns. Numbers and switches are kept in typed arrays, so every
+    snapshot costs a few dozens of bytes instead of a dictionary.
+
+    .. code:: python
+
+        batch = PurifierStatusBatch()
+        for _ in range(60):
+            batch.append(philips_air_purifier.get(typed=True))
+            time.sleep(1)
+
+        print(max(batch.column('pm25')))
+
+    :param statuses: initial snapshots
+    """
+
+    def __init__(self, statuses: Iterable[PurifierStatus] = ()) -> None:
+        self._columns = {}
+        for field in PurifierStatus._fields:
+            converter = _CONVERTERS[field]
+            if converter is int:
+                self._columns[field] = array('q')
+            elif converter in (bool, _flag):
+                self._columns[field] = array('b')
+            else:
+                self._columns[field] = []
+        self.extend(statuses)
+
+    def __len__(self) -> int:
+        return len(self._columns['om'])
+
+    def __getitem__(self, index: int) -> PurifierStatus:
+        return PurifierStatus(*(self._decode(column[index], column) for column in self._columns.values()))
+
+    def __iter__(self) -> Iterator[PurifierStatus]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, status: PurifierStatus) -> None:
+        """
+        Adds snapshot at the end of batch.
+
+        :param status: status snapshot
+        """
+
+        for value, column in zip(status, self._columns.values()):
+            column.append(self._encode(value, column))
+
+    def extend(self, statuses: Iterable[PurifierStatus]) -> None:
+        """
+        Adds many snapshots at the end of batch.
+
+        :param statuses: status snapshots
+        """
+
+        for status in statuses:
+            self.append(status)
+
+    def column(self, field: str) -> List[Any]:
+        """
+        Returns all values of one field.
+
+        :param field: name of field, e.g. "pm25"
+        :return: values of field, None for snapshots without the field
+        """
+
+        column = self._columns[field]
+
+        return [self._decode(value, column) for value in column]
+
+    @staticmethod
+    def _encode(value: Any, column: Union[array, list]) -> Any:
+        if isinstance(column, list):
+            return value
+        if value is None:
+            return _MISSING if column.typecode == 'q' else -1
+        return int(value)
+
+    @staticmethod
+    def _decode(value: Any, column: Union[array, list]) -> Any:
+        if isinstance(column, list):
+            return value
+        if column.typecode == 'q':
+            return None if value == _MISSING else value
+        return None if value < 0 else bool(value)
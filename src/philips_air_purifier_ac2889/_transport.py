@@ -0,0 +1,262 @@
+"""Module contains HTTP transports used by air purifier client."""
+
+import asyncio
+from typing import Union, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class Transport:
+    """
+    Base class of HTTP transports used by :class:`AirPurifier`.
+
+    Transport sends raw requests to device and returns raw response body. Subclass it to plug custom
+    HTTP stack into the client (e.g. instrumented or recorded one).
+
+    Exceptions listed in ``transient_errors`` are treated by client as temporary network failures, requests
+    which raised them can be repeated. Hosts listed in ``no_proxy`` should be connected directly, even if proxy
+    is configured in environment.
+
+    Transport is shared by all threads which use the client, so it must be thread-safe.
+    """
+
+    transient_errors = (OSError,)
+    no_proxy = None
+
+    def get(self, url: str, timeout: Union[float, None] = None) -> bytes:
+        """
+        Sends GET request.
+
+        :param url: requested URL
+        :param timeout: request timeout in seconds
+        :return: response body
+        """
+
+        raise NotImplementedError
+
+    def put(self, url: str, data: bytes, timeout: Union[float, None] = None) -> bytes:
+        """
+        Sends PUT request.
+
+        :param url: requested URL
+        :param data: request body
+        :param timeout: request timeout in seconds
+        :return: response body
+        """
+
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Releases resources held by transport."""
+
+    def __enter__(self) -> 'Transport':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SessionTransport(Transport):
+    """
+    Transport which keeps connections to device alive between requests. Proxy settings of environment are used,
+    unless device is listed in ``no_proxy``. Settings are passed with every request, so they do not affect
+    other HTTP clients of the process.
+
+    :param pool_size: maximal number of kept alive connections
+    :param timeout: default timeout of requests in seconds
+    :param no_proxy: proxy will be ignored for defined here IP addresses, e.g.: 192.168.1.5,192.168.1.26
+    """
+
+    transient_errors = (requests.ConnectionError, requests.Timeout)
+
+    def __init__(self, pool_size: int = 1, timeout: Union[float, None] = None,
+                 no_proxy: Union[str, None] = None) -> None:
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.no_proxy = no_proxy
+        self._session = requests.Session()
+        self._session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+
+    @property
+    def no_proxy(self) -> Union[str, None]:
+        """
+        Returns hosts which are connected without proxy.
+
+        :return: comma separated addresses or None
+        """
+
+        return self._no_proxy
+
+    @no_proxy.setter
+    def no_proxy(self, value: Union[str, None]) -> None:
+        self._no_proxy = value
+        self._options = {'proxies': {'no_proxy': value}} if value is not None else {}
+
+    def get(self, url: str, timeout: Union[float, None] = None) -> bytes:
+        resp = self._session.get(url, timeout=timeout if timeout is not None else self.timeout, **self._options)
+        return resp.content
+
+    def put(self, url: str, data: bytes, timeout: Union[float, None] = None) -> bytes:
+        resp = self._session.put(url, data=data, timeout=timeout if timeout is not None else self.timeout,
+                                 **self._options)
+        return resp.content
+
+    def close(self) -> None:
+        self._session.close()
+
+
+class AsyncTransport:
+    """
+    Base class of HTTP transports used by :class:`AsyncAirPurifier`.
+
+    Asynchronous counterpart of :class:`Transport`.
+    """
+
+    transient_errors = (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError)
+
+    async def get(self, url: str, timeout: Union[float, None] = None) -> bytes:
+        """
+        Sends GET request.
+
+        :param url: requested URL
+        :param timeout: request timeout in seconds
+        :return: response body
+        """
+
+        raise NotImplementedError
+
+    async def put(self, url: str, data: bytes, timeout: Union[float, None] = None) -> bytes:
+        """
+        Sends PUT request.
+
+        :param url: requested URL
+        :param data: request body
+        :param timeout: request timeout in seconds
+        :return: response body
+        """
+
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Releases resources held by transport."""
+
+    async def __aenter__(self) -> 'AsyncTransport':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+class AsyncHttpTransport(AsyncTransport):
+    """
+    Non-blocking HTTP/1.1 transport built on asyncio streams. It keeps connections to device alive between
+    requests. Transport connects to device directly, proxy settings are not used.
+
+    :param pool_size: maximal number of kept alive connections per device
+    :param timeout: default timeout of requests in seconds
+    """
+
+    def __init__(self, pool_size: int = 1, timeout: Union[float, None] = None) -> None:
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._idle = {}
+
+    async def get(self, url: str, timeout: Union[float, None] = None) -> bytes:
+        return await self._request('GET', url, None, timeout)
+
+    async def put(self, url: str, data: bytes, timeout: Union[float, None] = None) -> bytes:
+        return await self._request('PUT', url, data, timeout)
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for _, writer in connections:
+                await _close_writer(writer)
+
+    async def _request(self, method: str, url: str, data: Union[bytes, None], timeout: Union[float, None]) -> bytes:
+        timeout = timeout if timeout is not None else self.timeout
+        parts = urlsplit(url)
+        address = (parts.hostname, parts.port or 80)
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+
+        head = f'{method} {target} HTTP/1.1\r\nHost: {parts.netloc}\r\n'
+        if data is not None:
+            head += f'Content-Length: {len(data)}\r\n'
+        request = (head + '\r\n').encode('ascii') + (data or b'')
+
+        return await asyncio.wait_for(self._exchange(address, request), timeout)
+
+    async def _exchange(self, address: Tuple[str, int], request: bytes) -> bytes:
+        connections = self._idle.get(address)
+        if connections:
+            reader, writer = connections.pop()
+            try:
+                return await self._send(address, reader, writer, request)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass  # device closed idle connection, open new one
+
+        reader, writer = await asyncio.open_connection(*address)
+        return await self._send(address, reader, writer, request)
+
+    async def _send(self, address: Tuple[str, int], reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                    request: bytes) -> bytes:
+        try:
+            writer.write(request)
+            await writer.drain()
+            body, keep_alive = await _read_response(reader)
+        except BaseException:
+            await _close_writer(writer)
+            raise
+
+        connections = self._idle.setdefault(address, [])
+        if keep_alive and len(connections) < self.pool_size:
+            connections.append((reader, writer))
+        else:
+            await _close_writer(writer)
+
+        return body
+
+
+async def _read_response(reader: asyncio.StreamReader) -> Tuple[bytes, bool]:
+    status_line = await reader.readuntil(b'\r\n')
+    version = status_line.split(b' ', 1)[0]
+
+    headers = {}
+    while True:
+        line = await reader.readuntil(b'\r\n')
+        if line == b'\r\n':
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip().lower()
+
+    connection = headers.get('connection', 'keep-alive' if version == b'HTTP/1.1' else 'close')
+    keep_alive = connection == 'keep-alive'
+
+    if headers.get('transfer-encoding') == 'chunked':
+        body = bytearray()
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';', 1)[0], 16)
+            if size == 0:
+                while await reader.readuntil(b'\r\n') != b'\r\n':
+                    pass  # skip trailer headers
+                break
+            body += await reader.readexactly(size)
+            await reader.readexactly(2)
+        return bytes(body), keep_alive
+
+    if 'content-length' in headers:
+        return await reader.readexactly(int(headers['content-length'])), keep_alive
+
+    return await reader.read(), False
+
+
+async def _close_writer(writer: asyncio.StreamWriter) -> None:
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except (ConnectionError, OSError):
+        pass
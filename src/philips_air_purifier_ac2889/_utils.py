@@ -1,13 +1,15 @@
 """Module contains utils for air purifier package."""
 
 import json
+import random
 import base64
 import binascii
-from typing import Dict
+from typing import Dict, Iterable, List, Tuple, Union
 from Cryptodome.Cipher import AES
 from Cryptodome.Util.Padding import pad, unpad
 
-from .errors import ParameterNotRecognizedError, ParameterValueError, ResponseDecodingError
+from .errors import (ClientNotConnectedError, ParameterNotRecognizedError, ParameterValueError,
+                     ResponseDecodingError)
 
 
 ALLOWED_PARAMETERS = {
@@ -48,6 +50,14 @@ ALLOWED_PARAMETERS = {
     },
 }
 
+DH_GENERATOR = int('A4D1CBD5C3FD34126765A442EFB99905F8104DD258AC507FD6406CFF14266D31266FEA1E5C41564B777E69'
+                   '0F5504F213160217B4B01B886A5E91547F9E2749F4D7FBD7D3B9A92EE1909D0D2263F80A76A6A24C087A09'
+                   '1F531DBF0A0169B6A28AD662A4D18E73AFA32D779D5918D08BC8858F4DCEF97C2A24855E6EEB22B3B2E5', 16)
+
+DH_MODULUS = int('B10B8F96A080E01DDE92DE5EAE5D54EC52C99FBCFB06A3C69A6A9DCA52D23B616073E28675A23D189838EF'
+                 '1E2EE652C013ECB4AEA906112324975C3CD49B83BFACCBDD7D90C4BD7098488E9C219A73724EFFD6FAE564'
+                 '4738FAA31A4FF55BCCC0A151AF5F0DC8B4BD45BF37DF365C1A65E68CFDA76D4DA708DF1FB2BC2E4A4371', 16)
+
 
 def aes_decrypt(key: bytes, data: bytes) -> bytes:
     """
@@ -87,10 +97,12 @@ def decrypt(key: bytes, data: bytes) -> str:
     except binascii.Error:
         raise ResponseDecodingError("Response cannot be decoded. Reconnect to device and try again.")
 
-    data = aes_decrypt(key, payload)
-    response = unpad(data, 16, style='pkcs7')[2:]  # response starts with 2 random bytes, exclude them
-
-    return response.decode('ascii')
+    try:
+        data = aes_decrypt(key, payload)
+        response = unpad(data, 16, style='pkcs7')[2:]  # response starts with 2 random bytes, exclude them
+        return response.decode('ascii')
+    except ValueError:
+        raise ResponseDecodingError("Response cannot be decrypted. Reconnect to device and try again.")
 
 
 def encrypt(key: bytes, data: Dict[str, object]) -> bytes:
@@ -109,6 +121,127 @@ def encrypt(key: bytes, data: Dict[str, object]) -> bytes:
     return base64.b64encode(data_enc)
 
 
+def create_key_exchange() -> Tuple[int, bytes]:
+    """
+    Starts Diffie-Hellman key exchange with device.
+
+    :return: secret exponent and body of key exchange request
+    """
+
+    bits = random.getrandbits(256)
+    enc_key = pow(DH_GENERATOR, bits, DH_MODULUS)
+    body = json.dumps({'diffie': hex(enc_key)[2:]})
+
+    return bits, body.encode('ascii')
+
+
+def derive_session_key(bits: int, data: bytes) -> bytes:
+    """
+    Finishes Diffie-Hellman key exchange with device.
+
+    :param bits: secret exponent returned by :func:`create_key_exchange`
+    :param data: response of device to key exchange request
+    :return: session key
+    """
+
+    data = json.loads(data.decode('ascii'))
+
+    if 'key' not in data:
+        raise ClientNotConnectedError('Connection URL is probably invalid. Device is not supported.')
+
+    data_signed = int(data['hellman'], 16)
+    new_enc_key = pow(data_signed, bits, DH_MODULUS)
+    new_enc_key_bytes = new_enc_key.to_bytes(128, byteorder='big')[:16]
+    session_key = aes_decrypt(new_enc_key_bytes, bytes.fromhex(data['key']))
+
+    return session_key[:16]
+
+
+class SessionCipher:
+    """
+    Encrypts and decrypts messages of one session with device. Produces the same data as :func:`encrypt` and
+    :func:`decrypt`, but AES key used for decryption is expanded only once per session. Messages are decrypted
+    with one call to AES in ECB mode and CBC chaining is applied on whole message at once. Encryption still
+    needs new CBC cipher for every message, because chaining of encrypted blocks is sequential.
+
+    :param key: session key
+    """
+
+    __slots__ = ('key', '_ecb')
+
+    def __init__(self, key: bytes) -> None:
+        self.key = key
+        self._ecb = AES.new(key, AES.MODE_ECB)
+
+    def encrypt(self, data: Dict[str, object]) -> bytes:
+        """
+        Encrypts data with additional padding.
+
+        :param data: data to encrypt
+        :return: encrypted data
+        """
+
+        message = bytearray(b'AA')  # add two random bytes in front of the body
+        message += json.dumps(data).encode('ascii')
+        padding = 16 - len(message) % 16
+        message += bytes((padding,)) * padding
+        AES.new(self.key, AES.MODE_CBC, bytes(16)).encrypt(message, output=message)
+
+        return binascii.b2a_base64(message, newline=False)
+
+    def decrypt(self, data: bytes) -> bytes:
+        """
+        Decrypts data. Removes additional padding from data.
+
+        :param data: data to decrypt
+        :return: decrypted data
+        """
+
+        try:
+            payload = binascii.a2b_base64(data)
+        except binascii.Error:
+            raise ResponseDecodingError("Response cannot be decoded. Reconnect to device and try again.")
+
+        size = len(payload)
+        if not size or size % 16:
+            raise ResponseDecodingError("Response cannot be decrypted. Reconnect to device and try again.")
+
+        # CBC with zero IV: every decrypted block is XOR-ed with previous block of payload
+        blocks = int.from_bytes(self._ecb.decrypt(payload), 'big')
+        chain = int.from_bytes(memoryview(payload)[:-16], 'big')
+        message = (blocks ^ chain).to_bytes(size, 'big')
+
+        padding = message[-1]
+        if not 0 < padding <= 16 or message[-padding:] != message[-1:] * padding:
+            raise ResponseDecodingError("Response cannot be decrypted. Reconnect to device and try again.")
+
+        return message[2:size - padding]  # response starts with 2 random bytes, exclude them
+
+    def decode(self, data: bytes) -> Dict:
+        """
+        Decrypts data and parses JSON from it.
+
+        :param data: data to decrypt
+        :return: decoded data
+        """
+
+        return self.parse(self.decrypt(data))
+
+    @staticmethod
+    def parse(message: bytes) -> Dict:
+        """
+        Parses JSON from decrypted data.
+
+        :param message: decrypted data
+        :return: decoded data
+        """
+
+        try:
+            return json.loads(message)
+        except ValueError:
+            raise ResponseDecodingError("Response cannot be decrypted. Reconnect to device and try again.")
+
+
 def filter_response_data(data: Dict, *parameters: str) -> Dict:
     """
     Cuts requested by user parameters from http response.
@@ -127,20 +260,100 @@ def filter_response_data(data: Dict, *parameters: str) -> Dict:
     return result
 
 
+class ParameterValidator:
+    """
+    Checks parameters to set in device against schema compiled once to sets of allowed values, so every
+    value is checked with one lookup. Validator with ``coerce`` enabled converts values of other type,
+    e.g. ``om=2`` to ``'2'`` and ``aqil='50'`` to ``50``.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import ParameterValidator
+
+        validator = ParameterValidator(coerce=True)
+        commands = validator.validate_many([{'pwr': 1}, {'mode': 'M', 'om': 2}, {'aqil': '50'}])
+
+    :param schema: allowed parameters with their values and help messages, see ``ALLOWED_PARAMETERS``
+    :param coerce: converts integers to strings and numeric strings to integers if schema requires it
+    """
+
+    def __init__(self, schema: Union[Dict[str, Dict], None] = None, coerce: bool = False) -> None:
+        schema = schema if schema is not None else ALLOWED_PARAMETERS
+        self.coerce = coerce
+        self._values = {key: frozenset(spec['values']) for key, spec in schema.items()}
+        self._types = {key: type(spec['values'][0]) if spec['values'] else str for key, spec in schema.items()}
+        self._help = {key: spec['help'] for key, spec in schema.items()}
+        self._parameters = ', '.join(schema.keys())
+
+    def validate(self, parameters: Dict) -> Dict:
+        """
+        Checks if parameters can be set to given values.
+
+        :param parameters: dictionary of keys and values to set in device
+        :return: passed dictionary if it is valid, its copy if any value was coerced
+        """
+
+        result = parameters
+        for key, value in parameters.items():
+            allowed = self._values.get(key)
+            if allowed is None:
+                raise ParameterNotRecognizedError(f'Unknown parameter "{key}". Allowed parameters: {self._parameters}')
+            if _contains(allowed, value):
+                continue
+            if self.coerce:
+                coerced = self._coerce(key, value)
+                if coerced is not None and _contains(allowed, coerced):
+                    if result is parameters:
+                        result = dict(parameters)
+                    result[key] = coerced
+                    continue
+            raise ParameterValueError(f'Value "{value}" is not allowed. {self._help[key]}')
+
+        return result
+
+    def validate_many(self, commands: Iterable[Dict]) -> List[Dict]:
+        """
+        Checks batch of commands before any of them is sent to device.
+
+        :param commands: dictionaries of keys and values to set in device
+        :return: valid commands, coerced if validator coerces values
+        """
+
+        result = []
+        for index, parameters in enumerate(commands):
+            try:
+                result.append(self.validate(parameters))
+            except (ParameterNotRecognizedError, ParameterValueError) as error:
+                raise type(error)(f'Command {index}: {error}')
+
+        return result
+
+    def _coerce(self, key: str, value: object) -> object:
+        kind = self._types[key]
+        if kind is str and isinstance(value, int) and not isinstance(value, bool):
+            return str(value)
+        if kind is int and isinstance(value, str) and value.strip().isdigit():
+            return int(value)
+
+        return None
+
+
+def _contains(allowed: frozenset, value: object) -> bool:
+    try:
+        return value in allowed
+    except TypeError:  # unhashable value
+        return False
+
+
+_VALIDATOR = ParameterValidator()
+
+
 def filter_request_data(parameters: Dict) -> Dict:
     """
-    Checks if requested parameters can be set to given values.
+    Checks if requested parameters can be set to given values. Values are not coerced.
 
     :param parameters: dictionary of keys and values to set in device
     :return: passed as argument dictionary if it valid
     """
 
-    for key, value in parameters.items():
-
-        if key not in ALLOWED_PARAMETERS:
-            raise ParameterNotRecognizedError(f'Unknown parameter "{key}". '
-                                              f'Allowed parameters: {", ".join(ALLOWED_PARAMETERS.keys())}')
-        if value not in ALLOWED_PARAMETERS[key]['values']:
-            raise ParameterValueError(f'Value "{value}" is not allowed. {ALLOWED_PARAMETERS[key]["help"]}')
-
-    return parameters
+    return _VALIDATOR.validate(parameters)
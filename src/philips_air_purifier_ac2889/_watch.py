@@ -0,0 +1,78 @@
+"""Module contains detection of changes of polled device state."""
+
+from typing import Any, Dict, NamedTuple, Union
+
+
+class StatusChange(NamedTuple):
+    """
+    Fields of device status which changed since previous change was reported.
+    """
+
+    timestamp: float
+    changes: Dict[str, Any]
+
+
+class ChangeDetector:  # pylint: disable=too-few-public-methods  # state of one stream of readings
+    """
+    Compares consecutive readings of device and reports only changed fields. The first reading is reported
+    as a whole.
+
+    Numeric fields with deadband are reported when they differ from the last reported value at least
+    by deadband, so slow drift is reported too. Changes which happen less than ``coalesce`` seconds after
+    the last reported change are kept and reported together with the last value of every field.
+
+    .. code:: python
+
+        detector = ChangeDetector(deadbands={'pm25': 5}, coalesce=30)
+
+        change = detector.update(philips_air_purifier.get(), time.time())
+        if change is not None:
+            print(change.changes)
+
+    :param deadbands: minimal change of numeric fields, e.g. ``{'pm25': 5}``
+    :param coalesce: minimal time in seconds between reported changes
+    """
+
+    def __init__(self, deadbands: Union[Dict[str, float], None] = None, coalesce: float = 0.0) -> None:
+        self.deadbands = dict(deadbands or {})
+        self.coalesce = coalesce
+        self.state = {}
+        self._pending = {}
+        self._reported_at = None
+
+    def update(self, data: Dict[str, Any], timestamp: float) -> Union[StatusChange, None]:
+        """
+        Compares reading with reported state.
+
+        :param data: data returned by ``get()``
+        :param timestamp: time of reading in seconds since epoch
+        :return: changed fields or None if nothing changed or change is coalesced
+        """
+
+        for field, value in data.items():
+            if field in self.state and not self._differs(field, value):
+                self._pending.pop(field, None)  # field went back to reported value
+            else:
+                self._pending[field] = value
+
+        if not self._pending:
+            return None
+        if self._reported_at is not None and timestamp - self._reported_at < self.coalesce:
+            return None
+
+        change = StatusChange(timestamp, self._pending)
+        self.state.update(self._pending)
+        self._pending = {}
+        self._reported_at = timestamp
+
+        return change
+
+    def _differs(self, field: str, value: Any) -> bool:
+        reported = self.state[field]
+        deadband = self.deadbands.get(field)
+        if deadband is None:
+            return value != reported
+        try:
+            return abs(float(value) - float(reported)) >= deadband
+        except (TypeError, ValueError):
+            return value != reported
@@ -0,0 +1,113 @@
+"""Module contains queue merging parameters set on device."""
+
+import threading
+from concurrent.futures import Future
+from typing import Dict, Union
+
+from ._air_purifier import AirPurifier
+from ._utils import filter_request_data
+from .errors import ParameterRequiredError
+
+
+class WriteQueue:
+    """
+    Merges parameters set on device in short time into one request. Every parameter is validated when it is
+    queued, the last value of parameter wins. Queued parameters are sent ``window`` seconds after the first
+    of them or when :meth:`flush` is called.
+
+    .. code:: python
+
+        from philips_air_purifier_ac2889 import AirPurifier, WriteQueue
+
+        philips_air_purifier = AirPurifier(host='192.168.1.21').connect()
+
+        with WriteQueue(philips_air_purifier, window=0.2) as queue:
+            queue.set(pwr='1')
+            queue.set(mode='M')
+            response = queue.set(om='2').result()  # one request sets all three parameters
+
+    :param purifier: connected client of device
+    :param window: time in seconds for which parameters are collected before they are sent
+    """
+
+    def __init__(self, purifier: AirPurifier, window: float = 0.1) -> None:
+        self.purifier = purifier
+        self.window = window
+        self._pending = {}
+        self._futures = []
+        self._timer = None
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+
+    def __enter__(self) -> 'WriteQueue':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def set(self, **parameters: Union[str, int]) -> Future:
+        """
+        Queues parameters to set on device.
+
+        :param parameters: dictionary of keys and values to set
+        :return: future resolved with response of device to request which set the parameters
+        """
+
+        if not parameters:
+            raise ParameterRequiredError('At least one parameter must be provided.')
+
+        parameters = filter_request_data(parameters)
+        future = Future()
+
+        with self._lock:
+            self._pending.update(parameters)
+            self._futures.append(future)
+            if self._timer is None:
+                self._timer = threading.Timer(self.window, self._expire)
+                self._timer.daemon = True
+                self._timer.start()
+
+        return future
+
+    def flush(self) -> Union[Dict, None]:
+        """
+        Sends queued parameters now.
+
+        :return: response of device or None if no parameters were queued
+        """
+
+        with self._send_lock:
+            with self._lock:
+                parameters, futures = self._pending, self._futures
+                self._pending, self._futures = {}, []
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+            if not parameters:
+                return None
+
+            try:
+                response = self.purifier.set(**parameters)
+            except BaseException as error:
+                for future in futures:
+                    future.set_exception(error)
+                raise
+
+            for future in futures:
+                future.set_result(response)
+
+        return response
+
+    def close(self) -> None:
+        """
+        Sends queued parameters, client of device is not closed.
+        """
+
+        self.flush()
+
+    def _expire(self) -> None:
+        try:
+            self.flush()
+        except Exception:  # pylint: disable=broad-except
+            pass  # error is passed to futures
@@ -23,3 +23,7 @@ class ParameterRequiredError(AirPurifierError):
 
 class ResponseDecodingError(AirPurifierError):
     """Indicates that received data cannot be decoded."""
+
+
+class CommandExpiredError(AirPurifierError):
+    """Indicates that command was not sent to device before its deadline."""
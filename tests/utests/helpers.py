@@ -0,0 +1,31 @@
+import socket
+
+
+HANDSHAKE = (b'{"hellman":"74b287a8cf17541ceb8f0bdb796e5dccddf6b87ad401d153533536af3bce2455c8c8a15b07'
+             b'e85f83ae5bcc13552f6eb7eff168940d5af80871c3b348dfcbd047050f30a107374731a7a1033e725a4d05'
+             b'b7a770cabea3924dbf68e95dec6c54d18ac205c46d9670ba3f5dd75117735b9f05bef7d1f25df2f88f15e9'
+             b'72c4ce9182","key":"b5e2c4a35af01c3e4351d9f24c13f7297389192347ba1526a8c029552539d3a5"}')
+BITS = 42660447339810945252419664584000420784060651262356283027534236696752827231401
+SESSION_KEY = b'\x9a!\xeaOa\xbf3\xe9\x01\xa8\x1fS]\x0b\xd6\xad'
+STATUS = (b'kzSvc/UvLcCNJAoiwJNQX7U2Al2MN95dMEQzrxvC8Pccvddc6sY90h7OVXS+rPRBf51tKSxmtcuOyo+6eZhBan'
+          b'HTNVgBslRblATZknR098OM2mvXiYaY0LS70D/nzlcWhT8vB0grLGJWwHii+danT0HXpENFuLdWpYW0bw4bAFk=')
+DATA = {'om': '0', 'pwr': '0', 'cl': False, 'aqil': 50, 'uil': '1', 'dt': 0, 'dtrs': 0,
+        'mode': 'A', 'pm25': 8, 'iaql': 2, 'aqit': 0, 'ddp': '1', 'err': 193}
+
+
+class FakeClock:
+
+    def __init__(self, now=1000.0):
+
+        self.now = now
+
+    def __call__(self):
+
+        return self.now
+
+
+def closed_port():
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f'127.0.0.1:{sock.getsockname()[1]}'
@@ -0,0 +1,168 @@
+import asyncio
+import threading
+import unittest
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from unittest.mock import patch
+
+from philips_air_purifier_ac2889 import AsyncAirPurifier, AsyncTransport, AsyncHttpTransport
+from philips_air_purifier_ac2889.errors import ClientNotConnectedError
+
+
+class FakeAsyncTransport(AsyncTransport):
+
+    def __init__(self, content):
+        self.content = content
+        self.requests = []
+        self.closed = False
+
+    async def get(self, url, timeout=None):
+        self.requests.append(('GET', url, None))
+        return self.content
+
+    async def put(self, url, data, timeout=None):
+        self.requests.append(('PUT', url, data))
+        return self.content
+
+    async def close(self):
+        self.closed = True
+
+
+class TestAsyncAirPurifier(unittest.TestCase):
+
+    def setUp(self):
+
+        self.host = '192.168.1.21'
+        self.session_key = b'\x9a!\xeaOa\xbf3\xe9\x01\xa8\x1fS]\x0b\xd6\xad'
+
+    def _client(self, content):
+
+        transport = FakeAsyncTransport(content)
+        philips_air_purifier = AsyncAirPurifier(host=self.host, transport=transport)
+        philips_air_purifier.session_key = self.session_key
+        philips_air_purifier.is_connected = True
+
+        return philips_air_purifier, transport
+
+    @patch('random.getrandbits')
+    def test_connect_procedure(self, mock_getrandbits):
+
+        content = (b'{"hellman":"74b287a8cf17541ceb8f0bdb796e5dccddf6b87ad401d153533536af3bce2455c8c8a15b07'
+                   b'e85f83ae5bcc13552f6eb7eff168940d5af80871c3b348dfcbd047050f30a107374731a7a1033e725a4d05'
+                   b'b7a770cabea3924dbf68e95dec6c54d18ac205c46d9670ba3f5dd75117735b9f05bef7d1f25df2f88f15e9'
+                   b'72c4ce9182","key":"b5e2c4a35af01c3e4351d9f24c13f7297389192347ba1526a8c029552539d3a5"}')
+        mock_getrandbits.return_value = 42660447339810945252419664584000420784060651262356283027534236696752827231401
+        philips_air_purifier, transport = self._client(content)
+        philips_air_purifier.is_connected = False
+
+        asyncio.run(philips_air_purifier.connect())
+
+        self.assertEqual(philips_air_purifier.session_key, self.session_key)
+        self.assertTrue(philips_air_purifier.is_connected)
+        self.assertEqual(transport.requests[0][:2], ('PUT', 'http://192.168.1.21/di/v1/products/0/security'))
+
+    def test_get_data_from_air_purifier(self):
+
+        content = (b'kzSvc/UvLcCNJAoiwJNQX7U2Al2MN95dMEQzrxvC8Pccvddc6sY90h7OVXS+rPRBf51tKSxmtcuOyo+6eZhBan'
+                   b'HTNVgBslRblATZknR098OM2mvXiYaY0LS70D/nzlcWhT8vB0grLGJWwHii+danT0HXpENFuLdWpYW0bw4bAFk=')
+        philips_air_purifier, _ = self._client(content)
+
+        response_data = asyncio.run(philips_air_purifier.get('mode', 'pm25'))
+
+        self.assertEqual(response_data, {'mode': 'A', 'pm25': 8})
+
+    def test_set_parameters_in_air_purifier(self):
+
+        content = (b'dEbVcp5KebREQVf0CdRmiYOjNPrwov3jv/V5YUWrgUB0HGu4X+2RzYF0bphte2bxgy2LUHSrkmXFrFqRiHbnkH'
+                   b'FPbmOb+Wh1Bys440qmtaHxyiNZPuhR6hhzBayck2scWsHB8pKu+beszJix5IWOhcjJJXjZQIg75+9o/+i2X9U=')
+        philips_air_purifier, transport = self._client(content)
+
+        response_data = asyncio.run(philips_air_purifier.set(pwr='1'))
+
+        self.assertEqual(response_data['pwr'], '1')
+        self.assertEqual(transport.requests[0][:2], ('PUT', 'http://192.168.1.21/di/v1/products/1/air'))
+
+    def test_get_network_information_from_air_purifier(self):
+
+        content = (b'lmYgxCIZ+6h4OXIVNk52WhssTEyvJEDShDjigBiQVJbHbmgmD4y7l38bImHhERNVrScGZ4svQkHE9rKPWfcgGr86CRH5Dzj'
+                   b'Rivvrc3nDn3uAGYdiCrgszAh7W/FrSBw/cBPHOmwKAkvmsHZ4ETMywmjDcdbo6XTVmdvPentyYdYZdQ1PVHSaseNrkSkuof'
+                   b'66gaDVh70fWnG0vL0WGgC1PmMgXx8mDSbeW0Toj2ZwKsg/ccdBIRcaS1dzwltkayb72O7pKRTRgWscrAKH5H+/nIxj81AkH'
+                   b'GM46NV9b/vaoHqPw+/xJxR7XKmGmt0ehFus')
+        philips_air_purifier, _ = self._client(content)
+
+        response_data = asyncio.run(philips_air_purifier.network())
+
+        self.assertEqual(response_data['ipaddress'], '192.168.1.21')
+
+    def test_not_connected_client_raises_error(self):
+
+        philips_air_purifier, _ = self._client(b'')
+        philips_air_purifier.is_connected = False
+
+        with self.assertRaises(ClientNotConnectedError):
+            asyncio.run(philips_air_purifier.get())
+
+    def test_client_is_closed_on_context_exit(self):
+
+        philips_air_purifier, transport = self._client(b'')
+
+        async def use_client():
+            async with philips_air_purifier:
+                pass
+
+        asyncio.run(use_client())
+
+        self.assertTrue(transport.closed)
+        self.assertFalse(philips_air_purifier.is_connected)
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    connections = []
+
+    def setup(self):
+        super().setup()
+        self.connections.append(self.client_address)
+
+    def do_GET(self):
+        self._reply(self.path.encode('ascii'))
+
+    def do_PUT(self):
+        self._reply(self.rfile.read(int(self.headers['Content-Length'])))
+
+    def _reply(self, body):
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestAsyncHttpTransport(unittest.TestCase):
+
+    def setUp(self):
+
+        KeepAliveHandler.connections = []
+        self.server = HTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_port)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def test_connection_is_kept_alive_between_requests(self):
+
+        async def exchange():
+            async with AsyncHttpTransport(timeout=5) as transport:
+                first = await transport.get(self.url + '/di/v1/products/1/air')
+                second = await transport.put(self.url + '/di/v1/products/1/air', b'payload')
+            return first, second
+
+        first, second = asyncio.run(exchange())
+
+        self.assertEqual(first, b'/di/v1/products/1/air')
+        self.assertEqual(second, b'payload')
+        self.assertEqual(len(KeepAliveHandler.connections), 1)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
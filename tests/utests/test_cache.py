@@ -0,0 +1,223 @@
+import asyncio
+import threading
+import unittest
+
+from philips_air_purifier_ac2889 import AirPurifier, AsyncAirPurifier, ClientOptions, ResponseCache, Transport
+from philips_air_purifier_ac2889._utils import SessionCipher
+
+from .test_async_air_purifier import FakeAsyncTransport
+from .helpers import SESSION_KEY, STATUS, DATA, FakeClock
+
+
+class FakeTransport(Transport):
+
+    def __init__(self, content):
+        self.content = content
+        self.requests = []
+
+    def get(self, url, timeout=None):
+        self.requests.append(('GET', url))
+        return self.content
+
+    def put(self, url, data, timeout=None):
+        self.requests.append(('PUT', url))
+        return self.content
+
+    def close(self):
+        pass
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+
+        self.clock = FakeClock()
+        self.cache = ResponseCache(ttl={'air': 1, 'wifi': 300}, clock=self.clock)
+
+    def test_response_is_kept_for_ttl_of_endpoint(self):
+
+        loads = []
+
+        def load():
+            loads.append(1)
+            return {'pm25': len(loads)}
+
+        self.assertEqual(self.cache.get('192.168.1.21', 'air', load), {'pm25': 1})
+        self.assertEqual(self.cache.get('192.168.1.21', 'air', load), {'pm25': 1})
+        self.clock.now += 1
+        self.assertEqual(self.cache.get('192.168.1.21', 'air', load), {'pm25': 2})
+        self.assertEqual(self.cache.counters, {'hits': 1, 'misses': 2})
+
+    def test_returned_response_can_be_modified(self):
+
+        self.cache.get('192.168.1.21', 'air', lambda: {'pm25': 1}).clear()
+
+        self.assertEqual(self.cache.get('192.168.1.21', 'air', lambda: {}), {'pm25': 1})
+
+    def test_endpoint_without_ttl_is_not_kept(self):
+
+        self.cache.get('192.168.1.21', 'security', lambda: {'key': 1})
+
+        self.assertEqual(self.cache.get('192.168.1.21', 'security', lambda: {'key': 2}), {'key': 2})
+
+    def test_concurrent_callers_share_one_request(self):
+
+        started, release = threading.Event(), threading.Event()
+        results = []
+
+        def load():
+            started.set()
+            release.wait(1)
+            return {'pm25': 1}
+
+        first = threading.Thread(target=lambda: results.append(self.cache.get('192.168.1.21', 'air', load)))
+        first.start()
+        started.wait(1)
+        second = threading.Thread(target=lambda: results.append(self.cache.get('192.168.1.21', 'air', load)))
+        second.start()
+        while not self.cache.counters['coalesced']:
+            pass
+        release.set()
+        first.join()
+        second.join()
+
+        self.assertEqual(results, [{'pm25': 1}, {'pm25': 1}])
+        self.assertEqual(self.cache.counters, {'misses': 1, 'coalesced': 1})
+
+    def test_error_is_raised_to_waiting_callers_and_not_kept(self):
+
+        def load():
+            raise OSError('timed out')
+
+        self.assertRaises(OSError, self.cache.get, '192.168.1.21', 'air', load)
+        self.assertEqual(self.cache.get('192.168.1.21', 'air', lambda: {'pm25': 1}), {'pm25': 1})
+
+    def test_interrupted_request_releases_waiting_callers(self):
+
+        started, release = threading.Event(), threading.Event()
+        errors = []
+
+        def load():
+            started.set()
+            release.wait(1)
+            raise KeyboardInterrupt
+
+        def wait():
+            try:
+                self.cache.get('192.168.1.21', 'air', load)
+            except BaseException as error:  # pylint: disable=broad-except
+                errors.append(error)
+
+        first = threading.Thread(target=wait)
+        first.start()
+        started.wait(1)
+        second = threading.Thread(target=wait)
+        second.start()
+        while not self.cache.counters['coalesced']:
+            pass
+        release.set()
+        first.join()
+        second.join(1)
+
+        self.assertFalse(second.is_alive())
+        self.assertEqual([type(error) for error in errors], [KeyboardInterrupt, KeyboardInterrupt])
+        self.assertEqual(self.cache.get('192.168.1.21', 'air', lambda: {'pm25': 1}), {'pm25': 1})
+
+    def test_concurrent_coroutines_share_one_request(self):
+
+        loads = []
+
+        async def load():
+            loads.append(1)
+            await asyncio.sleep(0.01)
+            return {'pm25': 1}
+
+        async def main():
+            return await asyncio.gather(*(self.cache.get_async('192.168.1.21', 'air', load) for _ in range(5)))
+
+        self.assertEqual(asyncio.run(main()), [{'pm25': 1}] * 5)
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(self.cache.counters, {'misses': 1, 'coalesced': 4})
+
+    def test_waiting_coroutine_reads_response_when_reading_caller_is_cancelled(self):
+
+        loads = []
+
+        async def load():
+            loads.append(1)
+            await asyncio.sleep(0.01)
+            return {'pm25': len(loads)}
+
+        async def main():
+            first = asyncio.ensure_future(self.cache.get_async('192.168.1.21', 'air', load))
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(self.cache.get_async('192.168.1.21', 'air', load))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(main()), {'pm25': 2})
+        self.assertEqual(len(loads), 2)
+
+    def test_update_and_invalidate(self):
+
+        self.cache.get('192.168.1.21', 'air', lambda: {'pm25': 1, 'mode': 'A'})
+        self.cache.get('192.168.1.21', 'wifi', lambda: {'ssid': 'home'})
+
+        self.cache.update('192.168.1.21', 'air', {'mode': 'M'})
+        self.assertEqual(self.cache.get('192.168.1.21', 'air', lambda: {}), {'pm25': 1, 'mode': 'M'})
+
+        self.cache.invalidate('192.168.1.21', 'air')
+        self.assertEqual(self.cache.get('192.168.1.21', 'air', lambda: {}), {})
+        self.assertEqual(self.cache.get('192.168.1.21', 'wifi', lambda: {}), {'ssid': 'home'})
+
+    def test_response_read_before_update_is_not_kept(self):
+
+        for change in (lambda: self.cache.update('192.168.1.21', 'air', {'mode': 'M'}),
+                       lambda: self.cache.invalidate('192.168.1.21')):
+            with self.subTest(change=change):
+
+                def load():
+                    change()  # device is changed while its old status is read
+                    return {'pm25': 1, 'mode': 'A'}
+
+                self.assertEqual(self.cache.get('192.168.1.21', 'air', load), {'pm25': 1, 'mode': 'A'})
+                self.assertEqual(self.cache.get('192.168.1.21', 'air', lambda: {'mode': 'M'}), {'mode': 'M'})
+                self.cache.invalidate('192.168.1.21')
+
+
+class TestClientCache(unittest.TestCase):
+
+    def setUp(self):
+
+        self.content = STATUS
+
+    def test_get_is_served_from_cache_and_set_updates_it(self):
+
+        transport = FakeTransport(self.content)
+        philips_air_purifier = AirPurifier(host='192.168.1.21', transport=transport,
+                                           options=ClientOptions(cache=ResponseCache()))
+        philips_air_purifier.session_key = SESSION_KEY
+        philips_air_purifier.is_connected = True
+
+        self.assertEqual(philips_air_purifier.get(), DATA)
+        self.assertEqual(philips_air_purifier.get('pm25'), {'pm25': 8})
+        transport.content = SessionCipher(SESSION_KEY).encrypt({'mode': 'M'})
+        philips_air_purifier.set(mode='M')
+
+        self.assertEqual(philips_air_purifier.get('mode'), {'mode': 'M'})
+        self.assertEqual([method for method, _ in transport.requests], ['GET', 'PUT'])
+
+    def test_async_get_is_served_from_cache(self):
+
+        transport = FakeAsyncTransport(self.content)
+        philips_air_purifier = AsyncAirPurifier(host='192.168.1.21', transport=transport,
+                                                options=ClientOptions(cache=ResponseCache()))
+        philips_air_purifier.session_key = SESSION_KEY
+        philips_air_purifier.is_connected = True
+
+        async def main():
+            return await asyncio.gather(philips_air_purifier.get(), philips_air_purifier.get('pm25'))
+
+        self.assertEqual(asyncio.run(main()), [DATA, {'pm25': 8}])
+        self.assertEqual(len(transport.requests), 1)
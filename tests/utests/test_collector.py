@@ -0,0 +1,133 @@
+import os
+import socket
+import struct
+import tempfile
+import time
+import unittest
+
+from philips_air_purifier_ac2889 import ClientOptions, CollectorService, DeviceSimulator, PurifierStatus, StatusBoard
+from .helpers import closed_port
+
+
+class TestStatusBoard(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'purifiers.board')
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def test_readers_see_statuses_written_by_writer(self):
+
+        with StatusBoard.create(self.path, ['192.168.1.21', '192.168.1.22']) as writer:
+            with StatusBoard(self.path) as reader:
+                self.assertEqual(reader.hosts, ['192.168.1.21', '192.168.1.22'])
+                self.assertEqual(reader.read('192.168.1.21').status, None)
+
+                writer.write('192.168.1.21', {'pwr': '1', 'om': 's', 'mode': 'M', 'pm25': 7, 'cl': False}, 100.0)
+                entry = reader.read('192.168.1.21')
+
+        self.assertEqual(entry.timestamp, 100.0)
+        self.assertEqual(entry.failures, 0)
+        self.assertEqual(entry.status, PurifierStatus(om='s', pwr=True, cl=False, mode='M', pm25=7))
+
+    def test_failures_keep_the_latest_status(self):
+
+        with StatusBoard.create(self.path, ['192.168.1.21']) as board:
+            board.write('192.168.1.21', PurifierStatus(pm25=7), 100.0)
+            board.fail('192.168.1.21')
+            board.fail('192.168.1.21')
+            failed = board.read('192.168.1.21')
+            board.write('192.168.1.21', PurifierStatus(pm25=8), 200.0)
+            recovered = board.read('192.168.1.21')
+
+        self.assertEqual((failed.timestamp, failed.failures, failed.status.pm25), (100.0, 2, 7))
+        self.assertEqual((recovered.timestamp, recovered.failures, recovered.status.pm25), (200.0, 0, 8))
+
+    def test_slot_left_by_killed_writer_is_not_read_forever(self):
+
+        with StatusBoard.create(self.path, ['192.168.1.21']) as board:
+            board.write('192.168.1.21', PurifierStatus(pm25=7), 100.0)
+        with open(self.path, 'r+b') as file:
+            file.seek(16)  # sequence number of the first slot
+            file.write(struct.pack('<Q', 3))  # writer did not finish update
+
+        with StatusBoard(self.path) as reader:
+            self.assertRaises(TimeoutError, reader.read, '192.168.1.21', 0.05)
+            self.assertRaises(TimeoutError, reader.snapshot, 0.05)
+
+    def test_rejects_other_files(self):
+
+        with open(self.path, 'wb') as file:
+            file.write(bytes(64))
+
+        self.assertRaises(ValueError, StatusBoard, self.path)
+
+    def test_rejects_too_long_addresses(self):
+
+        self.assertRaises(ValueError, StatusBoard.create, self.path, ['a' * 65])
+
+
+class TestCollectorService(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'purifiers.board')
+        self.simulators = [DeviceSimulator(status={'pwr': '1', 'pm25': index}).start() for index in range(3)]
+
+    def tearDown(self):
+
+        for simulator in self.simulators:
+            simulator.stop()
+        self.directory.cleanup()
+
+    def test_processes_publish_statuses_of_their_devices(self):
+
+        offline = closed_port()
+        hosts = [simulator.address for simulator in self.simulators] + [offline]
+
+        with CollectorService(hosts, self.path, processes=2, interval=0.05, options=ClientOptions(timeout=1)):
+            with StatusBoard(self.path) as board:
+                deadline = time.monotonic() + 30
+                while time.monotonic() < deadline:
+                    entries = board.snapshot()
+                    if all(entries[host].status is not None for host in hosts[:3]) and entries[offline].failures:
+                        break
+                    time.sleep(0.05)
+
+        self.assertEqual([entries[host].status.pm25 for host in hosts[:3]], [0, 1, 2])
+        self.assertIsNone(entries[offline].status)
+        self.assertGreater(entries[offline].failures, 0)
+
+    def test_device_which_never_answers_does_not_stall_other_devices(self):
+
+        with socket.socket() as silent:
+            silent.bind(('127.0.0.1', 0))
+            silent.listen()  # connections are accepted by kernel, but nothing is answered
+            hung = f'127.0.0.1:{silent.getsockname()[1]}'
+            hosts = [hung, self.simulators[0].address]
+
+            service = CollectorService(hosts, self.path, processes=1, interval=0.05)
+            self.assertEqual(service.settings['options'].timeout, 10.0)
+            with service:
+                with StatusBoard(self.path) as board:
+                    deadline = time.monotonic() + 30
+                    while time.monotonic() < deadline:
+                        entries = board.snapshot()
+                        if entries[hosts[1]].status is not None and entries[hung].failures:
+                            break
+                        time.sleep(0.05)
+                stopped = time.monotonic()
+
+        self.assertLess(time.monotonic() - stopped, 5)
+        self.assertEqual(entries[hosts[1]].status.pm25, 0)
+        self.assertIsNone(entries[hung].status)
+        self.assertGreater(entries[hung].failures, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
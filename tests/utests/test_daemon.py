@@ -0,0 +1,183 @@
+import io
+import json
+import os
+import socket
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+
+from philips_air_purifier_ac2889 import ClientOptions, DaemonClient, DeviceSimulator, PurifierDaemon
+from philips_air_purifier_ac2889._cli import default_socket, main
+from philips_air_purifier_ac2889.errors import (AirPurifierError, ParameterNotRecognizedError,
+                                                ParameterRequiredError, ParameterValueError)
+
+
+class TestPurifierDaemon(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'purifiers.sock')
+        self.simulator = DeviceSimulator().start()
+
+    def tearDown(self):
+
+        self.simulator.stop()
+        self.directory.cleanup()
+
+    def test_clients_share_connected_session(self):
+
+        with PurifierDaemon(self.path, [self.simulator.address]):
+            for _ in range(3):
+                with DaemonClient(self.path) as client:
+                    client.set(self.simulator.address, mode='M', om=2, aqil='50')
+                    data = client.get(self.simulator.address, 'mode', 'om', 'aqil')
+                    network = client.network()
+
+        self.assertEqual(data, {'mode': 'M', 'om': '2', 'aqil': 50})
+        self.assertEqual(network['ssid'], 'simulator')
+        self.assertEqual(self.simulator.counters['/di/v1/products/0/security'], 1)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_connects_new_devices_on_first_request(self):
+
+        with PurifierDaemon(self.path), DaemonClient(self.path) as client:
+            data = client.get(self.simulator.address, 'pwr')
+
+            self.assertRaises(ParameterRequiredError, client.get, None)
+
+        self.assertEqual(data, {'pwr': '1'})
+
+    def test_raises_errors_of_daemon_in_client(self):
+
+        with PurifierDaemon(self.path, [self.simulator.address]), DaemonClient(self.path) as client:
+            self.assertRaises(ParameterValueError, client.set, mode='X')
+            self.assertRaises(ParameterNotRecognizedError, client.get, None, 'speed')
+            self.assertRaisesRegex(AirPurifierError, 'Unknown command', client.request, 'restart')
+            self.assertEqual(client.get(None, 'pwr'), {'pwr': '1'})
+
+    def test_clients_have_finite_timeout_by_default(self):
+
+        self.assertEqual(PurifierDaemon(self.path).options.timeout, 10.0)
+        self.assertEqual(PurifierDaemon(self.path, options=ClientOptions(timeout=3)).options.timeout, 3)
+
+    def test_does_not_replace_socket_of_running_daemon(self):
+
+        with PurifierDaemon(self.path):
+            self.assertRaisesRegex(OSError, 'Other daemon', PurifierDaemon(self.path).start)
+
+    def test_replaces_stale_socket(self):
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(self.path)  # socket file is left by killed daemon
+
+        with PurifierDaemon(self.path), DaemonClient(self.path) as client:
+            self.assertEqual(client.get(self.simulator.address, 'pwr'), {'pwr': '1'})
+
+
+class TestCommandLine(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'purifiers.sock')
+        self.simulator = DeviceSimulator().start()
+
+    def tearDown(self):
+
+        self.simulator.stop()
+        self.directory.cleanup()
+
+    def run_main(self, *argv):
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code = main(['--socket', self.path, *argv])
+
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_controls_device_directly_without_daemon(self):
+
+        code, output, _ = self.run_main('set', self.simulator.address, 'mode=M', 'om=3')
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(output)['om'], '3')
+
+        code, output, _ = self.run_main('get', self.simulator.address, 'mode', 'om')
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(output), {'mode': 'M', 'om': '3'})
+
+    def test_sends_commands_to_running_daemon(self):
+
+        with PurifierDaemon(self.path, [self.simulator.address]):
+            for _ in range(3):
+                code, output, _ = self.run_main('get', self.simulator.address, 'pwr')
+                self.assertEqual((code, json.loads(output)), (0, {'pwr': '1'}))
+
+        self.assertEqual(self.simulator.counters['/di/v1/products/0/security'], 1)
+
+    def test_reports_errors(self):
+
+        code, _, error = self.run_main('set', self.simulator.address, 'mode=X')
+
+        self.assertEqual(code, 1)
+        self.assertIn('Value "X" is not allowed', error)
+
+    def test_rejects_malformed_parameters(self):
+
+        with redirect_stderr(io.StringIO()):
+            self.assertRaises(SystemExit, main, ['set', self.simulator.address, 'mode'])
+
+
+
+@unittest.skipUnless(hasattr(os, 'getuid'), 'requires POSIX permissions')
+class TestDefaultSocket(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        environ = {key: value for key, value in os.environ.items()
+                   if key not in ('PHILIPS_AIR_PURIFIER_SOCKET', 'XDG_RUNTIME_DIR')}
+        patchers = [patch.dict(os.environ, environ, clear=True),
+                    patch('tempfile.gettempdir', return_value=self.directory.name)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def test_environment_variable_overrides_default(self):
+
+        os.environ['PHILIPS_AIR_PURIFIER_SOCKET'] = '/run/purifiers.sock'
+        os.environ['XDG_RUNTIME_DIR'] = '/run/user/1000'
+
+        self.assertEqual(default_socket(), '/run/purifiers.sock')
+
+    def test_socket_is_in_runtime_directory(self):
+
+        os.environ['XDG_RUNTIME_DIR'] = '/run/user/1000'
+
+        self.assertEqual(default_socket(), '/run/user/1000/philips-air-purifier.sock')
+
+    def test_socket_is_in_private_directory_without_runtime_directory(self):
+
+        path = default_socket()
+
+        directory = os.path.dirname(path)
+        self.assertEqual(os.path.dirname(directory), self.directory.name)
+        self.assertEqual(os.stat(directory).st_mode & 0o777, 0o700)
+        self.assertEqual(default_socket(), path)
+
+    def test_rejects_directory_accessible_by_other_users(self):
+
+        directory = os.path.join(self.directory.name, f'philips-air-purifier-{os.getuid()}')
+        os.mkdir(directory)
+        os.chmod(directory, 0o777)
+
+        self.assertRaises(PermissionError, default_socket)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from philips_air_purifier_ac2889 import (AirPurifier, ClientOptions, DeviceSimulator, RetryPolicy, discover,
+                                         discover_hosts)
+from .helpers import closed_port
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):  # pylint: disable=invalid-name
+
+        body = b'<html>Not found</html>'
+        self.send_response(404)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+
+        pass
+
+
+class TestDiscovery(unittest.TestCase):
+
+    def setUp(self):
+
+        self.simulators = [DeviceSimulator().start(), DeviceSimulator().start()]
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _PageHandler)
+        self.server_thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.server_thread.start()
+        self.page = f'127.0.0.1:{self.server.server_address[1]}'
+
+    def tearDown(self):
+
+        for simulator in self.simulators:
+            simulator.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_finds_only_devices_in_order_of_targets(self):
+
+        first, second = (simulator.address for simulator in self.simulators)
+        targets = [second, self.page, closed_port(), first]
+
+        hosts = asyncio.run(discover_hosts(targets, timeout=1.0, concurrency=2))
+
+        self.assertEqual(hosts, [second, first])
+
+    def test_does_not_change_session_of_device(self):
+
+        philips_air_purifier = AirPurifier(host=self.simulators[0].address).connect()
+
+        asyncio.run(discover_hosts([self.simulators[0].address], timeout=1.0))
+
+        self.assertEqual(philips_air_purifier.get('mode'), {'mode': 'A'})
+        self.assertEqual(self.simulators[0].counters['/di/v1/products/0/security'], 1)
+        philips_air_purifier.close()
+
+    def test_scans_network_on_given_port(self):
+
+        port = self.simulators[0].address.rsplit(':', 1)[1]
+
+        hosts = asyncio.run(discover_hosts('127.0.0.1/32', port=int(port), timeout=1.0))
+
+        self.assertEqual(hosts, [self.simulators[0].address])
+
+    def test_probes_single_host_given_by_name(self):
+
+        port = self.simulators[0].address.rsplit(':', 1)[1]
+
+        self.assertEqual(asyncio.run(discover_hosts(f'localhost:{port}', timeout=1.0)), [f'localhost:{port}'])
+        self.assertEqual(asyncio.run(discover_hosts('localhost', port=int(port), timeout=1.0)), [f'localhost:{port}'])
+
+    def test_does_not_find_hosts_which_do_not_answer_in_timeout(self):
+
+        slow = DeviceSimulator(latency=0.5).start()
+        try:
+            hosts = asyncio.run(discover_hosts([slow.address], timeout=0.05))
+        finally:
+            slow.stop()
+
+        self.assertEqual(hosts, [])
+
+    def test_returns_not_connected_clients(self):
+
+        retry = RetryPolicy()
+
+        purifiers = discover([self.simulators[0].address, self.page], timeout=1.0,
+                             options=ClientOptions(retry=retry))
+
+        self.assertEqual([purifier.host for purifier in purifiers], [self.simulators[0].address])
+        self.assertFalse(purifiers[0].is_connected)
+        self.assertIs(purifiers[0].options.retry, retry)
+        with purifiers[0].connect():
+            self.assertEqual(purifiers[0].get('pwr'), {'pwr': '1'})
+
+
+if __name__ == '__main__':
+    unittest.main()
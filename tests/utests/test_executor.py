@@ -0,0 +1,140 @@
+import threading
+import unittest
+from concurrent.futures import CancelledError
+from unittest.mock import patch
+
+from philips_air_purifier_ac2889 import (AirPurifier, ClientOptions, CommandExecutor, DeviceSimulator,
+                                         HistogramCollector, CONTROL, TELEMETRY)
+from philips_air_purifier_ac2889.errors import CommandExpiredError, ParameterValueError
+from .helpers import FakeClock
+
+
+class TestCommandExecutor(unittest.TestCase):
+
+    def setUp(self):
+
+        self.simulator = DeviceSimulator().start()
+        self.collector = HistogramCollector()
+        self.purifier = AirPurifier(self.simulator.address, options=ClientOptions(observer=self.collector)).connect()
+        self.clock = FakeClock(0.0)
+        self.executor = CommandExecutor(self.purifier, clock=self.clock)
+        self.release = threading.Event()
+        self.order = []
+        started = threading.Event()
+        self.executor.submit(lambda purifier: started.set() or self.release.wait(10), CONTROL)
+        started.wait(5)
+
+    def tearDown(self):
+
+        self.release.set()
+        self.executor.close()
+        self.purifier.close()
+        self.simulator.stop()
+
+    def record(self, name):
+
+        return lambda purifier: self.order.append(name)
+
+    def test_sends_control_commands_before_telemetry(self):
+
+        self.executor.submit(self.record('read 1'), TELEMETRY)
+        self.executor.submit(self.record('read 2'), TELEMETRY)
+        self.executor.submit(self.record('power off'), CONTROL)
+        self.executor.submit(self.record('mode'), CONTROL)
+
+        self.release.set()
+        self.executor.close()
+
+        self.assertEqual(self.order, ['power off', 'mode', 'read 1', 'read 2'])
+
+    def test_runs_client_methods(self):
+
+        reading = self.executor.get('pwr')
+        response = self.executor.set(pwr='0')
+        network = self.executor.network()
+
+        self.release.set()
+
+        self.assertEqual(response.result(5)['pwr'], '0')
+        self.assertEqual(reading.result(5), {'pwr': '0'})
+        self.assertEqual(network.result(5)['ssid'], 'simulator')
+
+    def test_drops_commands_after_deadline(self):
+
+        stale = self.executor.get('pm25', deadline=1.0)
+        fresh = self.executor.get('pwr', deadline=10.0)
+
+        self.clock.now = 5.0
+        self.release.set()
+
+        self.assertRaises(CommandExpiredError, stale.result, 5)
+        self.assertEqual(fresh.result(5), {'pwr': '1'})
+        self.assertEqual(self.executor.stats().expired, 1)
+
+    def test_skips_cancelled_commands(self):
+
+        cancelled = self.executor.submit(self.record('cancelled'))
+        self.executor.submit(self.record('sent'))
+
+        self.assertTrue(cancelled.cancel())
+        self.release.set()
+        self.executor.close()
+
+        self.assertRaises(CancelledError, cancelled.result)
+        self.assertEqual(self.order, ['sent'])
+        self.assertEqual(self.executor.stats().cancelled, 1)
+
+    def test_validates_parameters_before_queueing(self):
+
+        self.assertRaises(ParameterValueError, self.executor.set, mode='X')
+        self.assertEqual(self.executor.depth(), 0)
+
+    def test_reports_depth_and_wait_time(self):
+
+        self.executor.submit(self.record('read'), TELEMETRY)
+        self.executor.submit(self.record('control'), CONTROL)
+        self.executor.submit(lambda purifier: 1 / 0, TELEMETRY)
+
+        self.assertEqual(self.executor.depth(), 3)
+        self.assertEqual(self.executor.depth(TELEMETRY), 2)
+        self.assertEqual(self.executor.stats().depth, {CONTROL: 1, TELEMETRY: 2})
+
+        self.clock.now = 2.0
+        self.release.set()
+        self.executor.close()
+        stats = self.executor.stats()
+
+        self.assertEqual((stats.executed, stats.failed), (4, 1))
+        self.assertEqual(stats.max_wait, 2.0)
+        self.assertEqual(stats.mean_wait, 1.5)
+        self.assertEqual(self.collector.count('queue'), 4)
+
+    def test_cancels_queued_commands_on_close(self):
+
+        queued = self.executor.get('pwr')
+
+        self.release.set()
+        self.executor.close(cancel=True)
+
+        self.assertTrue(queued.cancelled() or queued.done())
+        self.assertRaises(RuntimeError, self.executor.get)
+
+    def test_interruption_stops_executor_and_cancels_queued_commands(self):
+
+        def interrupt(purifier):
+            raise KeyboardInterrupt
+
+        interrupted = self.executor.submit(interrupt, CONTROL)
+        queued = self.executor.get('pwr')
+
+        with patch('threading.excepthook'):  # interruption is raised in worker thread
+            self.release.set()
+            self.executor.close()
+
+        self.assertIsInstance(interrupted.exception(5), KeyboardInterrupt)
+        self.assertTrue(queued.cancelled())
+        self.assertRaises(RuntimeError, self.executor.get)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import time
+import threading
+import unittest
+from unittest.mock import patch, Mock
+
+import requests
+
+from philips_air_purifier_ac2889 import ClientOptions, PurifierFleet
+from philips_air_purifier_ac2889.errors import ClientNotConnectedError, ParameterValueError
+from .helpers import HANDSHAKE, BITS, STATUS
+
+
+@patch('random.getrandbits', Mock(return_value=BITS))
+class TestPurifierFleet(unittest.TestCase):
+
+    def setUp(self):
+
+        self.hosts = ['192.168.1.21', '192.168.1.22', '192.168.1.23']
+        self.fleet = PurifierFleet(self.hosts, max_workers=3, options=ClientOptions(timeout=1))
+
+    @patch('requests.Session.get')
+    @patch('requests.Session.put')
+    def test_offline_device_does_not_stop_other_devices(self, mock_put, mock_get):
+
+        def put(url, data, timeout):
+            if '192.168.1.23' in url:
+                raise requests.ConnectTimeout('timed out')
+            return Mock(content=HANDSHAKE)
+
+        mock_put.side_effect = put
+        mock_get.return_value = Mock(content=STATUS)
+
+        connected = self.fleet.connect()
+        results = self.fleet.get_all('mode', 'pm25')
+
+        self.assertTrue(connected['192.168.1.21'].ok)
+        self.assertIsInstance(connected['192.168.1.23'].error, requests.ConnectTimeout)
+        self.assertEqual(results['192.168.1.21'].data, {'mode': 'A', 'pm25': 8})
+        self.assertEqual(results['192.168.1.22'].data, {'mode': 'A', 'pm25': 8})
+        self.assertIsInstance(results['192.168.1.23'].error, ClientNotConnectedError)
+
+    @patch('requests.Session.put')
+    def test_set_all_validates_parameters_before_sending(self, mock_put):
+
+        mock_put.return_value = Mock(content=HANDSHAKE)
+        self.fleet.connect()
+        mock_put.reset_mock()
+
+        with self.assertRaises(ParameterValueError):
+            self.fleet.set_all(pwr='2')
+
+        mock_put.assert_not_called()
+
+    @patch('requests.Session.put')
+    def test_requests_use_fleet_timeout(self, mock_put):
+
+        mock_put.return_value = Mock(content=HANDSHAKE)
+
+        self.fleet.connect()
+
+        for call in mock_put.call_args_list:
+            self.assertEqual(call[1]['timeout'], 1)
+
+    @patch('requests.Session.put')
+    def test_hung_device_is_reported_after_deadline(self, mock_put):
+
+        release = threading.Event()
+
+        def put(url, data, timeout):
+            if '192.168.1.23' in url:
+                release.wait(5)  # device accepts connection but does not respond
+            return Mock(content=HANDSHAKE)
+
+        mock_put.side_effect = put
+        self.fleet.deadline = 0.2
+
+        started = time.monotonic()
+        connected = self.fleet.connect()
+        release.set()
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertTrue(connected['192.168.1.21'].ok)
+        self.assertTrue(connected['192.168.1.22'].ok)
+        self.assertIsInstance(connected['192.168.1.23'].error, TimeoutError)
+
+    def test_requests_have_finite_timeout_by_default(self):
+
+        with PurifierFleet(self.hosts) as fleet:
+            self.assertEqual(fleet.options.timeout, 10.0)
+
+    def tearDown(self):
+        self.fleet.close()
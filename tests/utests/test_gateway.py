@@ -0,0 +1,124 @@
+import json
+import threading
+import unittest
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from philips_air_purifier_ac2889 import ClientOptions, DeviceSimulator, PurifierGateway, ResponseCache
+
+
+class TestPurifierGateway(unittest.TestCase):
+
+    def setUp(self):
+
+        self.simulators = [DeviceSimulator().start(), DeviceSimulator(latency=0.05).start()]
+        self.gateway = PurifierGateway([simulator.address for simulator in self.simulators], port=0,
+                                       options=ClientOptions(cache=ResponseCache(ttl={'air': 60, 'wifi': 60}))).start()
+
+    def tearDown(self):
+
+        self.gateway.stop()
+        for simulator in self.simulators:
+            simulator.stop()
+
+    def request(self, path, data=None):
+
+        body = None if data is None else json.dumps(data).encode('utf-8')
+        request = Request(f'http://{self.gateway.address}{path}', body, method='GET' if data is None else 'PUT')
+        try:
+            with urlopen(request, timeout=10) as response:
+                return response.status, json.loads(response.read())
+        except HTTPError as error:
+            return error.code, json.loads(error.read())
+
+    def test_serves_status_and_network_of_devices(self):
+
+        host = self.simulators[0].address
+
+        self.assertEqual(self.request('/devices'), (200, [simulator.address for simulator in self.simulators]))
+        self.assertEqual(self.request(f'/devices/{host}/status?parameters=pwr,mode'), (200, {'pwr': '1', 'mode': 'A'}))
+        self.assertEqual(self.request(f'/devices/{host}/network')[1]['ssid'], 'simulator')
+
+    def test_consumers_share_one_session_and_cached_status(self):
+
+        host = self.simulators[1].address
+        results = []
+
+        def consume():
+            results.append(self.request(f'/devices/{host}/status'))
+
+        consumers = [threading.Thread(target=consume) for _ in range(8)]
+        for consumer in consumers:
+            consumer.start()
+        for consumer in consumers:
+            consumer.join()
+
+        self.assertEqual([status for status, _ in results], [200] * 8)
+        self.assertEqual(self.simulators[1].counters['/di/v1/products/0/security'], 1)
+        self.assertEqual(self.simulators[1].counters['/di/v1/products/1/air'], 1)
+
+    def test_sets_parameters_and_updates_cache(self):
+
+        host = self.simulators[0].address
+        self.request(f'/devices/{host}/status')
+
+        status, data = self.request(f'/devices/{host}/status', {'mode': 'M', 'om': 2})
+
+        self.assertEqual((status, data['om']), (200, '2'))
+        self.assertEqual(self.request(f'/devices/{host}/status?parameters=om')[1], {'om': '2'})
+        self.assertEqual(self.simulators[0].counters['/di/v1/products/1/air'], 2)
+
+    def test_serializes_writes_to_device(self):
+
+        host = self.simulators[1].address
+        writers = [threading.Thread(target=self.request, args=(f'/devices/{host}/status', {'om': om}))
+                   for om in ('1', '2', '3', 's')]
+        self.gateway.purifiers[host].connect()
+
+        original = self.gateway.purifiers[host].set
+        active, overlaps = [], []
+
+        def set_(**parameters):
+            overlaps.append(bool(active))
+            active.append(None)
+            try:
+                return original(**parameters)
+            finally:
+                active.pop()
+
+        self.gateway.purifiers[host].set = set_
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+
+        self.assertEqual(overlaps, [False] * 4)
+
+    def test_reports_errors(self):
+
+        host = self.simulators[0].address
+
+        self.assertEqual(self.request(f'/devices/{host}/status', {'mode': 'X'})[0], 400)
+        self.assertEqual(self.request(f'/devices/{host}/status?parameters=speed')[1]['error'],
+                         'ParameterNotRecognizedError')
+        self.assertEqual(self.request('/devices/192.168.1.99/status')[0], 404)
+        self.assertEqual(self.request(f'/devices/{host}/filters')[0], 404)
+        self.assertEqual(self.gateway.counters['errors'], 2)
+
+    def test_reports_unreachable_devices(self):
+
+        self.simulators[0].stop()
+
+        status, data = self.request(f'/devices/{self.simulators[0].address}/status')
+
+        self.assertEqual(status, 502)
+        self.assertIn('error', data)
+
+    def test_clients_have_finite_timeout_by_default(self):
+
+        for purifier in self.gateway.purifiers.values():
+            self.assertEqual(purifier.options.timeout, 10.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
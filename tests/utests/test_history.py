@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+
+from philips_air_purifier_ac2889 import HistoryStore, HistoryReader, PurifierStatus
+
+
+class TestHistoryStore(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = HistoryStore(self.directory.name)
+        for timestamp in range(100):
+            self.store.append('192.168.1.21', {'pm25': timestamp, 'iaql': 2, 'aqil': 50, 'err': 193, 'om': '1',
+                                               'mode': 'A', 'pwr': '1'}, timestamp=1000 + timestamp)
+
+    def test_query_returns_values_in_time_range(self):
+
+        result = self.store.query('192.168.1.21', 'pm25', start=1010, end=1013)
+
+        self.assertEqual(result, [(1010, 10), (1011, 11), (1012, 12)])
+
+    def test_text_fields_are_decoded(self):
+
+        self.assertEqual(self.store.query('192.168.1.21', 'mode', start=1098), [(1098, 'A'), (1099, 'A')])
+
+    def test_missing_values_are_kept(self):
+
+        self.store.append('192.168.1.22', PurifierStatus(pm25=4), timestamp=1)
+
+        with self.store.reader('192.168.1.22') as reader:
+            record, = reader.records()
+
+        self.assertEqual(record, {'timestamp': 1, 'pm25': 4, 'iaql': None, 'aqil': None, 'err': None,
+                                  'om': None, 'mode': None, 'pwr': None})
+
+    def test_reader_sees_records_appended_after_refresh(self):
+
+        reader = self.store.reader('192.168.1.21')
+        self.store.append('192.168.1.21', {'pm25': 7}, timestamp=2000)
+
+        self.assertEqual(len(reader), 100)
+        reader.refresh()
+        self.assertEqual(len(reader), 101)
+        reader.close()
+
+    def test_columns_are_views_of_mapped_file(self):
+
+        with self.store.reader('192.168.1.21') as reader:
+            pm25 = reader.column('pm25', start=1050)
+            self.assertIsInstance(pm25, memoryview)
+            self.assertEqual(sum(pm25), sum(range(50, 100)))
+            pm25.release()
+
+    def test_reader_rejects_other_files(self):
+
+        path = os.path.join(self.directory.name, 'other.hist')
+        with open(path, 'wb') as file:
+            file.write(b'x' * 64)
+
+        self.assertRaises(ValueError, HistoryReader, path)
+
+    def tearDown(self):
+
+        self.store.close()
+        self.directory.cleanup()
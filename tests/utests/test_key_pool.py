@@ -0,0 +1,81 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, Mock
+
+from philips_air_purifier_ac2889 import AirPurifier, ClientOptions, KeyPool
+from philips_air_purifier_ac2889._utils import create_key_exchange
+from .helpers import HANDSHAKE, BITS, SESSION_KEY
+
+
+class TestKeyPool(unittest.TestCase):
+
+    def setUp(self):
+        self.key_pool = KeyPool(size=4)
+
+    def test_fill_computes_all_keys(self):
+
+        self.key_pool.fill()
+
+        self.assertEqual(len(self.key_pool), 4)
+
+    def test_every_key_is_used_once(self):
+
+        self.key_pool.fill()
+
+        keys = [self.key_pool.take() for _ in range(8)]
+
+        self.assertEqual(len({bits for bits, _ in keys}), 8)
+
+    def test_pool_is_refilled_when_half_empty(self):
+
+        self.key_pool.fill()
+        self.key_pool.take()
+        self.key_pool.take()
+        self.key_pool._executor.shutdown(wait=True)
+
+        self.assertEqual(len(self.key_pool), 4)
+
+    def test_keys_which_were_not_submitted_are_not_pending(self):
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        submit = executor.submit
+        executor.submit = Mock(side_effect=[submit(create_key_exchange), RuntimeError('broken')])
+
+        with KeyPool(size=4, executor=executor) as key_pool:
+            self.assertRaises(RuntimeError, key_pool.fill)
+            self.assertEqual(len(key_pool), 1)
+
+            executor.submit = submit
+            key_pool.fill()
+
+            self.assertEqual(len(key_pool), 4)
+        executor.shutdown()
+
+    def test_fill_waits_for_all_keys_when_one_fails(self):
+
+        keys = [(1, b'1'), ValueError('failed'), (3, b'3'), (4, b'4')]
+
+        with patch('philips_air_purifier_ac2889._key_pool.create_key_exchange', Mock(side_effect=keys)):
+            self.assertRaises(ValueError, self.key_pool.fill)
+
+        self.assertEqual(len(self.key_pool), 3)
+        self.assertEqual(self.key_pool._pending, 0)
+
+    def tearDown(self):
+        self.key_pool.close()
+
+
+class TestAirPurifierKeyPool(unittest.TestCase):
+
+    @patch('requests.Session.put')
+    def test_precomputed_key_is_used_during_connection(self, mock_put):
+
+        mock_put.return_value = Mock(content=HANDSHAKE)
+        with patch('random.getrandbits', Mock(return_value=BITS)), KeyPool(size=2) as key_pool:
+            key_pool.fill()
+
+        with patch('philips_air_purifier_ac2889._base_air_purifier.create_key_exchange') as mock_create_key_exchange:
+            philips_air_purifier = AirPurifier(host='192.168.1.21', options=ClientOptions(key_pool=key_pool)).connect()
+
+        mock_create_key_exchange.assert_not_called()
+        self.assertEqual(philips_air_purifier.session_key, SESSION_KEY)
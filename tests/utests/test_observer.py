@@ -0,0 +1,106 @@
+import asyncio
+import unittest
+
+from philips_air_purifier_ac2889 import (AirPurifier, AsyncAirPurifier, ClientOptions, HistogramCollector, HostResolver,
+                                         Observer)
+
+from .test_async_air_purifier import FakeAsyncTransport
+from .test_cache import FakeTransport
+from .helpers import SESSION_KEY, STATUS
+
+
+class RecordingObserver(Observer):
+
+    def __init__(self):
+        self.stages = []
+
+    def observe(self, host, stage, duration, error=None):
+        self.stages.append((host, stage, error))
+
+
+class TestHistogramCollector(unittest.TestCase):
+
+    def setUp(self):
+
+        self.collector = HistogramCollector(buckets=(0.01, 0.1, 1))
+        for duration in (0.005, 0.01, 0.05, 0.05, 2):
+            self.collector.observe('192.168.1.21', 'http', duration)
+        self.collector.observe('192.168.1.22', 'http', 0.5, error=OSError('timed out'))
+
+    def test_count_and_quantile(self):
+
+        self.assertEqual(self.collector.count('http'), 6)
+        self.assertEqual(self.collector.count('http', host='192.168.1.22'), 1)
+        self.assertEqual(self.collector.quantile('http', 0.5), 0.1)
+        self.assertEqual(self.collector.quantile('http', 0.3, host='192.168.1.21'), 0.01)
+        self.assertEqual(self.collector.quantile('http', 1), float('inf'))
+        self.assertIsNone(self.collector.quantile('decrypt', 0.5))
+
+    def test_extreme_quantiles(self):
+
+        self.assertEqual(self.collector.quantile('http', 0), 0.01)
+        self.assertEqual(self.collector.quantile('http', 0, host='192.168.1.22'), 1)
+        self.assertEqual(self.collector.quantile('http', 1, host='192.168.1.22'), 1)
+        self.assertEqual(self.collector.quantile('http', 1, host='192.168.1.21'), float('inf'))
+        self.assertIsNone(self.collector.quantile('decrypt', 0))
+
+    def test_prometheus_text(self):
+
+        text = self.collector.to_prometheus(prefix='purifier')
+
+        self.assertIn('# TYPE purifier_stage_duration_seconds histogram\n', text)
+        self.assertIn('purifier_stage_duration_seconds_bucket{host="192.168.1.21",stage="http",le="0.01"} 2\n', text)
+        self.assertIn('purifier_stage_duration_seconds_bucket{host="192.168.1.21",stage="http",le="+Inf"} 5\n', text)
+        self.assertIn('purifier_stage_duration_seconds_count{host="192.168.1.21",stage="http"} 5\n', text)
+        self.assertIn('purifier_stage_errors_total{host="192.168.1.22",stage="http"} 1\n', text)
+
+    def test_reset(self):
+
+        self.collector.reset()
+
+        self.assertEqual(self.collector.count('http'), 0)
+
+
+class TestClientObserver(unittest.TestCase):
+
+    def setUp(self):
+
+        self.content = STATUS
+        self.observer = RecordingObserver()
+
+    def test_client_reports_stages(self):
+
+        philips_air_purifier = AirPurifier(host='192.168.1.21', transport=FakeTransport(self.content),
+                                           options=ClientOptions(observer=self.observer, resolver=HostResolver()))
+        philips_air_purifier.session_key = SESSION_KEY
+        philips_air_purifier.is_connected = True
+
+        philips_air_purifier.get()
+        philips_air_purifier.set(mode='A')
+
+        self.assertEqual([stage for _, stage, _ in self.observer.stages],
+                         ['resolve', 'http', 'decrypt', 'parse', 'get', 'encrypt', 'http', 'decrypt', 'parse', 'set'])
+
+    def test_failed_stage_is_reported_with_error(self):
+
+        philips_air_purifier = AirPurifier(host='192.168.1.21', transport=FakeTransport(b'invalid'),
+                                           options=ClientOptions(observer=self.observer))
+        philips_air_purifier.session_key = SESSION_KEY
+        philips_air_purifier.is_connected = True
+
+        self.assertRaises(Exception, philips_air_purifier.network)
+
+        host, stage, error = self.observer.stages[-1]
+        self.assertEqual((host, stage), ('192.168.1.21', 'network'))
+        self.assertIsNotNone(error)
+
+    def test_async_client_reports_stages(self):
+
+        philips_air_purifier = AsyncAirPurifier(host='192.168.1.21', transport=FakeAsyncTransport(self.content),
+                                                options=ClientOptions(observer=self.observer, resolver=HostResolver()))
+        philips_air_purifier.session_key = SESSION_KEY
+        philips_air_purifier.is_connected = True
+
+        asyncio.run(philips_air_purifier.get())
+
+        self.assertEqual([stage for _, stage, _ in self.observer.stages], ['resolve', 'http', 'decrypt', 'parse', 'get'])
@@ -30,7 +30,7 @@ class TestAirPurifier(unittest.TestCase):
     )
     @unpack
     @patch('random.getrandbits')
-    @patch('requests.put')
+    @patch('requests.Session.put')
     def test_philips_air_purifier_connect_procedure(self, put_requests_data, bits, session_key, 
                                                     mock_put, mock_getrandbits):
 
@@ -79,7 +79,7 @@ class TestAirPurifier(unittest.TestCase):
         ),
     )
     @unpack
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_data_from_air_purifier(self, parameters, recv_data, decoded_data, mock_get):
 
         mock_get.return_value = self._mock_response(content=recv_data)
@@ -92,7 +92,7 @@ class TestAirPurifier(unittest.TestCase):
 
         self.assertEqual(response_data, decoded_data)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_network_information_from_air_purifier(self, mock_get):
 
         expected_data = {"ssid": "FunBox3-6CF2", "password": "", "protection": "wpa-2", "ipaddress": "192.168.1.21",
@@ -127,7 +127,7 @@ class TestAirPurifier(unittest.TestCase):
         ),
     )
     @unpack
-    @patch('requests.put')
+    @patch('requests.Session.put')
     def test_set_parameters_in_air_purifier(self, parameters, recv_data, decoded_data, mock_put):
 
         mock_put.return_value = self._mock_response(content=recv_data)
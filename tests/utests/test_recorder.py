@@ -0,0 +1,78 @@
+import io
+import unittest
+
+from philips_air_purifier_ac2889 import ReadingRecorder, DeviceSeries, PurifierStatus
+
+
+class TestDeviceSeries(unittest.TestCase):
+
+    def test_readings_are_kept_in_columns(self):
+
+        series = DeviceSeries()
+        series.append({'pm25': 5, 'iaql': 2, 'aqil': 50, 'om': '1', 'mode': 'A', 'pwr': '1'}, timestamp=10)
+        series.append(PurifierStatus(pm25=7, mode='M'), timestamp=11)
+
+        self.assertEqual(list(series.timestamps()), [10, 11])
+        self.assertEqual(series.values('pm25'), [5, 7])
+        self.assertEqual(series.values('om'), ['1', None])
+        self.assertEqual(series.values('mode'), ['A', 'M'])
+        self.assertEqual(series._columns['pm25'].values.typecode, 'H')
+
+    def test_oldest_readings_are_overwritten_when_capacity_is_reached(self):
+
+        series = DeviceSeries(fields=('pm25',), capacity=3)
+        for timestamp in range(5):
+            series.append({'pm25': timestamp * 10}, timestamp=timestamp)
+
+        self.assertEqual(len(series), 3)
+        self.assertEqual(list(series.timestamps()), [2, 3, 4])
+        self.assertEqual(series.values('pm25'), [20, 30, 40])
+
+    def test_downsample_aggregates_values_in_windows(self):
+
+        series = DeviceSeries(fields=('pm25', 'mode'))
+        for timestamp, pm25 in [(0, 4), (30, 8), (59, None), (60, 10), (150, 1), (170, 3)]:
+            series.append({'pm25': pm25, 'mode': 'A'}, timestamp=timestamp)
+
+        self.assertEqual(series.downsample('pm25', 60), [(0, 4, 8, 6), (60, 10, 10, 10), (120, 1, 3, 2)])
+        self.assertRaises(ValueError, series.downsample, 'mode', 60)
+
+
+class TestReadingRecorder(unittest.TestCase):
+
+    def setUp(self):
+
+        self.recorder = ReadingRecorder(fields=('pm25', 'mode'), capacity=2)
+        self.recorder.record('192.168.1.21', {'pm25': 5, 'mode': 'A'}, timestamp=1.5)
+        self.recorder.record('192.168.1.21', {'pm25': 6, 'mode': 'M'}, timestamp=2.5)
+        self.recorder.record('192.168.1.21', {'pm25': 7, 'mode': 'A'}, timestamp=3.5)
+        self.recorder.record('192.168.1.22', {'pm25': 9}, timestamp=1.0)
+
+    def test_readings_are_exported_to_csv(self):
+
+        file = io.StringIO()
+        self.recorder.to_csv(file)
+
+        self.assertEqual(file.getvalue().splitlines(), [
+            'host,timestamp,pm25,mode',
+            '192.168.1.21,2.5,6,M',
+            '192.168.1.21,3.5,7,A',
+            '192.168.1.22,1.0,9,',
+        ])
+
+    def test_saved_readings_are_loaded(self):
+
+        file = io.BytesIO()
+        self.recorder.save(file)
+        file.seek(0)
+
+        recorder = ReadingRecorder.load(file)
+
+        self.assertEqual(recorder.fields, ('pm25', 'mode'))
+        self.assertEqual(list(recorder.series['192.168.1.21'].timestamps()), [2.5, 3.5])
+        self.assertEqual(recorder.series['192.168.1.21'].values('mode'), ['M', 'A'])
+        self.assertEqual(recorder.series['192.168.1.22'].values('pm25'), [9])
+
+    def test_loading_invalid_file_raises_error(self):
+
+        self.assertRaises(ValueError, ReadingRecorder.load, io.BytesIO(b'NOPE\x00\x00\x00\x00'))
@@ -0,0 +1,138 @@
+import socket
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from philips_air_purifier_ac2889 import (AirPurifier, AsyncAirPurifier, ClientOptions, HostResolver, RetryPolicy,
+                                         Transport)
+
+from .test_async_air_purifier import FakeAsyncTransport
+from .helpers import FakeClock
+
+
+class FailingTransport(Transport):
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.urls = []
+
+    def get(self, url, timeout=None):
+        self.urls.append(url)
+        if len(self.urls) <= self.failures:
+            raise OSError('host is unreachable')
+        return b''
+
+    def close(self):
+        pass
+
+
+class TestHostResolver(unittest.TestCase):
+
+    def setUp(self):
+
+        self.clock = FakeClock()
+        self.resolver = HostResolver(ttl=60, clock=self.clock)
+
+    @patch('socket.gethostbyname')
+    def test_ip_address_is_not_resolved(self, mock_gethostbyname):
+
+        self.assertEqual(self.resolver.resolve('192.168.1.21:8080'), '192.168.1.21:8080')
+        mock_gethostbyname.assert_not_called()
+
+    @patch('socket.gethostbyname')
+    def test_address_is_kept_for_ttl(self, mock_gethostbyname):
+
+        mock_gethostbyname.side_effect = ['192.168.1.21', '192.168.1.35']
+
+        self.assertEqual(self.resolver.resolve('purifier.local'), '192.168.1.21')
+        self.clock.now += 59
+        self.assertEqual(self.resolver.resolve('purifier.local'), '192.168.1.21')
+        self.clock.now += 1
+        self.assertEqual(self.resolver.resolve('purifier.local:80'), '192.168.1.35:80')
+        mock_gethostbyname.assert_called_with('purifier.local')
+
+    @patch('socket.gethostbyname')
+    def test_last_known_address_is_used_when_resolution_fails(self, mock_gethostbyname):
+
+        mock_gethostbyname.side_effect = ['192.168.1.21', socket.gaierror('timed out'), socket.gaierror('timed out')]
+        self.resolver.resolve('purifier.local')
+
+        self.resolver.invalidate('purifier.local')
+
+        self.assertIsNone(self.resolver.cached('purifier.local'))
+        self.assertEqual(self.resolver.resolve('purifier.local'), '192.168.1.21')
+        self.assertRaises(socket.gaierror, self.resolver.resolve, 'other.local')
+
+    @patch('socket.gethostbyname')
+    def test_last_known_address_is_kept_for_grace_period(self, mock_gethostbyname):
+
+        resolver = HostResolver(ttl=60, clock=self.clock, grace=10)
+        mock_gethostbyname.side_effect = ['192.168.1.21', socket.gaierror('timed out'), '192.168.1.35']
+        resolver.resolve('purifier.local')
+        self.clock.now += 60
+
+        self.assertEqual(resolver.resolve('purifier.local'), '192.168.1.21')
+        self.clock.now += 9
+        self.assertEqual(resolver.resolve('purifier.local'), '192.168.1.21')
+        self.assertEqual(mock_gethostbyname.call_count, 2)
+        self.clock.now += 1
+        self.assertEqual(resolver.resolve('purifier.local'), '192.168.1.35')
+
+    @patch('socket.gethostbyname')
+    def test_ipv6_address_is_not_resolved(self, mock_gethostbyname):
+
+        self.assertEqual(self.resolver.resolve('[fe80::1]:80'), '[fe80::1]:80')
+        self.assertEqual(self.resolver.resolve('[fe80::1]'), '[fe80::1]')
+        mock_gethostbyname.assert_not_called()
+
+    def test_name_is_resolved_by_event_loop(self):
+
+        async def getaddrinfo(host, port, family=0, type=0):
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('192.168.1.21', 0))]
+
+        async def main():
+            with patch.object(asyncio.get_running_loop(), 'getaddrinfo', getaddrinfo):
+                return await self.resolver.resolve_async('purifier.local:8080')
+
+        self.assertEqual(asyncio.run(main()), '192.168.1.21:8080')
+
+
+class TestClientResolution(unittest.TestCase):
+
+    @patch('socket.gethostbyname')
+    def test_client_resolves_host_on_first_request(self, mock_gethostbyname):
+
+        mock_gethostbyname.return_value = '192.168.1.21'
+        transport = FailingTransport(failures=0)
+
+        philips_air_purifier = AirPurifier(host='purifier.local', transport=transport,
+                                           options=ClientOptions(resolver=HostResolver()))
+        mock_gethostbyname.assert_not_called()
+
+        philips_air_purifier._send('GET', '/di/v1/products/1/air')
+
+        self.assertEqual(transport.urls[-1], 'http://192.168.1.21/di/v1/products/1/air')
+
+    @patch('time.sleep')
+    @patch('socket.gethostbyname')
+    def test_host_is_resolved_again_after_connection_failure(self, mock_gethostbyname, mock_sleep):
+
+        mock_gethostbyname.side_effect = ['192.168.1.21', '192.168.1.35']
+        transport = FailingTransport(failures=1)
+        philips_air_purifier = AirPurifier(host='purifier.local', transport=transport,
+                                           options=ClientOptions(retry=RetryPolicy(), resolver=HostResolver()))
+
+        philips_air_purifier._send('GET', '/di/v1/products/1/air')
+
+        self.assertEqual(transport.urls, ['http://192.168.1.21/di/v1/products/1/air',
+                                          'http://192.168.1.35/di/v1/products/1/air'])
+
+    def test_async_client_resolves_host_on_first_request(self):
+
+        transport = FakeAsyncTransport(b'')
+        philips_air_purifier = AsyncAirPurifier(host='localhost', transport=transport,
+                                                options=ClientOptions(resolver=HostResolver()))
+
+        asyncio.run(philips_air_purifier._send('GET', '/di/v1/products/1/air'))
+
+        self.assertEqual(transport.requests, [('GET', 'http://127.0.0.1/di/v1/products/1/air', None)])
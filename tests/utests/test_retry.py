@@ -0,0 +1,112 @@
+import asyncio
+import unittest
+from unittest.mock import patch, Mock
+
+import requests
+
+from philips_air_purifier_ac2889 import AirPurifier, AsyncAirPurifier, ClientOptions, RetryPolicy
+from philips_air_purifier_ac2889.errors import ResponseDecodingError
+from .test_async_air_purifier import FakeAsyncTransport
+from .helpers import HANDSHAKE, BITS, SESSION_KEY, STATUS
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_delay_grows_exponentially_up_to_limit(self):
+
+        policy = RetryPolicy(backoff=0.5, max_backoff=3, jitter=0)
+
+        self.assertEqual([policy.delay(retry) for retry in range(1, 6)], [0.5, 1, 2, 3, 3])
+
+    def test_delay_is_randomized_by_jitter(self):
+
+        policy = RetryPolicy(backoff=1, jitter=0.2)
+
+        for _ in range(100):
+            self.assertTrue(0.8 <= policy.delay(1) <= 1.2)
+
+
+@patch('time.sleep', Mock())
+@patch('random.getrandbits', Mock(return_value=BITS))
+class TestAirPurifierRetry(unittest.TestCase):
+
+    def setUp(self):
+
+        self.philips_air_purifier = AirPurifier(host='192.168.1.21',
+                                                options=ClientOptions(retry=RetryPolicy(attempts=3), timeout=2))
+        self.philips_air_purifier.session_key = SESSION_KEY
+        self.philips_air_purifier.is_connected = True
+
+    @patch('requests.Session.get')
+    def test_request_is_repeated_after_network_error(self, mock_get):
+
+        mock_get.side_effect = [requests.ConnectionError(), requests.Timeout(), Mock(content=STATUS)]
+
+        data = self.philips_air_purifier.get('pm25')
+
+        self.assertEqual(data, {'pm25': 8})
+        self.assertEqual(self.philips_air_purifier.counters['retries'], 2)
+        mock_get.assert_called_with('http://192.168.1.21/di/v1/products/1/air', timeout=2)
+
+    @patch('requests.Session.get')
+    def test_error_is_raised_when_attempts_are_exhausted(self, mock_get):
+
+        mock_get.side_effect = requests.ConnectionError()
+
+        with self.assertRaises(requests.ConnectionError):
+            self.philips_air_purifier.get()
+
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch('requests.Session.get')
+    @patch('requests.Session.put')
+    def test_request_is_replayed_after_key_exchange_when_key_is_stale(self, mock_put, mock_get):
+
+        self.philips_air_purifier.session_key = b'0123456789abcdef'
+        mock_get.return_value = Mock(content=STATUS)
+        mock_put.return_value = Mock(content=HANDSHAKE)
+
+        data = self.philips_air_purifier.get('pm25')
+
+        self.assertEqual(data, {'pm25': 8})
+        self.assertEqual(self.philips_air_purifier.session_key, SESSION_KEY)
+        self.assertEqual(self.philips_air_purifier.counters['reconnects'], 1)
+
+    @patch('requests.Session.get')
+    def test_stale_key_error_is_raised_without_retry_policy(self, mock_get):
+
+        self.philips_air_purifier.options = ClientOptions(timeout=2)
+        self.philips_air_purifier.session_key = b'0123456789abcdef'
+        mock_get.return_value = Mock(content=STATUS)
+
+        with self.assertRaises(ResponseDecodingError):
+            self.philips_air_purifier.get()
+
+
+class FlakyAsyncTransport(FakeAsyncTransport):
+
+    def __init__(self, content, failures):
+        super().__init__(content)
+        self.failures = failures
+
+    async def get(self, url, timeout=None):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionResetError()
+        return await super().get(url, timeout)
+
+
+class TestAsyncAirPurifierRetry(unittest.TestCase):
+
+    def test_request_is_repeated_after_network_error(self):
+
+        transport = FlakyAsyncTransport(STATUS, failures=2)
+        philips_air_purifier = AsyncAirPurifier(host='192.168.1.21', transport=transport,
+                                                options=ClientOptions(retry=RetryPolicy(backoff=0)))
+        philips_air_purifier.session_key = SESSION_KEY
+        philips_air_purifier.is_connected = True
+
+        data = asyncio.run(philips_air_purifier.get('pm25'))
+
+        self.assertEqual(data, {'pm25': 8})
+        self.assertEqual(philips_air_purifier.counters['retries'], 2)
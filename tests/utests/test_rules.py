@@ -0,0 +1,143 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from philips_air_purifier_ac2889 import AirPurifier, DeviceSimulator, Rule, RuleEngine
+from philips_air_purifier_ac2889.errors import ParameterValueError
+
+
+RULES = [
+    Rule('pm25', {'mode': 'M', 'om': 3}, above=35, name='polluted'),
+    Rule('pm25', {'mode': 'A'}, below=12, dwell=600, name='clean'),
+]
+
+
+class TestRule(unittest.TestCase):
+
+    def test_matches_readings_within_thresholds(self):
+
+        rule = Rule('pm25', {'mode': 'M'}, above=10, below=20)
+
+        self.assertEqual([rule.matches(value) for value in (5, 10, 15, '15', 20, None, 'x')],
+                         [False, False, True, True, False, False, False])
+
+
+class TestRuleEngine(unittest.TestCase):
+
+    def setUp(self):
+
+        self.simulator = DeviceSimulator(status={'pwr': '1', 'mode': 'A', 'om': '1', 'pm25': 5}).start()
+        self.purifier = AirPurifier(self.simulator.address).connect()
+        self.engine = RuleEngine(self.purifier, RULES)
+
+    def tearDown(self):
+
+        self.purifier.close()
+        self.simulator.stop()
+
+    def test_sets_parameters_once_when_rule_fires(self):
+
+        changes = [self.engine.update({'pm25': 40, 'mode': 'A', 'om': '1'}, 0),
+                   self.engine.update({'pm25': 50}, 1),
+                   self.engine.update({'pm25': 45, 'mode': 'M', 'om': '3'}, 2)]
+
+        self.assertEqual(changes[0], {'mode': 'M', 'om': '3'})
+        self.assertEqual(changes[1:], [{}, {}])
+        self.assertEqual((self.simulator.status['mode'], self.simulator.status['om']), ('M', '3'))
+        self.assertEqual(self.engine.counters['sets'], 1)
+
+    def test_waits_for_dwell_time_and_keeps_state_in_hysteresis_band(self):
+
+        self.engine.update({'pm25': 40}, 0)
+        self.assertEqual(self.engine.update({'pm25': 20}, 100), {})  # between thresholds
+        self.assertEqual(self.engine.update({'pm25': 10}, 200), {})
+        self.assertEqual(self.engine.update({'pm25': 10}, 700), {})
+        self.assertEqual(self.engine.update({'pm25': 10}, 800), {'mode': 'A'})
+
+        self.assertEqual(self.simulator.status['mode'], 'A')
+        self.assertEqual(self.engine.counters['clean'], 1)
+
+    def test_dwell_time_restarts_when_rule_stops_matching(self):
+
+        self.engine.update({'pm25': 10, 'mode': 'M'}, 0)
+        self.engine.update({'pm25': 15, 'mode': 'M'}, 500)
+
+        self.assertEqual(self.engine.update({'pm25': 10, 'mode': 'M'}, 700), {})
+        self.assertEqual(self.engine.update({'pm25': 10, 'mode': 'M'}, 1200), {})
+        self.assertEqual(self.engine.update({'pm25': 10, 'mode': 'M'}, 1300), {'mode': 'A'})
+
+    def test_does_not_set_parameters_which_device_already_has(self):
+
+        self.assertEqual(self.engine.update({'pm25': 40, 'mode': 'M', 'om': '3'}, 0), {})
+        self.assertEqual(self.engine.update({'pm25': 45, 'mode': 'M', 'om': '3'}, 1), {})
+
+        self.assertEqual(self.engine.counters['unchanged'], 1)
+        self.assertEqual(self.engine.counters['sets'], 0)
+        self.assertEqual(self.simulator.counters['/di/v1/products/1/air'], 0)
+
+    def test_corrects_drift_of_active_rule(self):
+
+        self.engine.update({'pm25': 40, 'mode': 'M', 'om': '3'}, 0)
+
+        self.assertEqual(self.engine.update({'pm25': 40, 'mode': 'M', 'om': '2'}, 1), {'om': '3'})
+        self.assertEqual(self.simulator.status['om'], '3')
+        self.assertEqual(self.engine.counters['fired'], 1)
+
+    def test_sends_parameters_again_after_failed_request(self):
+
+        with patch.object(self.purifier, 'set', side_effect=OSError('Device is unreachable.')):
+            self.assertRaises(OSError, self.engine.update, {'pm25': 50, 'mode': 'A'}, 0)
+        self.assertEqual(self.engine.counters['fired'], 0)
+
+        self.assertEqual(self.engine.update({'pm25': 50, 'mode': 'A'}, 1), {'mode': 'M', 'om': '3'})
+        self.assertEqual(self.simulator.status['mode'], 'M')
+        self.assertEqual(self.engine.counters['fired'], 1)
+
+    def test_returns_changes_without_client(self):
+
+        engine = RuleEngine(None, RULES)
+
+        self.assertEqual(engine.update({'pm25': 40, 'mode': 'A', 'om': '1'}, 0), {'mode': 'M', 'om': '3'})
+
+    def test_rejects_invalid_actions(self):
+
+        self.assertRaises(ParameterValueError, RuleEngine, None, [Rule('pm25', {'mode': 'X'}, above=35)])
+
+    def test_runs_until_stopped(self):
+
+        self.simulator.status['pm25'] = 50
+        thread = threading.Thread(target=self.engine.run, args=(0.01,))
+        thread.start()
+        try:
+            for _ in range(500):
+                if self.simulator.status['mode'] == 'M':
+                    break
+                threading.Event().wait(0.01)
+        finally:
+            self.engine.stop()
+            thread.join()
+
+        self.assertEqual((self.simulator.status['mode'], self.simulator.status['om']), ('M', '3'))
+        self.assertEqual(self.engine.counters['sets'], 1)
+
+    def test_keeps_running_after_errors_of_device(self):
+
+        self.simulator.status['pm25'] = 50
+        self.simulator.restart()  # session key of client is not accepted anymore
+        thread = threading.Thread(target=self.engine.run, args=(0.01,))
+        thread.start()
+        try:
+            for _ in range(500):
+                if self.engine.counters['sets']:
+                    break
+                threading.Event().wait(0.01)
+        finally:
+            self.engine.stop()
+            thread.join()
+
+        self.assertGreater(self.engine.counters['errors'], 0)
+        self.assertEqual(self.simulator.status['mode'], 'M')
+
+
+if __name__ == '__main__':
+    unittest.main()
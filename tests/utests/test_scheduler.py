@@ -0,0 +1,141 @@
+import threading
+import unittest
+from unittest.mock import patch, Mock
+
+from philips_air_purifier_ac2889 import AdaptiveScheduler
+from .helpers import FakeClock
+
+
+def purifier(host, *readings):
+
+    return Mock(host=host, get=Mock(side_effect=list(readings)))
+
+
+@patch('random.uniform', Mock(return_value=0))
+class TestAdaptiveScheduler(unittest.TestCase):
+
+    def setUp(self):
+
+        self.clock = FakeClock()
+
+    def _poll(self, scheduler, times):
+
+        for _ in range(times):
+            self.clock.now += scheduler.next_poll()
+            scheduler.step()
+            self._finish(scheduler)
+
+    def _finish(self, scheduler):
+
+        self.assertTrue(scheduler.wait(1))
+        return scheduler.step()
+
+    def test_interval_grows_while_readings_are_flat(self):
+
+        device = purifier('192.168.1.21', *[{'pm25': 3, 'mode': 'A'}] * 5)
+        scheduler = AdaptiveScheduler([device], min_interval=5, max_interval=30, clock=self.clock)
+
+        self._poll(scheduler, 5)
+
+        self.assertEqual(scheduler.stats().intervals, {'192.168.1.21': 30})
+        self.assertEqual(self.clock.now, 1000 + 5 + 10 + 20 + 30)
+
+    def test_rising_pm25_switches_to_shortest_interval(self):
+
+        device = purifier('192.168.1.21', {'pm25': 3}, {'pm25': 3}, {'pm25': 3}, {'pm25': 20})
+        scheduler = AdaptiveScheduler([device], min_interval=5, max_interval=300, clock=self.clock)
+
+        self._poll(scheduler, 3)
+        self.assertEqual(scheduler.stats().intervals['192.168.1.21'], 20)
+        self._poll(scheduler, 1)
+        self.assertEqual(scheduler.stats().intervals['192.168.1.21'], 5)
+
+    def test_set_switches_to_shortest_interval_and_polls_device(self):
+
+        device = purifier('192.168.1.21', {'pm25': 3}, {'pm25': 3}, {'pm25': 3})
+        scheduler = AdaptiveScheduler([device], min_interval=5, max_interval=300, clock=self.clock)
+        self._poll(scheduler, 2)
+
+        scheduler.set('192.168.1.21', mode='M')
+
+        device.set.assert_called_once_with(mode='M')
+        self.assertEqual(scheduler.next_poll(), 0)
+        self.assertEqual(scheduler.stats().intervals['192.168.1.21'], 5)
+
+    def test_poll_started_before_set_does_not_back_off(self):
+
+        release = threading.Event()
+
+        def get():
+            release.wait(1)
+            raise OSError('timed out')
+
+        device = Mock(host='192.168.1.21', get=Mock(side_effect=get))
+        scheduler = AdaptiveScheduler([device], min_interval=5, max_interval=300, clock=self.clock)
+        self.clock.now += scheduler.next_poll()
+        scheduler.step()
+
+        scheduler.set('192.168.1.21', mode='M')
+        release.set()
+        results = self._finish(scheduler)
+
+        self.assertFalse(results['192.168.1.21'].ok)
+        self.assertEqual(scheduler.stats().intervals['192.168.1.21'], 5)
+        self.assertEqual(scheduler.stats().requests, 2)  # device is polled again without waiting
+
+    def test_failing_device_is_polled_less_often(self):
+
+        device = purifier('192.168.1.21', OSError('timed out'), OSError('timed out'))
+        results = []
+        scheduler = AdaptiveScheduler([device], callback=lambda host, result: results.append(result),
+                                      min_interval=5, clock=self.clock)
+
+        self._poll(scheduler, 2)
+
+        self.assertEqual(scheduler.stats().intervals['192.168.1.21'], 20)
+        self.assertEqual(scheduler.stats().errors, 2)
+        self.assertFalse(results[-1].ok)
+
+    def test_rate_limit_delays_polls(self):
+
+        devices = [purifier(f'192.168.1.{number}', {'pm25': 3}) for number in range(4)]
+        scheduler = AdaptiveScheduler(devices, min_interval=5, rate=1, clock=self.clock)
+        self.clock.now += 5
+
+        self.assertEqual(scheduler.step(), {})
+        results = self._finish(scheduler)
+        stats = scheduler.stats()
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual((stats.requests, stats.throttled), (1, 3))
+        self.assertEqual(stats.request_rate, 0.2)
+        self.assertEqual(scheduler.next_poll(), 1)
+
+    def test_parameters_are_passed_to_get(self):
+
+        device = purifier('192.168.1.21', {'pm25': 3})
+        scheduler = AdaptiveScheduler([device], parameters=['pm25'], clock=self.clock)
+
+        self._poll(scheduler, 1)
+
+        device.get.assert_called_once_with('pm25')
+
+    def test_hung_device_does_not_delay_other_devices(self):
+
+        release = threading.Event()
+        hung = Mock(host='192.168.1.21', get=Mock(side_effect=lambda: release.wait(5) and {'pm25': 3}))
+        device = purifier('192.168.1.22', {'pm25': 3}, {'pm25': 3})
+        scheduler = AdaptiveScheduler([hung, device], min_interval=5, clock=self.clock)
+        self.addCleanup(release.set)
+
+        self._poll(scheduler, 1)
+        self.clock.now += 5
+        scheduler.step()
+        results = self._finish(scheduler)
+
+        self.assertEqual(list(results), ['192.168.1.22'])
+        self.assertEqual(device.get.call_count, 2)
+        hung.get.assert_called_once_with()
+
+        release.set()
+        self.assertEqual(self._finish(scheduler)['192.168.1.21'].data, {'pm25': 3})
@@ -0,0 +1,63 @@
+import unittest
+from ddt import ddt, data
+
+from philips_air_purifier_ac2889._utils import SessionCipher, encrypt, decrypt
+from philips_air_purifier_ac2889.errors import ResponseDecodingError
+from .helpers import SESSION_KEY
+
+
+@ddt
+class TestSessionCipher(unittest.TestCase):
+
+    def setUp(self):
+        self.cipher = SessionCipher(SESSION_KEY)
+
+    @data(
+        b'Bm3hvm2fTmxoSWXldbkwyAlLEoQm/RXDmQf3YcG451eZ/WiaRBrRfnwaVTCzyg5jdSDRZK4fJra/XHC52SmPmQ'
+        b'iiEfNnHmR+qBzuvE0i3NzhuQQbYFZJaepj6D0t70wQjqosF+utrAHL2+Ecvu8jNXX91IgUZZHeFP3+KE+UDTA=',
+        b'WQTVglfzx3QgGe12t3/vp3dDETRF+y5j6cSV9PFRU/H807UFG53TFJQ6svMGcX3fnjblFFf4UoGEqc8JJ6svNl'
+        b'KliV7dvo/NGvC6DkWqMLB9I5G181lOWy5FVqFAIg+nYJVEQrSTXs+BBg9Zu/XQZfsEkYtYYrX/kIYx3s3TwgQ=',
+        b'6blRtD8SfuMlKGx4H4DHcAQ00WDLBLpSD4SrSG4JkHhKNS/cd34DkTkVIUPZ3ffVTfmriEbecQvgtHj7MuI1P/'
+        b'PeX02OI2gtZBruZjleHTQxBbyt+pihXmxTkhtyEtZrXANkKk5NdRzjSxL8fNbj2rzzYJ0utANVA8sXidwWQLY=',
+        b'lmYgxCIZ+6h4OXIVNk52WhssTEyvJEDShDjigBiQVJbHbmgmD4y7l38bImHhERNVrScGZ4svQkHE9rKPWfcgGr86CRH5Dzj'
+        b'Rivvrc3nDn3uAGYdiCrgszAh7W/FrSBw/cBPHOmwKAkvmsHZ4ETMywmjDcdbo6XTVmdvPentyYdYZdQ1PVHSaseNrkSkuof'
+        b'66gaDVh70fWnG0vL0WGgC1PmMgXx8mDSbeW0Toj2ZwKsg/ccdBIRcaS1dzwltkayb72O7pKRTRgWscrAKH5H+/nIxj81AkH'
+        b'GM46NV9b/vaoHqPw+/xJxR7XKmGmt0ehFus',
+    )
+    def test_decrypt_is_compatible_with_decrypt_function(self, recv_data):
+
+        self.assertEqual(self.cipher.decrypt(recv_data).decode('ascii'), decrypt(SESSION_KEY, recv_data))
+
+    @data(
+        {'pwr': '1'},
+        {'om': '1', 'uil': '1', 'mode': 'A', 'pwr': '0'},
+        {'aqil': 100, 'ddp': '0'},
+        {'mode': 'M', 'om': 's', 'uil': '0', 'ddp': '1', 'pwr': '1'},
+    )
+    def test_encrypt_is_compatible_with_encrypt_function(self, parameters):
+
+        self.assertEqual(self.cipher.encrypt(parameters), encrypt(SESSION_KEY, parameters))
+        self.assertEqual(self.cipher.decode(self.cipher.encrypt(parameters)), parameters)
+
+    def test_decode_parses_json(self):
+
+        recv_data = (b'kzSvc/UvLcCNJAoiwJNQX7U2Al2MN95dMEQzrxvC8Pccvddc6sY90h7OVXS+rPRBf51tKSxmtcuOyo+6eZhBan'
+                     b'HTNVgBslRblATZknR098OM2mvXiYaY0LS70D/nzlcWhT8vB0grLGJWwHii+danT0HXpENFuLdWpYW0bw4bAFk=')
+
+        self.assertEqual(self.cipher.decode(recv_data)['pm25'], 8)
+
+    @data(
+        b'',
+        b'not base64!',
+        b'AAAA',
+        b'Bm3hvm2fTmxoSWXldbkwyAlLEoQm/RXDmQf3YcG451eZ/WiaRBrRfnwaVTCzyg5jdSDRZK4fJra/XHC52SmPmQ',
+    )
+    def test_invalid_data_raises_decoding_error(self, recv_data):
+
+        self.assertRaises(ResponseDecodingError, self.cipher.decode, recv_data)
+
+    def test_data_encrypted_by_other_key_raises_decoding_error(self):
+
+        recv_data = SessionCipher(b'0123456789abcdef').encrypt({'pwr': '1'})
+
+        self.assertRaises(ResponseDecodingError, self.cipher.decode, recv_data)
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, Mock
+
+from philips_air_purifier_ac2889 import AirPurifier, ClientOptions, MemorySessionStore, FileSessionStore
+from .helpers import HANDSHAKE, BITS, SESSION_KEY, STATUS
+
+
+class TestMemorySessionStore(unittest.TestCase):
+
+    @patch('time.time')
+    def test_key_expires_after_ttl(self, mock_time):
+
+        store = MemorySessionStore(ttl=60)
+        mock_time.return_value = 1000
+        store.set('192.168.1.21', SESSION_KEY)
+
+        mock_time.return_value = 1059
+        self.assertEqual(store.get('192.168.1.21'), SESSION_KEY)
+        mock_time.return_value = 1060
+        self.assertIsNone(store.get('192.168.1.21'))
+
+    def test_least_recently_used_key_is_evicted(self):
+
+        store = MemorySessionStore(max_size=2)
+        store.set('192.168.1.21', b'1' * 16)
+        store.set('192.168.1.22', b'2' * 16)
+        store.get('192.168.1.21')
+        store.set('192.168.1.23', b'3' * 16)
+
+        self.assertEqual(store.get('192.168.1.21'), b'1' * 16)
+        self.assertIsNone(store.get('192.168.1.22'))
+        self.assertEqual(store.get('192.168.1.23'), b'3' * 16)
+
+
+class TestFileSessionStore(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'sessions.json')
+
+    def test_keys_are_shared_between_instances(self):
+
+        FileSessionStore(self.path).set('192.168.1.21', SESSION_KEY)
+
+        self.assertEqual(FileSessionStore(self.path).get('192.168.1.21'), SESSION_KEY)
+
+    def test_deleted_key_is_removed_from_file(self):
+
+        store = FileSessionStore(self.path)
+        store.set('192.168.1.21', SESSION_KEY)
+        store.delete('192.168.1.21')
+
+        self.assertIsNone(FileSessionStore(self.path).get('192.168.1.21'))
+
+    def test_missing_file_means_empty_store(self):
+
+        self.assertIsNone(FileSessionStore(self.path).get('192.168.1.21'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+@patch('random.getrandbits', Mock(return_value=BITS))
+class TestAirPurifierSessionStore(unittest.TestCase):
+
+    def setUp(self):
+
+        self.store = MemorySessionStore()
+        self.philips_air_purifier = AirPurifier(host='192.168.1.21', options=ClientOptions(session_store=self.store))
+
+    @patch('requests.Session.get')
+    @patch('requests.Session.put')
+    def test_cached_key_skips_key_exchange(self, mock_put, mock_get):
+
+        self.store.set('192.168.1.21', SESSION_KEY)
+        mock_get.return_value = Mock(content=STATUS)
+
+        self.philips_air_purifier.connect()
+
+        mock_put.assert_not_called()
+        self.assertEqual(self.philips_air_purifier.session_key, SESSION_KEY)
+        self.assertTrue(self.philips_air_purifier.is_connected)
+
+    @patch('requests.Session.get')
+    @patch('requests.Session.put')
+    def test_stale_key_falls_back_to_key_exchange(self, mock_put, mock_get):
+
+        self.store.set('192.168.1.21', b'0123456789abcdef')
+        mock_get.return_value = Mock(content=STATUS)
+        mock_put.return_value = Mock(content=HANDSHAKE)
+
+        self.philips_air_purifier.connect()
+
+        mock_put.assert_called_once()
+        self.assertEqual(self.philips_air_purifier.session_key, SESSION_KEY)
+        self.assertEqual(self.store.get('192.168.1.21'), SESSION_KEY)
+
+    @patch('requests.Session.put')
+    def test_new_key_is_saved_in_store(self, mock_put):
+
+        mock_put.return_value = Mock(content=HANDSHAKE)
+
+        self.philips_air_purifier.connect()
+
+        self.assertEqual(self.store.get('192.168.1.21'), SESSION_KEY)
@@ -0,0 +1,62 @@
+import asyncio
+import unittest
+
+import requests
+
+from philips_air_purifier_ac2889 import AirPurifier, AsyncAirPurifier, ClientOptions, DeviceSimulator, RetryPolicy
+from philips_air_purifier_ac2889.errors import ResponseDecodingError
+
+
+class TestDeviceSimulator(unittest.TestCase):
+
+    def setUp(self):
+
+        self.simulator = DeviceSimulator().start()
+
+    def test_client_controls_simulated_device(self):
+
+        with AirPurifier(host=self.simulator.address).connect() as philips_air_purifier:
+            response = philips_air_purifier.set(mode='M', om='2')
+            data = philips_air_purifier.get('mode', 'om')
+            network = philips_air_purifier.network()
+
+        self.assertEqual((response['mode'], response['om']), ('M', '2'))
+        self.assertEqual(data, {'mode': 'M', 'om': '2'})
+        self.assertEqual(network['ipaddress'], '127.0.0.1')
+        self.assertEqual(self.simulator.status['mode'], 'M')
+
+    def test_async_client_controls_simulated_device(self):
+
+        async def main():
+            async with AsyncAirPurifier(host=self.simulator.address) as philips_air_purifier:
+                await philips_air_purifier.connect()
+                await philips_air_purifier.set(pwr='0')
+                return await philips_air_purifier.get('pwr')
+
+        self.assertEqual(asyncio.run(main()), {'pwr': '0'})
+
+    def test_restarted_device_does_not_accept_session_key(self):
+
+        philips_air_purifier = AirPurifier(host=self.simulator.address).connect()
+        self.simulator.restart()
+
+        self.assertRaises(ResponseDecodingError, philips_air_purifier.get)
+
+        philips_air_purifier.options = ClientOptions(retry=RetryPolicy())
+        self.assertEqual(philips_air_purifier.get('pm25'), {'pm25': 5})
+        self.assertEqual(philips_air_purifier.counters['reconnects'], 1)
+        philips_air_purifier.close()
+
+    def test_injected_failures_are_repeated_by_retry_policy(self):
+
+        options = ClientOptions(retry=RetryPolicy(attempts=3, backoff=0), timeout=1)
+        philips_air_purifier = AirPurifier(host=self.simulator.address, options=options).connect()
+        self.simulator.failure_rate = 1
+
+        self.assertRaises(requests.ConnectionError, philips_air_purifier.get)
+        self.assertEqual(self.simulator.counters['failures'], 3)
+        philips_air_purifier.close()
+
+    def tearDown(self):
+
+        self.simulator.stop()
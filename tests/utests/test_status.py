@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import patch, Mock
+
+from philips_air_purifier_ac2889 import AirPurifier, PurifierStatus, PurifierStatusBatch
+from .helpers import SESSION_KEY, STATUS, DATA
+
+
+class TestPurifierStatus(unittest.TestCase):
+
+    def test_values_are_normalized(self):
+
+        status = PurifierStatus.from_dict(DATA)
+
+        self.assertEqual(status, PurifierStatus(om='0', pwr=False, cl=False, aqil=50, uil=True, dt=0, dtrs=0,
+                                                mode='A', pm25=8, iaql=2, aqit=0, ddp='1', err=193))
+
+    def test_status_is_immutable(self):
+
+        status = PurifierStatus.from_dict(DATA)
+
+        with self.assertRaises(AttributeError):
+            status.pm25 = 10
+        with self.assertRaises(AttributeError):
+            status.extra = 10
+
+    def test_missing_fields_are_none_and_skipped_in_dict(self):
+
+        status = PurifierStatus.from_dict({'pm25': '12', 'mode': 'M', 'unknown': 1})
+
+        self.assertIsNone(status.pwr)
+        self.assertEqual(status.to_dict(), {'mode': 'M', 'pm25': 12})
+        self.assertEqual(status.to_tuple(), (None,) * 7 + ('M', 12) + (None,) * 4)
+
+    @patch('requests.Session.get')
+    def test_get_returns_typed_status(self, mock_get):
+
+        mock_get.return_value = Mock(content=STATUS)
+        philips_air_purifier = AirPurifier(host='192.168.1.21')
+        philips_air_purifier.session_key = SESSION_KEY
+        philips_air_purifier.is_connected = True
+
+        status = philips_air_purifier.get('pwr', 'pm25', typed=True)
+
+        self.assertEqual(status.to_dict(), {'pwr': False, 'pm25': 8})
+
+
+class TestPurifierStatusBatch(unittest.TestCase):
+
+    def setUp(self):
+
+        self.statuses = [
+            PurifierStatus.from_dict(DATA),
+            PurifierStatus.from_dict({'pm25': 12, 'pwr': '1'}),
+            PurifierStatus.from_dict(dict(DATA, pm25=3, uil='0', mode='M')),
+        ]
+        self.batch = PurifierStatusBatch(self.statuses)
+
+    def test_snapshots_are_restored_from_columns(self):
+
+        self.assertEqual(len(self.batch), 3)
+        self.assertEqual(list(self.batch), self.statuses)
+        self.assertEqual(self.batch[-1], self.statuses[-1])
+
+    def test_column_returns_values_of_field(self):
+
+        self.assertEqual(self.batch.column('pm25'), [8, 12, 3])
+        self.assertEqual(self.batch.column('uil'), [True, None, False])
+        self.assertEqual(self.batch.column('mode'), ['A', None, 'M'])
@@ -0,0 +1,86 @@
+import os
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch, Mock
+
+from philips_air_purifier_ac2889 import (AirPurifier, AsyncAirPurifier, ClientOptions, DeviceSimulator, RetryPolicy,
+                                         SessionTransport)
+
+
+class TestNoProxy(unittest.TestCase):
+
+    @patch.dict(os.environ, {}, clear=True)
+    @patch('requests.Session.get')
+    def test_no_proxy_is_passed_to_requests_and_not_to_environment(self, mock_get):
+
+        mock_get.return_value = Mock(content=b'{}')
+        philips_air_purifier = AirPurifier(host='192.168.1.21', no_proxy='192.168.1.21')
+
+        philips_air_purifier.transport.get('http://192.168.1.21/di/v1/products/1/air')
+
+        self.assertNotIn('NO_PROXY', os.environ)
+        self.assertEqual(mock_get.call_args[1]['proxies'], {'no_proxy': '192.168.1.21'})
+        self.assertEqual(philips_air_purifier.no_proxy, '192.168.1.21')
+
+    def test_no_proxy_of_transport_is_kept(self):
+
+        transport = SessionTransport(no_proxy='192.168.1.21')
+
+        philips_air_purifier = AirPurifier(host='192.168.1.21', transport=transport)
+
+        self.assertEqual(philips_air_purifier.no_proxy, '192.168.1.21')
+
+
+class TestConcurrentHandshake(unittest.TestCase):
+
+    def setUp(self):
+
+        self.simulator = DeviceSimulator(latency=0.05).start()
+
+    def _run_threads(self, target, count=8):
+
+        barrier = threading.Barrier(count)
+        threads = [threading.Thread(target=lambda: (barrier.wait(), target())) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_concurrent_connects_share_one_key_exchange(self):
+
+        philips_air_purifier = AirPurifier(host=self.simulator.address, pool_size=8)
+
+        self._run_threads(philips_air_purifier.connect)
+
+        self.assertEqual(self.simulator.counters['/di/v1/products/0/security'], 1)
+        self.assertEqual(philips_air_purifier.get('pm25'), {'pm25': 5})
+        philips_air_purifier.close()
+
+    def test_threads_which_found_stale_key_share_one_key_exchange(self):
+
+        philips_air_purifier = AirPurifier(host=self.simulator.address, pool_size=8,
+                                           options=ClientOptions(retry=RetryPolicy())).connect()
+        self.simulator.restart()
+        results = []
+
+        self._run_threads(lambda: results.append(philips_air_purifier.get('pm25')))
+
+        self.assertEqual(results, [{'pm25': 5}] * 8)
+        self.assertEqual(philips_air_purifier.counters['reconnects'], 1)
+        self.assertEqual(self.simulator.counters['/di/v1/products/0/security'], 2)
+        philips_air_purifier.close()
+
+    def test_concurrent_coroutines_share_one_key_exchange(self):
+
+        async def main():
+            async with AsyncAirPurifier(host=self.simulator.address, pool_size=4) as philips_air_purifier:
+                await asyncio.gather(*(philips_air_purifier.connect() for _ in range(4)))
+                return await philips_air_purifier.get('pm25')
+
+        self.assertEqual(asyncio.run(main()), {'pm25': 5})
+        self.assertEqual(self.simulator.counters['/di/v1/products/0/security'], 1)
+
+    def tearDown(self):
+
+        self.simulator.stop()
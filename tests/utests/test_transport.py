@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import patch, Mock
+
+from philips_air_purifier_ac2889 import AirPurifier, Transport, SessionTransport
+
+
+class TestSessionTransport(unittest.TestCase):
+
+    def test_pool_size_is_applied_to_http_adapter(self):
+
+        transport = SessionTransport(pool_size=4)
+        adapter = transport._session.get_adapter('http://192.168.1.21/')
+
+        self.assertEqual(adapter._pool_maxsize, 4)
+
+    @patch('requests.Session.get')
+    def test_default_timeout_is_passed_to_session(self, mock_get):
+
+        mock_get.return_value = Mock(content=b'body')
+        transport = SessionTransport(timeout=2.5)
+
+        self.assertEqual(transport.get('http://192.168.1.21/'), b'body')
+        mock_get.assert_called_once_with('http://192.168.1.21/', timeout=2.5)
+
+    @patch('requests.Session.put')
+    def test_request_timeout_overrides_default_timeout(self, mock_put):
+
+        mock_put.return_value = Mock(content=b'body')
+        transport = SessionTransport(timeout=2.5)
+
+        self.assertEqual(transport.put('http://192.168.1.21/', b'data', timeout=1), b'body')
+        mock_put.assert_called_once_with('http://192.168.1.21/', data=b'data', timeout=1)
+
+    @patch('requests.Session.close')
+    def test_transport_is_closed_on_context_exit(self, mock_close):
+
+        with SessionTransport():
+            pass
+
+        mock_close.assert_called_once_with()
+
+
+class TestAirPurifierTransport(unittest.TestCase):
+
+    def setUp(self):
+
+        self.transport = Mock(spec=Transport)
+        self.philips_air_purifier = AirPurifier(host='192.168.1.21', transport=self.transport)
+
+    def test_session_transport_is_used_by_default(self):
+
+        philips_air_purifier = AirPurifier(host='192.168.1.21', pool_size=3)
+
+        self.assertIsInstance(philips_air_purifier.transport, SessionTransport)
+        self.assertEqual(philips_air_purifier.transport.pool_size, 3)
+
+    def test_close_releases_transport_and_disconnects_client(self):
+
+        self.philips_air_purifier.session_key = b'0123456789abcdef'
+        self.philips_air_purifier.is_connected = True
+
+        self.philips_air_purifier.close()
+
+        self.transport.close.assert_called_once_with()
+        self.assertIsNone(self.philips_air_purifier.session_key)
+        self.assertFalse(self.philips_air_purifier.is_connected)
+
+    def test_client_is_closed_on_context_exit(self):
+
+        with self.philips_air_purifier as philips_air_purifier:
+            self.assertIs(philips_air_purifier, self.philips_air_purifier)
+
+        self.transport.close.assert_called_once_with()
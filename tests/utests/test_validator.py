@@ -0,0 +1,64 @@
+import unittest
+
+from philips_air_purifier_ac2889 import ParameterValidator
+from philips_air_purifier_ac2889.errors import ParameterNotRecognizedError, ParameterValueError
+
+
+class TestParameterValidator(unittest.TestCase):
+
+    def test_returns_valid_parameters_unchanged(self):
+
+        parameters = {'pwr': '1', 'mode': 'M', 'om': 's', 'aqil': 100}
+
+        self.assertIs(ParameterValidator().validate(parameters), parameters)
+
+    def test_does_not_coerce_values_by_default(self):
+
+        self.assertRaisesRegex(ParameterValueError, 'Value "2" is not allowed. "om" parameter',
+                               ParameterValidator().validate, {'om': 2})
+
+    def test_coerces_values_to_types_of_schema(self):
+
+        parameters = {'om': 2, 'aqil': ' 50', 'pwr': '1'}
+
+        result = ParameterValidator(coerce=True).validate(parameters)
+
+        self.assertEqual(result, {'om': '2', 'aqil': 50, 'pwr': '1'})
+        self.assertEqual(parameters, {'om': 2, 'aqil': ' 50', 'pwr': '1'})
+
+    def test_does_not_coerce_values_out_of_schema(self):
+
+        validator = ParameterValidator(coerce=True)
+
+        for parameters in ({'om': 4}, {'pwr': True}, {'aqil': '101'}, {'aqil': 'high'}, {'mode': ['M']}):
+            with self.subTest(parameters=parameters):
+                self.assertRaises(ParameterValueError, validator.validate, parameters)
+
+    def test_rejects_unknown_parameter(self):
+
+        self.assertRaisesRegex(ParameterNotRecognizedError, 'Unknown parameter "speed". Allowed parameters: pwr, om',
+                               ParameterValidator().validate, {'speed': '1'})
+
+    def test_validates_batch_of_commands(self):
+
+        commands = ParameterValidator(coerce=True).validate_many([{'pwr': 1}, {'mode': 'M', 'om': 3}])
+
+        self.assertEqual(commands, [{'pwr': '1'}, {'mode': 'M', 'om': '3'}])
+
+    def test_reports_index_of_invalid_command_in_batch(self):
+
+        commands = [{'pwr': '1'}, {'mode': 'M'}, {'mode': 'X'}]
+
+        self.assertRaisesRegex(ParameterValueError, 'Command 2: Value "X" is not allowed.',
+                               ParameterValidator().validate_many, commands)
+
+    def test_uses_given_schema(self):
+
+        validator = ParameterValidator({'cl': {'values': [False], 'help': 'Child lock.'}})
+
+        self.assertEqual(validator.validate({'cl': False}), {'cl': False})
+        self.assertRaisesRegex(ParameterNotRecognizedError, 'Allowed parameters: cl$', validator.validate, {'pwr': '1'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from philips_air_purifier_ac2889 import AirPurifier, AsyncAirPurifier, ChangeDetector
+
+
+class TestChangeDetector(unittest.TestCase):
+
+    def test_first_reading_is_reported_whole(self):
+
+        detector = ChangeDetector()
+
+        change = detector.update({'pm25': 10, 'mode': 'A'}, 100)
+
+        self.assertEqual(change, (100, {'pm25': 10, 'mode': 'A'}))
+
+    def test_only_changed_fields_are_reported(self):
+
+        detector = ChangeDetector()
+        detector.update({'pm25': 10, 'mode': 'A', 'err': 0}, 100)
+
+        self.assertIsNone(detector.update({'pm25': 10, 'mode': 'A', 'err': 0}, 101))
+        self.assertEqual(detector.update({'pm25': 10, 'mode': 'M', 'err': 0}, 102).changes, {'mode': 'M'})
+
+    def test_deadband_suppresses_small_changes_but_not_drift(self):
+
+        detector = ChangeDetector(deadbands={'pm25': 5})
+        detector.update({'pm25': 10}, 100)
+
+        self.assertIsNone(detector.update({'pm25': 13}, 101))
+        self.assertIsNone(detector.update({'pm25': 14}, 102))
+        self.assertEqual(detector.update({'pm25': 15}, 103).changes, {'pm25': 15})
+
+    def test_burst_of_changes_is_coalesced(self):
+
+        detector = ChangeDetector(coalesce=10)
+        detector.update({'pm25': 10, 'mode': 'A'}, 100)
+
+        self.assertIsNone(detector.update({'pm25': 11, 'mode': 'M'}, 102))
+        self.assertIsNone(detector.update({'pm25': 12, 'mode': 'A'}, 105))
+        self.assertEqual(detector.update({'pm25': 12, 'mode': 'A'}, 110), (110, {'pm25': 12}))
+
+
+class TestWatch(unittest.TestCase):
+
+    READINGS = [{'pm25': 10, 'om': '1'}, {'pm25': 10, 'om': '1'}, {'pm25': 30, 'om': '1'}, {'pm25': 31, 'om': '2'}]
+
+    @patch('time.sleep')
+    def test_watch_yields_changes(self, mock_sleep):
+
+        philips_air_purifier = AirPurifier(host='192.168.1.21')
+        with patch.object(philips_air_purifier, 'get', side_effect=self.READINGS) as mock_get:
+            watch = philips_air_purifier.watch(5, 'pm25', 'om', deadbands={'pm25': 5})
+            changes = [next(watch).changes for _ in range(3)]
+
+        self.assertEqual(changes, [{'pm25': 10, 'om': '1'}, {'pm25': 30}, {'om': '2'}])
+        mock_get.assert_called_with('pm25', 'om')
+        self.assertEqual(mock_sleep.call_count, 3)
+
+    def test_async_watch_yields_changes(self):
+
+        philips_air_purifier = AsyncAirPurifier(host='192.168.1.21')
+
+        async def watch():
+            changes = []
+            async for change in philips_air_purifier.watch(0, 'pm25', 'om'):
+                changes.append(change.changes)
+                if len(changes) == 3:
+                    return changes
+            return changes
+
+        with patch.object(philips_air_purifier, 'get', side_effect=self.READINGS):
+            changes = asyncio.run(watch())
+
+        self.assertEqual(changes, [{'pm25': 10, 'om': '1'}, {'pm25': 30}, {'pm25': 31, 'om': '2'}])
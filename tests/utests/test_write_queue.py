@@ -0,0 +1,67 @@
+import unittest
+from unittest.mock import Mock
+
+from philips_air_purifier_ac2889 import WriteQueue
+from philips_air_purifier_ac2889.errors import ParameterValueError, ParameterRequiredError
+
+
+class TestWriteQueue(unittest.TestCase):
+
+    def setUp(self):
+
+        self.purifier = Mock()
+        self.purifier.set.return_value = {'pwr': '1', 'mode': 'M', 'om': '2'}
+
+    def test_parameters_are_merged_into_one_request(self):
+
+        queue = WriteQueue(self.purifier, window=60)
+        futures = [queue.set(pwr='1'), queue.set(mode='A', om='1'), queue.set(om='2'), queue.set(mode='M')]
+
+        response = queue.flush()
+
+        self.purifier.set.assert_called_once_with(pwr='1', mode='M', om='2')
+        self.assertEqual([future.result(0) for future in futures], [response] * 4)
+
+    def test_parameters_are_sent_after_window(self):
+
+        queue = WriteQueue(self.purifier, window=0.01)
+
+        future = queue.set(pwr='1')
+
+        self.assertEqual(future.result(1), {'pwr': '1', 'mode': 'M', 'om': '2'})
+        self.purifier.set.assert_called_once_with(pwr='1')
+
+    def test_invalid_parameters_are_not_queued(self):
+
+        with WriteQueue(self.purifier, window=60) as queue:
+            self.assertRaises(ParameterValueError, queue.set, pwr='2')
+            self.assertRaises(ParameterRequiredError, queue.set)
+
+        self.purifier.set.assert_not_called()
+
+    def test_error_is_passed_to_futures(self):
+
+        self.purifier.set.side_effect = OSError('timed out')
+        queue = WriteQueue(self.purifier, window=0.01)
+
+        future = queue.set(pwr='1')
+
+        self.assertRaises(OSError, future.result, 1)
+
+    def test_interruption_is_passed_to_futures(self):
+
+        self.purifier.set.side_effect = KeyboardInterrupt
+        queue = WriteQueue(self.purifier, window=60)
+
+        future = queue.set(pwr='1')
+
+        self.assertRaises(KeyboardInterrupt, queue.flush)
+        self.assertIsInstance(future.exception(0), KeyboardInterrupt)
+
+    def test_close_sends_queued_parameters(self):
+
+        with WriteQueue(self.purifier, window=60) as queue:
+            future = queue.set(pwr='0')
+
+        self.assertTrue(future.done())
+        self.purifier.set.assert_called_once_with(pwr='0')